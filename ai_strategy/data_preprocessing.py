@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from trading.analysis.indicator_graph import indicator_graph
 
 class DataPreprocessor:
     def __init__(self, data):
@@ -8,26 +9,25 @@ class DataPreprocessor:
         :param data: DataFrame with raw market price data
         """
         self.data = data
+        self._indicators = {}  # indicator graph memo, valid while the rows of data are unchanged
 
     def clean_data(self):
         """Remove NaNs, handle missing values, and normalize data."""
         self.data.dropna(inplace=True)
+        self._indicators = {}
         self.data['returns'] = self.data['close'].pct_change().fillna(0)
         return self.data
 
     def add_moving_averages(self, short_window=9, long_window=21):
         """Add short and long moving averages."""
-        self.data['SMA_9'] = self.data['close'].rolling(window=short_window).mean()
-        self.data['SMA_21'] = self.data['close'].rolling(window=long_window).mean()
+        results = indicator_graph.compute(self.data, [f'sma_{short_window}', f'sma_{long_window}'], self._indicators)
+        self.data['SMA_9'] = results[f'sma_{short_window}']
+        self.data['SMA_21'] = results[f'sma_{long_window}']
         return self.data
 
     def add_rsi(self, period=14):
         """Calculate and add RSI (Relative Strength Index)."""
-        delta = self.data['close'].diff(1)
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        self.data['RSI'] = 100 - (100 / (1 + rs))
+        self.data['RSI'] = indicator_graph.compute(self.data, [f'rsi_{period}'], self._indicators)[f'rsi_{period}']
         return self.data
 
     def add_volatility(self, window=10):
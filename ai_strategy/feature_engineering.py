@@ -8,29 +8,46 @@ from ta.momentum import RSIIndicator, StochasticOscillator
 from ta.volatility import BollingerBands, AverageTrueRange
 # import talib
 from core.logger import logger
+from trading.analysis.indicator_graph import indicator_cache, indicator_graph
+from ai_strategy.panel_features import FeaturePanel
 
 class FeatureEngineering:
-    def __init__(self, data):
+    def __init__(self, data, symbol=None):
         """
         Initialize with market data.
         :param data: DataFrame with cleaned and preprocessed market data
+        :param symbol: Shares the indicator_cache memo with other consumers of this symbol's bars
         """
         self.data = data
+        self.symbol = symbol
+        self._indicators = {}  # indicator graph memo, valid while the rows of data are unchanged
+
+    def _compute_indicators(self, features):
+        if self.symbol is None:
+            return indicator_graph.compute(self.data, features, self._indicators)
+        return indicator_cache.compute(self.symbol, self.data, features)
 
     def calculate_bollinger_bands(self, window=20, num_std=2):
         """Calculate Bollinger Bands."""
-        self.data['rolling_mean'] = self.data['close'].rolling(window).mean()
-        self.data['rolling_std'] = self.data['close'].rolling(window).std()
+        results = self._compute_indicators([f'sma_{window}', f'std_{window}'])
+        self.data['rolling_mean'] = results[f'sma_{window}']
+        self.data['rolling_std'] = results[f'std_{window}']
         self.data['upper_band'] = self.data['rolling_mean'] + (num_std * self.data['rolling_std'])
         self.data['lower_band'] = self.data['rolling_mean'] - (num_std * self.data['rolling_std'])
         return self.data
 
     def calculate_macd(self, short_window=12, long_window=26, signal_window=9):
         """Calculate MACD (Moving Average Convergence Divergence)."""
-        self.data['EMA_12'] = self.data['close'].ewm(span=short_window, adjust=False).mean()
-        self.data['EMA_26'] = self.data['close'].ewm(span=long_window, adjust=False).mean()
-        self.data['MACD'] = self.data['EMA_12'] - self.data['EMA_26']
-        self.data['MACD_signal'] = self.data['MACD'].ewm(span=signal_window, adjust=False).mean()
+        results = self._compute_indicators([f'ema_{short_window}', f'ema_{long_window}'])
+        self.data['EMA_12'] = results[f'ema_{short_window}']
+        self.data['EMA_26'] = results[f'ema_{long_window}']
+        if (short_window, long_window, signal_window) == (12, 26, 9):
+            results = self._compute_indicators(['macd', 'macd_signal'])
+            self.data['MACD'] = results['macd']
+            self.data['MACD_signal'] = results['macd_signal']
+        else:
+            self.data['MACD'] = self.data['EMA_12'] - self.data['EMA_26']
+            self.data['MACD_signal'] = self.data['MACD'].ewm(span=signal_window, adjust=False).mean()
         return self.data
 
     def calculate_greeks(self, spot_price, strike_price, time_to_expiry, risk_free_rate, volatility):
@@ -48,6 +65,7 @@ class FeatureEngineering:
     def add_open_interest_data(self, oi_data):
         """Merge Open Interest data into the market dataset."""
         self.data = self.data.merge(oi_data, on='date', how='left')
+        self._indicators = {}
         return self.data
 
     def apply_features(self):
@@ -87,6 +105,17 @@ class FeatureEngineer:
             logger.error(f"Feature creation failed: {e}")
             return pd.DataFrame()  # Return empty DataFrame instead of None
 
+    def create_panel_features(self, frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """Latest technical features for many symbols in one vectorized pass: symbols x features"""
+        try:
+            panel = FeaturePanel.from_frames(frames)
+            panel.compute()
+            return panel.latest()
+            
+        except Exception as e:
+            logger.error(f"Panel feature creation failed: {e}")
+            return pd.DataFrame()
+
     def create_labels(self, market_data: List[Dict], lookforward: int = 5) -> np.ndarray:
         """Create labels for supervised learning"""
         try:
@@ -0,0 +1,336 @@
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from ai_strategy.panel_features import PANEL_FEATURES, compute_panel
+
+BAR_FIELDS = ("open", "high", "low", "close", "volume")
+
+# Stored rows replayed before new bars so recursive features (EMA, Wilder) converge
+WARMUP_ROWS = 500
+
+_IST_OFFSET_MS = 330 * 60 * 1000
+_DAY_MS = 86_400_000
+
+def _probe_bars(n: int = 300) -> Dict[str, np.ndarray]:
+    """Fixed synthetic bars used to fingerprint feature definitions"""
+    rng = np.random.default_rng(20240101)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return {
+        "open": close + rng.normal(0, 0.2, n),
+        "high": close + rng.uniform(0, 1, n),
+        "low": close - rng.uniform(0, 1, n),
+        "close": close,
+        "volume": rng.integers(1000, 5000, n).astype(float)
+    }
+
+class FeatureSet:
+    """
+    Named, versioned list of features and the function computing them from
+    OHLCV arrays. Each feature is fingerprinted by its output on fixed probe
+    bars, so a changed definition is detected per feature without bookkeeping.
+    """
+
+    def __init__(self,
+                 name: str = "technical",
+                 version: int = 1,
+                 features: Sequence[str] = PANEL_FEATURES,
+                 compute: Callable[[Dict[str, np.ndarray]], Dict[str, np.ndarray]] = compute_panel):
+        self.name = name
+        self.version = version
+        self.features = list(features)
+        self.compute = compute
+        self._fingerprints: Optional[Dict[str, str]] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}-v{self.version}"
+
+    def fingerprints(self) -> Dict[str, str]:
+        if self._fingerprints is None:
+            values = self.evaluate(_probe_bars())
+            self._fingerprints = {
+                name: hashlib.sha1(np.round(np.nan_to_num(values[name], nan=-1.0), 8).tobytes()).hexdigest()
+                for name in self.features
+            }
+        return self._fingerprints
+
+    def evaluate(self, bars: Dict[str, np.ndarray], features: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        values = self.compute(bars)
+        return {name: np.asarray(values[name], dtype=np.float64) for name in (features or self.features)}
+
+class FeatureStore:
+    """
+    On-disk columnar store of bars and computed features, keyed by
+    (symbol, timeframe, feature set key). Rows are partitioned by IST day; each
+    partition directory holds one raw little-endian file per column (int64
+    timestamp, float64 otherwise), read back through np.memmap and appended to
+    in place. A manifest per key records partition row counts, which are the
+    source of truth for readers, and the fingerprint each feature column was
+    computed with.
+
+        root/<symbol>/<timeframe>/<name>-v<version>/manifest.json
+        root/<symbol>/<timeframe>/<name>-v<version>/<YYYYMMDD>/<column>.bin
+    """
+
+    def __init__(self, root: str, feature_set: Optional[FeatureSet] = None):
+        self.root = root
+        self.feature_set = feature_set if feature_set is not None else FeatureSet()
+
+    @property
+    def columns(self) -> List[str]:
+        return ["timestamp", *BAR_FIELDS, *self.feature_set.features]
+
+    def path(self, symbol: str, timeframe: str) -> str:
+        return os.path.join(self.root, symbol, timeframe, self.feature_set.key)
+
+    def manifest(self, symbol: str, timeframe: str) -> Dict:
+        path = os.path.join(self.path(symbol, timeframe), "manifest.json")
+        if not os.path.exists(path):
+            return {"features": {}, "partitions": {}}
+        with open(path) as f:
+            return json.load(f)
+
+    def partitions(self, symbol: str, timeframe: str) -> List[str]:
+        return sorted(self.manifest(symbol, timeframe)["partitions"])
+
+    def rows(self, symbol: str, timeframe: str) -> int:
+        return sum(self.manifest(symbol, timeframe)["partitions"].values())
+
+    def last_timestamp(self, symbol: str, timeframe: str) -> Optional[int]:
+        manifest = self.manifest(symbol, timeframe)
+        days = sorted(manifest["partitions"])
+        if not days:
+            return None
+        timestamps = self._column(symbol, timeframe, manifest, days[-1], "timestamp")
+        return int(timestamps[-1])
+
+    def write(self, symbol: str, timeframe: str, bars: pd.DataFrame) -> List[str]:
+        """
+        Store bars and their features. Bars after the stored history are appended in
+        place; bars overlapping it replace every stored row from their first timestamp
+        on. Only partitions from the first new bar onwards are touched.
+        :param bars: OHLCV columns indexed by bar time (DatetimeIndex or epoch ms)
+        :return: Partitions written
+        """
+        if len(bars) == 0:
+            return []
+        timestamps = _epoch_ms(bars.index)
+        order = np.argsort(timestamps, kind="stable")
+        new = {"timestamp": timestamps[order]}
+        for name in BAR_FIELDS:
+            new[name] = (bars[name].to_numpy(dtype=np.float64)[order] if name in bars
+                         else np.full(len(bars), np.nan))
+
+        # Bring feature columns computed with an older definition up to date before adding rows
+        self.rebuild(symbol, timeframe)
+        manifest = self.manifest(symbol, timeframe)
+        last = self.last_timestamp(symbol, timeframe)
+        appending = last is None or new["timestamp"][0] > last
+        if appending:
+            history = self._tail(symbol, timeframe, manifest, WARMUP_ROWS)
+            rewrite = 0
+        else:
+            # Replace from the first new bar: the rest of its day is rewritten with it
+            first_day = _day(new["timestamp"][0])
+            kept = self._read(symbol, timeframe, manifest, ("timestamp",) + BAR_FIELDS, end=int(new["timestamp"][0]))
+            day_start = int(np.searchsorted(kept["timestamp"], _day_start(first_day)))
+            history = {name: values[max(day_start - WARMUP_ROWS, 0):] for name, values in kept.items()}
+            rewrite = len(kept["timestamp"]) - day_start
+            for day in [d for d in manifest["partitions"] if d >= _day_name(first_day)]:
+                _remove_partition(os.path.join(self.path(symbol, timeframe), day))
+                del manifest["partitions"][day]
+
+        combined = {name: np.concatenate([history[name], new[name]]) for name in new}
+        rows = {**combined, **self.feature_set.evaluate(combined)}
+        skip = len(history["timestamp"]) - rewrite
+        rows = {name: values[skip:] for name, values in rows.items()}
+
+        written = self._write_rows(self.path(symbol, timeframe), rows, manifest)
+        manifest["features"] = dict(self.feature_set.fingerprints())
+        _save_manifest(self.path(symbol, timeframe), manifest)
+        return written
+
+    def append(self, symbol: str, timeframe: str, bars: pd.DataFrame) -> List[str]:
+        """Append newly closed bars, which must all be later than the stored history"""
+        last = self.last_timestamp(symbol, timeframe)
+        if last is not None and len(bars) and _epoch_ms(bars.index).min() <= last:
+            raise ValueError(f"Bars for {symbol} {timeframe} are not after the stored history")
+        return self.write(symbol, timeframe, bars)
+
+    def rebuild(self, symbol: str, timeframe: str, force: bool = False) -> List[str]:
+        """
+        Recompute the feature columns whose definition changed since they were stored
+        (all of them with force), leaving unchanged columns and the bars untouched.
+        :return: Rebuilt features
+        """
+        manifest = self.manifest(symbol, timeframe)
+        if not manifest["partitions"]:
+            return []
+        current = self.feature_set.fingerprints()
+        changed = [name for name in self.feature_set.features
+                   if force or manifest["features"].get(name) != current[name]]
+        if not changed:
+            return []
+        raw = self._read(symbol, timeframe, manifest, ("timestamp",) + BAR_FIELDS)
+        features = self.feature_set.evaluate(raw, changed)
+        directory = self.path(symbol, timeframe)
+        offset = 0
+        for day in sorted(manifest["partitions"]):
+            count = manifest["partitions"][day]
+            for name in changed:
+                _write_column(os.path.join(directory, day), name, features[name][offset:offset + count])
+            offset += count
+        manifest["features"] = dict(current)
+        _save_manifest(directory, manifest)
+        return changed
+
+    def read(self,
+             symbol: str,
+             timeframe: str,
+             columns: Optional[Sequence[str]] = None,
+             start: Optional[int] = None,
+             end: Optional[int] = None) -> pd.DataFrame:
+        """
+        Stored bars and features as a DataFrame indexed by bar time.
+        :param start: Epoch milliseconds, inclusive
+        :param end: Epoch milliseconds, exclusive
+        """
+        columns = list(columns) if columns is not None else self.columns[1:]
+        arrays = self.read_arrays(symbol, timeframe, ["timestamp"] + columns, start, end)
+        timestamps = arrays.pop("timestamp")
+        return pd.DataFrame(arrays, index=pd.to_datetime(timestamps, unit="ms"), columns=columns)
+
+    def read_arrays(self,
+                    symbol: str,
+                    timeframe: str,
+                    columns: Sequence[str],
+                    start: Optional[int] = None,
+                    end: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Columns over [start, end); only overlapping partitions are mapped, and one partition is zero-copy"""
+        return self._read(symbol, timeframe, self.manifest(symbol, timeframe), columns, start, end)
+
+    def latest(self, symbol: str, timeframe: str, n: int = 1, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """The last n stored rows, mapping only the trailing partitions"""
+        columns = list(columns) if columns is not None else self.columns[1:]
+        arrays = self._tail(symbol, timeframe, self.manifest(symbol, timeframe), n, ["timestamp"] + columns)
+        timestamps = arrays.pop("timestamp")
+        return pd.DataFrame(arrays, index=pd.to_datetime(timestamps, unit="ms"), columns=columns)
+
+    def _column(self, symbol: str, timeframe: str, manifest: Dict, day: str, name: str) -> np.ndarray:
+        dtype = np.int64 if name == "timestamp" else np.float64
+        count = manifest["partitions"][day]
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+        path = os.path.join(self.path(symbol, timeframe), day, f"{name}.bin")
+        return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+    def _read(self,
+              symbol: str,
+              timeframe: str,
+              manifest: Dict,
+              columns: Sequence[str],
+              start: Optional[int] = None,
+              end: Optional[int] = None,
+              days: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        days = sorted(manifest["partitions"]) if days is None else days
+        if start is not None:
+            days = [d for d in days if d >= _day_name(_day(start))]
+        if end is not None:
+            days = [d for d in days if d <= _day_name(_day(end - 1))]
+        parts = {name: [] for name in columns}
+        for day in days:
+            timestamps = self._column(symbol, timeframe, manifest, day, "timestamp")
+            low = 0 if start is None else int(np.searchsorted(timestamps, start))
+            high = len(timestamps) if end is None else int(np.searchsorted(timestamps, end))
+            for name in columns:
+                parts[name].append(self._column(symbol, timeframe, manifest, day, name)[low:high])
+        return {
+            name: chunks[0] if len(chunks) == 1 else
+            np.concatenate(chunks) if chunks else
+            np.empty(0, dtype=np.int64 if name == "timestamp" else np.float64)
+            for name, chunks in parts.items()
+        }
+
+    def _tail(self,
+              symbol: str,
+              timeframe: str,
+              manifest: Dict,
+              n: int,
+              columns: Sequence[str] = ("timestamp",) + BAR_FIELDS) -> Dict[str, np.ndarray]:
+        """The last n rows, reading only as many trailing partitions as needed"""
+        days, count = [], 0
+        for day in sorted(manifest["partitions"], reverse=True):
+            if count >= n:
+                break
+            days.insert(0, day)
+            count += manifest["partitions"][day]
+        arrays = self._read(symbol, timeframe, manifest, columns, days=days)
+        return {name: values[max(len(values) - n, 0):] for name, values in arrays.items()}
+
+    def _write_rows(self, directory: str, rows: Dict[str, np.ndarray], manifest: Dict) -> List[str]:
+        days = _day(rows["timestamp"])
+        written = []
+        for day in np.unique(days):
+            mask = days == day
+            name = _day_name(int(day))
+            partition = os.path.join(directory, name)
+            existing = manifest["partitions"].get(name, 0)
+            os.makedirs(partition, exist_ok=True)
+            for column, values in rows.items():
+                if existing:
+                    _append_column(partition, column, values[mask], existing)
+                else:
+                    _write_column(partition, column, values[mask])
+            manifest["partitions"][name] = existing + int(mask.sum())
+            written.append(name)
+        return written
+
+def _column_dtype(name: str) -> str:
+    return "<i8" if name == "timestamp" else "<f8"
+
+def _write_column(partition: str, name: str, values: np.ndarray):
+    """Replace one column file atomically"""
+    path = os.path.join(partition, f"{name}.bin")
+    np.ascontiguousarray(values, dtype=_column_dtype(name)).tofile(path + ".tmp")
+    os.replace(path + ".tmp", path)
+
+def _append_column(partition: str, name: str, values: np.ndarray, rows: int):
+    """Append after the first rows values, dropping bytes left by an interrupted write"""
+    with open(os.path.join(partition, f"{name}.bin"), "r+b") as f:
+        f.truncate(rows * 8)
+        f.seek(rows * 8)
+        f.write(np.ascontiguousarray(values, dtype=_column_dtype(name)).tobytes())
+
+def _remove_partition(partition: str):
+    if os.path.isdir(partition):
+        for entry in os.scandir(partition):
+            os.remove(entry.path)
+        os.rmdir(partition)
+
+def _save_manifest(directory: str, manifest: Dict):
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, "manifest.json")
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+def _epoch_ms(index) -> np.ndarray:
+    if isinstance(index, pd.DatetimeIndex):
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        return index.as_unit("ms").asi8.astype(np.int64)
+    return np.asarray(index, dtype=np.int64)
+
+def _day(timestamps):
+    """IST day number of epoch-millisecond timestamps"""
+    return (np.asarray(timestamps, dtype=np.int64) + _IST_OFFSET_MS) // _DAY_MS
+
+def _day_start(day: int) -> int:
+    return int(day) * _DAY_MS - _IST_OFFSET_MS
+
+def _day_name(day: int) -> str:
+    return pd.Timestamp(int(day) * _DAY_MS, unit="ms").strftime("%Y%m%d")
@@ -5,13 +5,18 @@ import joblib
 from .feature_engineering import FeatureEngineer
 
 class ModelInference:
-    def __init__(self, model_path: str):
+    def __init__(self, model_path: str, store=None):
+        """
+        :param store: FeatureStore the model was trained from; predict_latest reads the
+            same stored features instead of recomputing them
+        """
         # Load model data
         model_data = joblib.load(model_path)
         self.model = model_data["model"]
         self.scaler = model_data["scaler"]
         self.feature_names = model_data["feature_names"]
         self.feature_engineer = FeatureEngineer()
+        self.store = store
         
     def predict(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
         """Make predictions on new market data"""
@@ -43,6 +48,32 @@ class ModelInference:
         """Make predictions on a batch of market data"""
         return [self.predict(data) for data in market_data_list]
 
+    def predict_latest(self, symbol: str, timeframe: str = "1d", n: int = 1) -> List[Dict[str, Any]]:
+        """Predict on the last n stored bars of symbol from the feature store"""
+        rows = self._latest(symbol, timeframe, n)
+        X_scaled = self.scaler.transform(rows[self.feature_names])
+        return self._format(rows.index, self.model.predict(X_scaled), self.model.predict_proba(X_scaled))
+
+    def _latest(self, symbol: str, timeframe: str, n: int) -> pd.DataFrame:
+        if self.store is None:
+            raise ValueError("predict_latest needs the FeatureStore the model was trained from; pass store= to ModelInference")
+        return self.store.latest(symbol, timeframe, n, self.feature_names)
+
+    def _format(self, index, predictions, probabilities) -> List[Dict[str, Any]]:
+        return [
+            {
+                "prediction": "BUY" if prediction == 1 else "SELL",
+                "confidence": max(pred_proba),
+                "probabilities": {
+                    "SELL": pred_proba[0],
+                    "BUY": pred_proba[1]
+                },
+                "timestamp": timestamp.isoformat(),
+                "features_used": self.feature_names
+            }
+            for timestamp, prediction, pred_proba in zip(index, predictions, probabilities)
+        ]
+
 # Example usage
 if __name__ == "__main__":
     # Load model and make predictions
@@ -96,26 +96,39 @@ class ModelTrainer:
             logger.error(f"ML evaluation failed: {e}")
             return {}
     
-    def prepare_data(self, data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
-        """Prepare data for training"""
-        # Generate features
-        features_df = self.feature_engineer.calculate_technical_features(data)
+    def prepare_data(self, data: pd.DataFrame, feature_names: List[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Prepare data for training
+        :param feature_names: Feature columns already present in data (e.g. read from a
+            FeatureStore); features are computed when omitted
+        """
+        if feature_names is None:
+            # Generate features
+            features_df = self.feature_engineer.calculate_technical_features(data)
+            feature_names = self.feature_engineer.feature_names
+        else:
+            features_df = data.copy()
+        self.feature_names = list(feature_names)
         
         # Generate labels (1 for price increase, 0 for decrease)
         features_df['target'] = (features_df['close'].shift(-1) > features_df['close']).astype(int)
         
-        # Drop NaN values
-        features_df = features_df.dropna()
+        # Drop NaN values; ratios such as volume_change are inf after a zero-volume bar
+        features_df = features_df.replace([np.inf, -np.inf], np.nan).dropna()
         
         # Separate features and target
-        X = features_df[self.feature_engineer.feature_names]
+        X = features_df[self.feature_names]
         y = features_df['target']
         
         return X, y
     
-    def train(self, data: pd.DataFrame) -> Dict[str, float]:
+    def train_from_store(self, store, symbol: str, timeframe: str = "1d") -> Dict[str, float]:
+        """Train on the bars and features of a FeatureStore without recomputing them"""
+        return self.train(store.read(symbol, timeframe), store.feature_set.features)
+    
+    def train(self, data: pd.DataFrame, feature_names: List[str] = None) -> Dict[str, float]:
         """Train the model and return metrics"""
-        X, y = self.prepare_data(data)
+        X, y = self.prepare_data(data, feature_names)
         
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(
@@ -141,7 +154,7 @@ class ModelTrainer:
         
         # Feature importance
         feature_importance = dict(zip(
-            self.feature_engineer.feature_names,
+            self.feature_names,
             self.model.feature_importances_
         ))
         
@@ -158,7 +171,7 @@ class ModelTrainer:
         model_data = {
             "model": self.model,
             "scaler": self.scaler,
-            "feature_names": self.feature_engineer.feature_names
+            "feature_names": self.feature_names
         }
         joblib.dump(model_data, path)
 
@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+from typing import Dict, Iterable, List, Optional, Sequence
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+# Feature names follow trading.analysis.indicator_graph nodes, so panel and per-symbol results line up
+PANEL_FEATURES = (
+    "returns", "volume_change",
+    "sma_10", "sma_20", "ema_10", "ema_12", "ema_26",
+    "macd", "macd_signal", "macd_hist",
+    "std_20", "bb_upper_20", "bb_lower_20",
+    "rsi_14", "atr_14", "volatility_10",
+    "high_20", "low_20"
+)
+
+def _rolling(values: np.ndarray, window: int, reduce) -> np.ndarray:
+    """Apply reduce over trailing windows along axis 0; the first window - 1 rows are NaN"""
+    result = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        result[window - 1:] = reduce(sliding_window_view(values, window, axis=0), axis=-1)
+    return result
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    return _rolling(values, window, np.mean)
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    return _rolling(values, window, lambda view, axis: np.std(view, axis=axis, ddof=1))
+
+def _smooth(values: np.ndarray, alpha: float, seed: np.ndarray) -> np.ndarray:
+    """y[t] = y[t-1] + alpha * (x[t] - y[t-1]) along axis 0, starting from y[-1] = seed"""
+    return lfilter([alpha], [1.0, alpha - 1.0], values, axis=0, zi=np.asarray((1.0 - alpha) * seed)[np.newaxis])[0]
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """Column-wise pandas ewm(span, adjust=False).mean()"""
+    if len(values) == 0:
+        return values.astype(np.float64)
+    return _smooth(values, 2.0 / (span + 1), values[0])
+
+def wilder(values: np.ndarray, period: int, start: int = 0) -> np.ndarray:
+    """Column-wise Wilder smoothing of values[start:], seeded with the mean of its first period rows"""
+    result = np.full(values.shape, np.nan)
+    first = start + period - 1
+    if len(values) <= first:
+        return result
+    seed = values[start:first + 1].mean(axis=0)
+    result[first] = seed
+    if len(values) > first + 1:
+        result[first + 1:] = _smooth(values[first + 1:], 1.0 / period, seed)
+    return result
+
+def _pct_change(values: np.ndarray) -> np.ndarray:
+    result = np.full(values.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result[1:] = values[1:] / values[:-1] - 1.0
+    return result
+
+def compute_panel(fields: Dict[str, np.ndarray], features: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    Technical features for every symbol in one vectorized pass.
+    :param fields: OHLCV field -> (time x symbol) array; only close is required and
+        high/low/volume default to close / NaN. Symbols with a shorter history may
+        have leading NaN rows; gaps after the first price must be forward-filled,
+        since NaN propagates through the EMAs.
+    :param features: Names from PANEL_FEATURES to return (all by default)
+    :return: Feature name -> (time x symbol) float64 array
+    """
+    close = np.asarray(fields["close"], dtype=np.float64)
+    fields = {
+        "close": close,
+        "high": np.asarray(fields.get("high", close), dtype=np.float64),
+        "low": np.asarray(fields.get("low", close), dtype=np.float64),
+        "volume": np.asarray(fields["volume"], dtype=np.float64) if "volume" in fields else np.full(close.shape, np.nan)
+    }
+    names = list(PANEL_FEATURES if features is None else features)
+    valid = ~np.isnan(close)
+    starts = np.where(valid.any(axis=0), valid.argmax(axis=0), len(close))
+    if close.ndim == 1 or not starts.any():
+        out = _compute(fields)
+        return {name: out[name] for name in names}
+
+    # One pass per distinct history start; a full-history universe is a single group
+    result = {name: np.full(close.shape, np.nan) for name in names}
+    for start in np.unique(starts):
+        if start == len(close):
+            continue
+        columns = np.flatnonzero(starts == start)
+        out = _compute({name: values[start:, columns] for name, values in fields.items()})
+        for name in names:
+            result[name][start:, columns] = out[name]
+    return result
+
+def _compute(fields: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    close, high, low, volume = fields["close"], fields["high"], fields["low"], fields["volume"]
+    out: Dict[str, np.ndarray] = {}
+    out["returns"] = _pct_change(close)
+    out["volume_change"] = _pct_change(volume)
+    for window in (10, 20):
+        out[f"sma_{window}"] = rolling_mean(close, window)
+    for span in (10, 12, 26):
+        out[f"ema_{span}"] = ema(close, span)
+    out["macd"] = out["ema_12"] - out["ema_26"]
+    out["macd_signal"] = ema(out["macd"], 9)
+    out["macd_hist"] = out["macd"] - out["macd_signal"]
+    out["std_20"] = rolling_std(close, 20)
+    out["bb_upper_20"] = out["sma_20"] + 2 * out["std_20"]
+    out["bb_lower_20"] = out["sma_20"] - 2 * out["std_20"]
+
+    delta = np.full(close.shape, np.nan)
+    delta[1:] = np.diff(close, axis=0)
+    gain = wilder(np.clip(delta, 0, None), 14, start=1)
+    loss = wilder(np.clip(-delta, 0, None), 14, start=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + gain / loss)
+    out["rsi_14"] = np.where(loss == 0, 100.0, rsi)
+    out["rsi_14"][np.isnan(gain)] = np.nan
+
+    true_range = high - low
+    if len(close) > 1:
+        previous = close[:-1]
+        true_range[1:] = np.maximum.reduce([high[1:] - low[1:], np.abs(high[1:] - previous),
+                                            np.abs(low[1:] - previous)])
+    out["atr_14"] = wilder(true_range, 14)
+    out["volatility_10"] = rolling_std(out["returns"], 10)
+    out["high_20"] = _rolling(high, 20, np.max)
+    out["low_20"] = _rolling(low, 20, np.min)
+    return out
+
+class FeaturePanel:
+    """
+    Aligned (time x symbol) OHLCV arrays for a universe of symbols, with
+    panel-wide feature computation and per-bar cross-sectional snapshots.
+    """
+
+    def __init__(self, symbols: Sequence[str], fields: Dict[str, np.ndarray], index: Optional[pd.Index] = None):
+        self.symbols = list(symbols)
+        self.fields = {name: np.asarray(values, dtype=np.float64) for name, values in fields.items()}
+        self.index = index if index is not None else pd.RangeIndex(len(self.fields["close"]))
+        self.features: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame]) -> "FeaturePanel":
+        """Align per-symbol OHLCV DataFrames on their union index, forward-filling gaps"""
+        symbols = list(frames)
+        index = pd.Index([])
+        for frame in frames.values():
+            index = index.union(frame.index)
+        fields = {}
+        for name in FIELDS:
+            if all(name in frame for frame in frames.values()):
+                wide = pd.DataFrame({symbol: frames[symbol][name] for symbol in symbols}).reindex(index)
+                fields[name] = wide.ffill().to_numpy(dtype=np.float64)
+        return cls(symbols, fields, index)
+
+    @classmethod
+    def from_bars(cls, aggregator, tokens: Sequence, timeframe: str, n: int) -> "FeaturePanel":
+        """The latest n closed bars of each token from a BarAggregator (tokens with fewer are NaN-padded)"""
+        fields = {name: np.full((n, len(tokens)), np.nan) for name in FIELDS}
+        for column, token in enumerate(tokens):
+            bars = aggregator.last(token, timeframe, n)
+            count = len(bars["close"])
+            for name in FIELDS:
+                fields[name][n - count:, column] = bars[name]
+        return cls([str(token) for token in tokens], fields)
+
+    def compute(self, features: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        self.features = compute_panel(self.fields, features)
+        return self.features
+
+    def feature(self, name: str) -> pd.DataFrame:
+        """One feature as a (time x symbol) DataFrame"""
+        return pd.DataFrame(self.features[name], index=self.index, columns=self.symbols)
+
+    def latest(self, row: int = -1) -> pd.DataFrame:
+        """Cross-section of every computed feature at one bar: symbols x features"""
+        return pd.DataFrame({name: values[row] for name, values in self.features.items()}, index=self.symbols)
+
+    def scan(self, condition) -> List[str]:
+        """Symbols whose latest cross-section satisfies condition(DataFrame) -> boolean Series"""
+        snapshot = self.latest()
+        return snapshot.index[condition(snapshot).to_numpy()].tolist()
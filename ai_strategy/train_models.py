@@ -1,12 +1,18 @@
 from .model_training import ModelTrainer
+from .feature_store import FeatureStore
 import pandas as pd
 import yfinance as yf
 import os
 
-def train_models():
+FEATURE_STORE_PATH = os.getenv("FEATURE_STORE_PATH", "data/features")
+
+def train_models(start: str = "2020-01-01", end: str = "2024-02-19"):
     # Create models directory
     os.makedirs("models", exist_ok=True)
     
+    # Bars and features persist between runs; only bars after the stored history are downloaded
+    store = FeatureStore(FEATURE_STORE_PATH)
+    
     # Symbol mapping for NSE indices
     symbols = {
         "NIFTY": "^NSEI",  # Changed from ^NIFTY to ^NSEI
@@ -17,30 +23,41 @@ def train_models():
         print(f"Training model for {name}")
         
         try:
-            # Download historical data
-            print(f"Downloading data for {symbol}...")
-            data = yf.download(
-                symbol,
-                start="2020-01-01",
-                end="2024-02-19",
-                progress=True,
-                auto_adjust=True
-            )
+            # Download historical data missing from the store
+            last = store.last_timestamp(name, "1d")
+            download_start = (pd.Timestamp(last, unit="ms") + pd.Timedelta(days=1)).strftime("%Y-%m-%d") if last else start
+            if download_start < end:
+                print(f"Downloading data for {symbol} from {download_start}...")
+                data = yf.download(
+                    symbol,
+                    start=download_start,
+                    end=end,
+                    progress=True,
+                    auto_adjust=True
+                )
+                if isinstance(data.columns, pd.MultiIndex):
+                    data.columns = data.columns.get_level_values(0)
+                data.columns = [str(column).lower() for column in data.columns]
+                
+                if not data.empty:
+                    print(f"Downloaded {len(data)} rows of data")
+                    store.append(name, "1d", data)
             
-            if data.empty:
+            # Recompute only features whose definition changed since they were stored
+            rebuilt = store.rebuild(name, "1d")
+            if rebuilt:
+                print(f"Rebuilt stored features: {rebuilt}")
+            
+            if store.rows(name, "1d") == 0:
                 print(f"No data found for {symbol}")
                 continue
-                
-            print(f"Downloaded {len(data)} rows of data")
-            print("Sample data:")
-            print(data.head())
             
             # Initialize trainer
-            trainer = ModelTrainer(name)
+            trainer = ModelTrainer()
             
-            # Train model
+            # Train model on stored features
             print(f"Training model for {name}...")
-            metrics = trainer.train(data)
+            metrics = trainer.train_from_store(store, name, "1d")
             print(f"Training metrics for {name}:")
             print(metrics)
             
@@ -2,7 +2,17 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import socketio
 from ws import SmartWebSocket, WebSocketManager
+from ws.tick_bus import tick_bus, CONFLATE
+from ws.conflation import Conflator
+from ws.async_smart_websocket import log_task_errors
+from database.tick_journal import TickJournalWriter
+from trading.market_data.bar_aggregator import BarAggregator, TIMEFRAMES
+from trading.market_data.data_quality import quality_snapshot
+from core.config import settings
 from core.logger import logger
+from core.compute_executor import compute_executor
+import asyncio
+from typing import List, Optional
 # ... rest of imports
 
 # Initialize FastAPI app
@@ -51,6 +61,30 @@ async def subscribe_market_data(sid, data):
     for symbol in data:
         await sio_server.enter_room(sid, f"market_data_{symbol}")
 
+# Latest state per token; UI clients get coalesced updates at 4 Hz instead of every tick
+conflator = Conflator()
+
+# 1s/1m/5m/15m bars for every token; strategies subscribe to bar_aggregator.bus
+bar_aggregator = BarAggregator()
+
+# Raw tick journal, when TICK_JOURNAL_PATH is set
+journal: Optional[TickJournalWriter] = None
+
+# Bus consumers started at startup, cancelled at shutdown
+background_tasks: List[asyncio.Task] = []
+
+def start_background(coro, name: str):
+    background_tasks.append(log_task_errors(asyncio.create_task(coro), name))
+
+async def emit_snapshot(snapshot):
+    for token, state in snapshot.items():
+        await sio_server.emit("market_data", state, room=f"market_data_{token}")
+
+async def relay_ticks():
+    """Merge bus ticks into the conflator and emit snapshots to Socket.IO rooms"""
+    conflator.add_consumer("socketio", emit_snapshot, hz=4)
+    await conflator.consume(tick_bus.subscribe(maxsize=5000, policy=CONFLATE))
+
 # API routes
 @app.get("/")
 async def root():
@@ -63,12 +97,42 @@ async def health_check():
         "websocket": websocket_manager.connected
     }
 
+@app.get("/bars/{token}/{timeframe}")
+async def get_bars(token: str, timeframe: str, limit: int = 500):
+    if timeframe not in TIMEFRAMES:
+        return {"error": f"Unknown timeframe: {timeframe}"}
+    frame = bar_aggregator.frame(token, timeframe, limit)
+    return frame.reset_index(names="start").to_dict(orient="records")
+
+@app.get("/metrics/feed")
+async def feed_metrics():
+    if websocket_manager.websocket is None:
+        return {"status": "disconnected"}
+    return websocket_manager.websocket.metrics.snapshot()
+
+@app.get("/metrics/journal")
+async def journal_metrics():
+    if journal is None:
+        return {"status": "disabled"}
+    return journal.stats()
+
+@app.get("/metrics/quality")
+async def quality_metrics():
+    return quality_snapshot()
+
 # Startup event
 @app.on_event("startup")
 async def startup_event():
+    global journal
     try:
         # Initialize WebSocket connection
         await websocket_manager.connect()
+        start_background(relay_ticks(), "Tick relay")
+        start_background(bar_aggregator.consume(tick_bus.subscribe(maxsize=100000)), "Bar aggregator")
+        start_background(bar_aggregator.run_clock(), "Bar clock")
+        if settings.TICK_JOURNAL_PATH:
+            journal = TickJournalWriter(settings.TICK_JOURNAL_PATH)
+            start_background(journal.consume(tick_bus.subscribe(maxsize=100000)), "Tick journal")
         
         # Subscribe to default symbols
         default_symbols = ["NIFTY", "BANKNIFTY"]
@@ -81,5 +145,13 @@ async def startup_event():
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    background_tasks.clear()
     if websocket_manager.connected:
-        await websocket_manager.stop() 
\ No newline at end of file
+        await websocket_manager.close()
+    if journal is not None:
+        # Write whatever is still buffered before the process exits
+        journal.close()
+    compute_executor.close(wait=False) 
\ No newline at end of file
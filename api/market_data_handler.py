@@ -3,32 +3,36 @@ import asyncio
 import random
 from core.logger import logger
 from trading.brokers.angel_one import AngelOneAPI
-from trading.analysis.option_chain import OptionChainAnalyzer
+from api.option_chain_analysis import OptionChainAnalyzer
 
 class MarketDataHandler:
     def __init__(self, sio):
         self.sio = sio
         self.running = False
         self.broker = AngelOneAPI()
-        self.analyzer = OptionChainAnalyzer()
         self.symbols = {
             'NIFTY': {'last': 19500.0},
             'BANKNIFTY': {'last': 45600.0}
         }
+        # One analyzer per index, since each keeps that index's vol surface
+        self.analyzers = {symbol: OptionChainAnalyzer(symbol) for symbol in self.symbols}
         self.logger = logger  # Use the common logger
     
     async def start(self):
         """Start market data streaming"""
         self.running = True
+        loop = asyncio.get_running_loop()
         while self.running:
             try:
-                # Get option chain data
-                nifty_chain = self.broker.get_option_chain("NIFTY")
-                banknifty_chain = self.broker.get_option_chain("BANKNIFTY")
+                # Get option chain data; the broker call blocks on HTTP, so it runs on a thread
+                nifty_chain = await loop.run_in_executor(None, self.broker.get_option_chain, "NIFTY")
+                banknifty_chain = await loop.run_in_executor(None, self.broker.get_option_chain, "BANKNIFTY")
                 
-                # Analyze chains
-                nifty_analysis = self.analyzer.analyze_chain(nifty_chain)
-                banknifty_analysis = self.analyzer.analyze_chain(banknifty_chain)
+                # Analyze chains; the IV solve and Greeks run on the compute executor
+                nifty_analysis = await self.analyzers['NIFTY'].analyze_chain_async(
+                    nifty_chain, self.symbols['NIFTY']['last'])
+                banknifty_analysis = await self.analyzers['BANKNIFTY'].analyze_chain_async(
+                    banknifty_chain, self.symbols['BANKNIFTY']['last'])
                 
                 # Emit data to clients
                 await self.sio.emit('market_data', {
@@ -4,18 +4,26 @@ import numpy as np
 from scipy.stats import norm
 from typing import Dict, List, Optional
 import math
-from trading.analysis.greeks_calculator import GreeksCalculator
+from trading.analysis.greeks_calculator import GreeksCalculator, chain_greeks
+from trading.analysis.greeks_cache import GreeksCache
+from trading.analysis.vol_surface import VolSurface
+from trading.analysis import chain_stats
 from datetime import datetime, date
+from core.logger import logger
+from core.compute_executor import compute_executor
 
 class OptionChainAnalyzer:
-    def __init__(self, symbol="NIFTY", expiry=None):
-        """Initialize with the index symbol and expiry date."""
+    def __init__(self, symbol="NIFTY", expiry=None, greeks_cache: Optional[GreeksCache] = None):
+        """Initialize with the index symbol, expiry date and optional Greeks cache."""
         self.symbol = symbol
-        self.expiry = expiry or self._get_nearest_expiry()
+        self.expiry = expiry  # analyze_chain reads the expiry of the chain it is given
         self.url = f"https://www.nseindia.com/api/option-chain-indices?symbol={self.symbol}"
         self.spot_price = None
         self.chain_data = None
         self.greeks_calculator = GreeksCalculator()
+        self.greeks_cache = greeks_cache
+        self.risk_free_rate = 0.05
+        self.vol_surface = VolSurface(symbol)
 
     def fetch_option_chain(self):
         """
@@ -93,52 +101,110 @@ class OptionChainAnalyzer:
     def analyze_chain(self, chain_data: dict, spot_price: float) -> dict:
         """Analyze option chain data with Greeks"""
         try:
-            df = pd.DataFrame(chain_data['data'])
+            df, strikes, is_call, time_to_expiry = self._chain_inputs(chain_data, spot_price)
             
-            # Add required columns
-            df['Underlying'] = spot_price
-            df['Last Price'] = df.apply(lambda x: x['ce']['ltp'] if 'ce' in x else x['pe']['ltp'], axis=1)
-            df['Expiry'] = pd.to_datetime(chain_data['expiry_date']).date()
+            # Solve IV and Greeks for the whole chain in one vectorized pass
+            iv_result = self.greeks_calculator.calculate_implied_volatility_batch(
+                df['Last Price'].to_numpy(dtype=float), spot_price, strikes,
+                time_to_expiry, self.risk_free_rate, is_call
+            )
+            pricer = self.greeks_cache or self.greeks_calculator
+            greeks = pricer.calculate_greeks_batch(
+                spot_price, strikes, time_to_expiry,
+                iv_result['iv'], self.risk_free_rate, is_call
+            )
+            return self._chain_analysis(df, chain_data, spot_price, strikes, time_to_expiry, iv_result['iv'], greeks)
             
-            # Calculate Greeks
-            df['IV'] = df.apply(lambda row: self.greeks_calculator.calculate_iv(row), axis=1)
-            df['Delta'] = df.apply(lambda row: self.greeks_calculator.calculate_delta(row), axis=1)
-            df['Gamma'] = df.apply(lambda row: self.greeks_calculator.calculate_gamma(row), axis=1)
-            df['Theta'] = df.apply(lambda row: self.greeks_calculator.calculate_theta(row), axis=1)
-            df['Vega'] = df.apply(lambda row: self.greeks_calculator.calculate_vega(row), axis=1)
-            
-            # Basic analysis
-            analysis = {
-                'symbol': self.symbol,
+        except Exception as e:
+            logger.error(f"Error analyzing option chain: {e}")
+            return None
+
+    async def analyze_chain_async(self, chain_data: dict, spot_price: float, executor=None) -> dict:
+        """
+        analyze_chain with the IV solve and Greeks run on a ComputeExecutor (the shared
+        one by default), so large chains do not block the event loop. greeks_cache is
+        not consulted, since its entries live in this process.
+        """
+        try:
+            executor = executor or compute_executor
+            df, strikes, is_call, time_to_expiry = self._chain_inputs(chain_data, spot_price)
+            result = await executor.run(chain_greeks, {
+                'option_price': df['Last Price'].to_numpy(dtype=float),
                 'spot_price': spot_price,
-                'expiry_date': chain_data['expiry_date'],
-                'pcr': self._calculate_pcr(df),
-                'max_pain': self._calculate_max_pain(df),
-                'iv_skew': self._calculate_iv_skew(df),
-                'greeks_data': df[['strike_price', 'IV', 'Delta', 'Gamma', 'Theta', 'Vega']].to_dict('records')
-            }
-            
-            return analysis
+                'strike_price': strikes,
+                'time_to_expiry': time_to_expiry,
+                'is_call': is_call
+            }, risk_free_rate=self.risk_free_rate)
+            return self._chain_analysis(df, chain_data, spot_price, strikes, time_to_expiry, result['iv'], result)
             
         except Exception as e:
             logger.error(f"Error analyzing option chain: {e}")
             return None
+
+    def _chain_inputs(self, chain_data: dict, spot_price: float):
+        """Chain DataFrame plus the strike, call-mask and time-to-expiry inputs of the IV/Greeks batch"""
+        df = pd.DataFrame(chain_data['data'])
+        
+        # Add required columns
+        df['Underlying'] = spot_price
+        df['Last Price'] = df.apply(lambda x: x['ce']['ltp'] if 'ce' in x else x['pe']['ltp'], axis=1)
+        df['Expiry'] = pd.to_datetime(chain_data['expiry_date']).date()
+        
+        strikes = df['strike_price'].to_numpy(dtype=float)
+        if 'Option Type' in df.columns:
+            is_call = (df['Option Type'] == 'CE').to_numpy()
+        else:
+            is_call = np.full(len(df), 'ce' in df.columns)
+        expiry = datetime.combine(df['Expiry'].iloc[0], datetime.min.time())
+        time_to_expiry = (expiry - datetime.today()).days / 365
+        return df, strikes, is_call, time_to_expiry
+
+    def _chain_analysis(self, df, chain_data: dict, spot_price: float, strikes, time_to_expiry, iv, greeks) -> dict:
+        df['IV'] = iv
+        self.vol_surface.update_quotes(
+            chain_data['expiry_date'], strikes, iv,
+            spot_price * np.exp(self.risk_free_rate * time_to_expiry), time_to_expiry
+        )
+        df['Delta'] = greeks['delta']
+        df['Gamma'] = greeks['gamma']
+        df['Theta'] = greeks['theta']
+        df['Vega'] = greeks['vega']
+        
+        # Basic analysis
+        return {
+            'symbol': self.symbol,
+            'spot_price': spot_price,
+            'expiry_date': chain_data['expiry_date'],
+            'pcr': self._calculate_pcr(df),
+            'max_pain': self._calculate_max_pain(df),
+            'iv_skew': self._calculate_iv_skew(df),
+            **chain_stats.support_resistance(
+                strikes, self._leg_oi(df, 'ce'), self._leg_oi(df, 'pe')
+            ),
+            'greeks_data': df[['strike_price', 'IV', 'Delta', 'Gamma', 'Theta', 'Vega']].to_dict('records')
+        }
+            
+    @staticmethod
+    def _leg_oi(df, leg: str) -> np.ndarray:
+        """Open interest array for the 'ce' or 'pe' leg, zero where missing"""
+        if leg not in df.columns:
+            return np.zeros(len(df))
+        return np.fromiter(
+            (x.get('oi', 0) if isinstance(x, dict) else 0 for x in df[leg]),
+            dtype=float, count=len(df)
+        )
             
     def _calculate_pcr(self, df):
         """Calculate Put-Call Ratio"""
-        total_ce_oi = df['ce'].apply(lambda x: x.get('oi', 0)).sum()
-        total_pe_oi = df['pe'].apply(lambda x: x.get('oi', 0)).sum()
-        return total_pe_oi / total_ce_oi if total_ce_oi > 0 else 0
+        return chain_stats.put_call_ratio(self._leg_oi(df, 'ce'), self._leg_oi(df, 'pe'), default=0)
         
     def _calculate_max_pain(self, df):
         """Calculate Max Pain point"""
-        # Implementation here...
-        pass
+        return chain_stats.max_pain(df['strike_price'], self._leg_oi(df, 'ce'), self._leg_oi(df, 'pe'))
         
     def _calculate_iv_skew(self, df):
-        """Calculate IV Skew"""
-        # Implementation here...
-        pass
+        """Calculate IV Skew from the cached volatility surface"""
+        return self.vol_surface.skew()
 
     def get_trading_signals(self, analysis: Dict) -> Dict:
         """Generate trading signals based on analysis"""
@@ -143,6 +143,7 @@ class BacktestEngine:
                 timestamp=signal.timestamp,
                 strategy=signal.strategy_name
             )
+            self.risk_manager.record_fill(signal)
 
             # Update positions
             if signal.action == "BUY":
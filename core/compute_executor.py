@@ -0,0 +1,187 @@
+import asyncio
+import functools
+import multiprocessing
+import sys
+import numpy as np
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from core.config import settings
+from core.logger import logger
+
+MODES = ("process", "thread", "inline")
+
+# Batch task signature: fn(arrays, **kwargs) -> arrays, with arrays a dict of name -> ndarray
+Task = Callable[..., Dict[str, np.ndarray]]
+
+class SharedArray(NamedTuple):
+    """Picklable handle to an ndarray held in a named shared memory segment"""
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+def _share(array) -> Tuple[shared_memory.SharedMemory, SharedArray]:
+    """Copy array into a new segment; the caller closes it and decides who unlinks it"""
+    array = np.asarray(array)
+    if array.dtype.hasobject:
+        raise TypeError(f"Object arrays cannot be shared: {array.dtype}")
+    segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, array.dtype, buffer=segment.buf)[...] = array
+    return segment, SharedArray(segment.name, array.shape, array.dtype.str)
+
+def _attach(handle: SharedArray) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    segment = shared_memory.SharedMemory(name=handle.name)
+    return segment, np.ndarray(handle.shape, np.dtype(handle.dtype), buffer=segment.buf)
+
+def _collect(handle: SharedArray) -> np.ndarray:
+    """Copy a worker result out of its segment and free it"""
+    segment, view = _attach(handle)
+    array = view.copy()
+    del view
+    segment.close()
+    segment.unlink()
+    return array
+
+def _discard(handles: Dict[str, SharedArray]):
+    for handle in handles.values():
+        try:
+            segment = shared_memory.SharedMemory(name=handle.name)
+            segment.close()
+            segment.unlink()
+        except FileNotFoundError:
+            pass
+
+def _run_shared(fn: Task, inputs: Dict[str, SharedArray], kwargs: Dict) -> Dict[str, SharedArray]:
+    """
+    Worker side of ComputeExecutor.run: map the inputs read-only, call fn and move
+    its results into new segments, which the parent copies out and unlinks.
+    """
+    segments = []
+    outputs: Dict[str, SharedArray] = {}
+    try:
+        arrays = {}
+        for key, handle in inputs.items():
+            segment, array = _attach(handle)
+            array.flags.writeable = False
+            segments.append(segment)
+            arrays[key] = array
+        results = fn(arrays, **kwargs)
+        for key, value in results.items():
+            segment, outputs[key] = _share(value)
+            segment.close()
+        return outputs
+    except BaseException:
+        _discard(outputs)
+        raise
+    finally:
+        # Views into the inputs must be gone before their segments can be closed
+        arrays = results = array = value = None
+        for segment in segments:
+            segment.close()
+
+def _ready() -> bool:
+    return True
+
+class ComputeExecutor:
+    """
+    Runs CPU-bound batch tasks (indicators, Greeks, model inference) off the event
+    loop. A task is a module-level function taking a dict of arrays plus keyword
+    arguments and returning a dict of arrays. In "process" mode the inputs are
+    copied once into shared memory segments that the pool workers map directly,
+    and results come back the same way, so neither side pickles array data;
+    "thread" runs tasks on a thread pool and "inline" on the loop itself (tests,
+    debugging). Tasks must not keep references to their input arrays.
+    """
+
+    def __init__(self, mode: str = "process", max_workers: Optional[int] = None, start_method: Optional[str] = None):
+        """
+        :param mode: One of MODES
+        :param max_workers: Pool size (os.cpu_count() by default)
+        :param start_method: multiprocessing start method for "process" mode; forkserver
+            by default on POSIX, since forking a process that runs an event loop and
+            feed threads is unsafe
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown compute mode: {mode}")
+        self.mode = mode
+        self.max_workers = max_workers
+        if start_method is None:
+            start_method = "forkserver" if sys.platform != "win32" else "spawn"
+        self.start_method = start_method
+        self._executor: Optional[Executor] = None
+        self.submitted = 0
+        self.failed = 0
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(self.max_workers,
+                                                     mp_context=multiprocessing.get_context(self.start_method))
+            else:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="compute")
+        return self._executor
+
+    async def start(self):
+        """Create the pool and wait for its workers, so the first batch does not pay for startup"""
+        if self.mode == "inline":
+            return
+        loop = asyncio.get_running_loop()
+        workers = self.max_workers or multiprocessing.cpu_count()
+        await asyncio.gather(*(loop.run_in_executor(self._pool(), _ready) for _ in range(workers)))
+
+    async def run(self, fn: Task, arrays: Dict[str, np.ndarray], **kwargs) -> Dict[str, np.ndarray]:
+        """
+        Run fn(arrays, **kwargs) according to the mode.
+        :param fn: Module-level (picklable) task function
+        :param arrays: Input name -> array (numeric or bool; scalars become 0-d arrays)
+        :return: fn's result dict, as arrays owned by the caller
+        """
+        self.submitted += 1
+        if self.mode == "inline":
+            return fn(arrays, **kwargs)
+        loop = asyncio.get_running_loop()
+        if self.mode == "thread":
+            return await loop.run_in_executor(self._pool(), functools.partial(fn, arrays, **kwargs))
+
+        segments: List[shared_memory.SharedMemory] = []
+        try:
+            handles = {}
+            for key, array in arrays.items():
+                segment, handles[key] = _share(array)
+                segments.append(segment)
+            future = self._pool().submit(_run_shared, fn, handles, kwargs)
+            try:
+                outputs = await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                # A task that already started still produces segments nobody will collect
+                future.add_done_callback(self._discard_result)
+                raise
+        except BrokenProcessPool as e:
+            self.failed += 1
+            logger.error(f"Compute pool failed, restarting on next batch: {e}")
+            self._executor = None
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+        return {key: _collect(handle) for key, handle in outputs.items()}
+
+    @staticmethod
+    def _discard_result(future: Future):
+        if not future.cancelled() and future.exception() is None:
+            _discard(future.result())
+
+    def close(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+# Shared execution stage for batch analytics such as the chain IV solve and Greeks;
+# the process pool is created on the first batch
+compute_executor = ComputeExecutor(settings.COMPUTE_MODE, settings.COMPUTE_WORKERS)
@@ -35,6 +35,7 @@ class Settings:
     LOG_DIR = "logs"
     MODEL_PATH = "ai_strategy/models"
     DATA_PATH = "ai_strategy/data"
+    TICK_JOURNAL_PATH = os.getenv("TICK_JOURNAL_PATH")  # tick recording is off when unset
     
     # Logging Settings
     LOG_LEVEL = "INFO"
@@ -43,12 +44,17 @@ class Settings:
     WS_RECONNECT_ATTEMPTS = 3
     WS_RECONNECT_DELAY = 5
     WS_HEARTBEAT_INTERVAL = 30
+    SMARTAPI_FEED_URI = os.getenv("SMARTAPI_FEED_URI")  # e.g. a local ws.feed_simulator; skips login and market hours
+    FEED_METRICS_DSN = os.getenv("FEED_METRICS_DSN")  # asyncpg DSN; feed health samples are persisted when set
+    TICK_MAX_AGE_MS = int(os.getenv("TICK_MAX_AGE_MS", 5000))  # live ticks older than this are rejected as stale
     
     # Market Data Settings
     ALPHA_VANTAGE_API_KEY = None  # Set in .env
     
     # System Settings
     MAX_WORKERS = 4
+    COMPUTE_MODE = os.getenv("COMPUTE_MODE", "process")  # batch analytics: process, thread or inline
+    COMPUTE_WORKERS = int(os.getenv("COMPUTE_WORKERS", MAX_WORKERS))
     DEBUG = True
 
 settings = Settings()
\ No newline at end of file
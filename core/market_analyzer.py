@@ -1,17 +1,22 @@
 import numpy as np
-from typing import Dict, List
+from typing import Optional
+
+from trading.market_data.ring_buffer import PriceHistoryStore, price_history
 
 class MarketAnalyzer:
-    def __init__(self):
-        self.price_history: Dict[str, List[float]] = {}
+    def __init__(self, history: Optional[PriceHistoryStore] = None):
+        self.price_history = history if history is not None else price_history
     
-    def update_price(self, symbol: str, price: float):
-        if symbol not in self.price_history:
-            self.price_history[symbol] = []
-        self.price_history[symbol].append(price)
+    def update_price(self, symbol: str, price: float, volume: int = 0):
+        self.price_history.append(symbol, price, volume=volume)
     
     def calculate_vwap(self, symbol: str) -> float:
-        prices = self.price_history.get(symbol, [])
-        if not prices:
+        if symbol not in self.price_history:
+            return 0
+        window = self.price_history.last(symbol)
+        if not len(window):
             return 0
-        return np.mean(prices) 
\ No newline at end of file
+        total_volume = window.volume.sum()
+        if total_volume > 0:
+            return float(np.dot(window.price, window.volume) / total_volume)
+        return float(np.mean(window.price)) 
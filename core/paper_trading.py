@@ -88,6 +88,8 @@ class PaperTradingSystem:
         try:
             # Get latest market data
             market_data = await self.trading_engine.get_market_data()
+            if market_data is None:
+                return
             
             # Generate signals
             signals = await self.trading_engine.generate_signals(market_data)
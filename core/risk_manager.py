@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from core.exceptions import RiskLimitError
 from database.service import DatabaseService
 from core.logger import logger
+from trading.risk_management.scenario_engine import ScenarioEngine, contract_key, trade_leg, trade_underlying
 
 # Move Trade type hint to function level to avoid circular import
 from typing import TYPE_CHECKING
@@ -22,10 +23,15 @@ class RiskManager:
             "max_leverage": 5,             # Max leverage
             "min_margin": 0.2,             # Minimum margin requirement
             "max_concentration": 0.3,       # Max concentration in single asset
-            "max_drawdown": 0.15           # Max drawdown threshold
+            "max_drawdown": 0.15,          # Max drawdown threshold
+            "max_scenario_loss": 200000    # Worst stress-grid loss for the options book
         }
         self.max_position_size = 1000  # Maximum position size
         self.max_trade_value = 1000000  # Maximum trade value in rupees
+        # Options book stress grid; attach one to check scenario losses before orders
+        self.scenario_engine: Optional[ScenarioEngine] = None
+        # Last known spot per underlying, for option orders that carry none
+        self.spots: Dict[str, float] = {}
         
     async def validate_trade(self, trade_data: Dict, user: Dict) -> bool:
         """Validate trade against risk limits"""
@@ -123,8 +129,69 @@ class RiskManager:
                 logger.warning(f"Trade value {trade_value} exceeds max value {self.max_trade_value}")
                 return False
                 
+            # Stress-test option orders against the book; record_fill books them once placed
+            leg = self._option_leg(trade)
+            if leg is not None and not self.check_scenario_risk(leg):
+                return False
+                
             return True
             
         except Exception as e:
             logger.error(f"Risk check failed: {e}")
-            return False 
\ No newline at end of file
+            return False 
+
+    def update_spot(self, underlying: str, spot: float):
+        """Record the underlying's latest price for pricing option orders without a spot"""
+        self.spots[underlying] = float(spot)
+
+    def record_fill(self, trade: "Trade") -> Optional[int]:
+        """
+        Book a placed or filled option order into the scenario book, netting it against
+        the open position in the same contract (so closing orders reduce it).
+        :return: Index of the position in the book, None if nothing is held
+        """
+        try:
+            leg = self._option_leg(trade)
+            if leg is None:
+                return None
+            self.update_spot(trade_underlying(trade), leg["spot"])
+            return self.scenario_engine.book(contract_key(trade, leg), **leg)
+        except Exception as e:
+            logger.error(f"Booking option fill failed: {e}")
+            return None
+
+    def _option_leg(self, trade) -> Optional[Dict]:
+        """
+        Scenario leg of an option trade, priced off the last known spot of its underlying
+        when the trade has none; None for non-option trades or without a scenario engine.
+        :raises ValueError: Option trade whose spot or volatility is unknown
+        """
+        if self.scenario_engine is None or getattr(trade, "strike", None) is None:
+            return None
+        underlying = trade_underlying(trade)
+        leg = trade_leg(trade, self.spots.get(underlying))
+        if leg is None:
+            raise ValueError(f"Cannot stress-test option order on {underlying}: spot or volatility unknown")
+        return leg
+
+    def check_scenario_risk(self, option_leg: Optional[Dict] = None) -> bool:
+        """
+        Check the worst stress-grid loss of the options book against the limit.
+        :param option_leg: Optional hypothetical leg (spot, strike, time_to_expiry,
+                           volatility, is_call, quantity); it passes if the book with it
+                           stays within the limit or loses no more than without it
+        """
+        if self.scenario_engine is None:
+            return True
+        try:
+            limit = self.risk_limits["max_scenario_loss"]
+            if option_leg:
+                allowed = self.scenario_engine.allows(option_leg, limit)
+            else:
+                allowed = self.scenario_engine.worst_loss() <= limit
+            if not allowed:
+                logger.warning(f"Scenario loss would exceed limit {limit}")
+            return allowed
+        except Exception as e:
+            logger.error(f"Scenario risk check failed: {e}")
+            return False
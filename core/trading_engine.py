@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
@@ -15,7 +16,9 @@ from database.service import async_session  # Use async_session instead of engin
 import os
 from trading.brokers.paper_broker import PaperBroker
 from core.config import settings
-import pandas as pd
+from trading.market_data.streaming_indicators import IndicatorStore
+from trading.market_data.ring_buffer import price_history
+from trading.market_data.data_quality import DataQualityFilter
 
 @dataclass
 class Trade:
@@ -54,8 +57,12 @@ class TradingEngine:
         self.analyzer = OptionChainAnalyzer()
         self.active_trades = {}
         self.last_price = None
-        # Initialize price history as empty DataFrame with timestamp index
-        self.price_history = pd.DataFrame(columns=['price'])
+        # Per-symbol ring buffers shared with ChartManager and MarketAnalyzer
+        self.price_history = price_history
+        # Streaming indicators per symbol, updated once per price
+        self.indicators = IndicatorStore()
+        # Broker quotes are validated before they reach the history, indicators or orders
+        self.quality = DataQualityFilter(name="broker")
     
     def get_trade(self, trade_id: str):
         """Get a specific trade by ID"""
@@ -77,6 +84,7 @@ class TradingEngine:
             order_id = await self.order_manager.place_order(trade)
             if not order_id:
                 return False
+            self.risk_manager.record_fill(trade)
                 
             # Store trade
             trade.order_id = order_id
@@ -136,11 +144,8 @@ class TradingEngine:
 
     async def execute_strategy(self):
         try:
-            # Get market data
-            nifty_chain = self.broker.get_option_chain("NIFTY")
-            
-            # Analyze for signals
-            signals = self.analyzer.analyze_chain(nifty_chain)
+            # Fetch and analyze the chain on a thread; the broker call blocks on HTTP
+            signals = await asyncio.get_running_loop().run_in_executor(None, self._analyze_chain, "NIFTY")
             
             # Apply risk management
             for signal in signals:
@@ -160,6 +165,11 @@ class TradingEngine:
         except Exception as e:
             logger.error(f"Strategy execution error: {str(e)}") 
 
+    def _analyze_chain(self, symbol: str):
+        """Fetch symbol's option chain and analyze it against the last known spot"""
+        chain = self.broker.get_option_chain(symbol)
+        return self.analyzer.analyze_chain(chain, self.risk_manager.spots.get(symbol))
+
     async def get_positions(self) -> List[Dict]:
         """Get current positions"""
         try:
@@ -202,22 +212,23 @@ class TradingEngine:
         """Get market data from broker"""
         try:
             market_data = await self.broker.get_market_data(symbol)
+            if market_data and self.quality.check(symbol, float(market_data['price'])):
+                return None
             if market_data:
-                # Update price history using concat instead of append
-                new_data = pd.DataFrame(
-                    {'price': [market_data['price']]},
-                    index=[pd.Timestamp.now()]
+                # Update price history in place
+                self.price_history.append(
+                    symbol,
+                    float(market_data['price']),
+                    volume=int(market_data.get('volume') or 0),
+                    oi=int(market_data.get('oi') or 0)
                 )
-                self.price_history = pd.concat([
-                    self.price_history, 
-                    new_data
-                ]).last('1D')
                 
                 # Add indicators
-                self._add_indicators(market_data)
+                self._add_indicators(market_data, symbol)
                 
                 # Update last price
                 self.last_price = market_data['price']
+                self.risk_manager.update_spot(symbol, float(market_data['price']))
                 
             return market_data
             
@@ -225,24 +236,19 @@ class TradingEngine:
             logger.error(f"Error getting market data: {e}")
             return None
             
-    def _add_indicators(self, market_data: Dict):
+    def _add_indicators(self, market_data: Dict, symbol: str = "NIFTY"):
         """Add technical indicators to market data"""
         try:
-            if len(self.price_history) > 0:
-                # Calculate on price history DataFrame
-                prices = self.price_history['price']
-                
-                # Add basic indicators
-                market_data['MA10'] = prices.rolling(10).mean().iloc[-1] if len(prices) >= 10 else prices.mean()
-                market_data['EMA10'] = prices.ewm(span=10).mean().iloc[-1] if len(prices) >= 10 else prices.mean()
-                
-                # Add RSI if enough data
-                if len(prices) > 14:
-                    delta = prices.diff()
-                    gain = delta.where(delta > 0, 0).rolling(14).mean()
-                    loss = -delta.where(delta < 0, 0).rolling(14).mean()
-                    rs = gain / loss
-                    market_data['RSI'] = 100 - (100 / (1 + rs)).iloc[-1]
+            indicators = self.indicators.get(symbol)
+            indicators.update(float(market_data['price']))
+            
+            # Add basic indicators, falling back to the EMA until 10 prices are seen
+            market_data['EMA10'] = indicators.ema10.value
+            market_data['MA10'] = indicators.sma10.value if indicators.sma10.ready else indicators.ema10.value
+            
+            # Add RSI once enough data
+            if indicators.rsi.ready:
+                market_data['RSI'] = indicators.rsi.value
                 
         except Exception as e:
             logger.error(f"Error calculating indicators: {e}") 
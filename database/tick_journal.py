@@ -0,0 +1,340 @@
+import asyncio
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from core.logger import logger
+
+# Fixed-width tick record; prices are in paise as sent by SmartAPI
+TICK_RECORD_DTYPE = np.dtype([
+    ("exchange_timestamp", "<i8"),   # epoch milliseconds
+    ("token", "<i8"),
+    ("sequence_number", "<i8"),
+    ("last_traded_price", "<i8"),
+    ("last_traded_quantity", "<i8"),
+    ("volume", "<i8"),
+    ("open_interest", "<i8"),
+    ("total_buy_quantity", "<f8"),
+    ("total_sell_quantity", "<f8"),
+    ("exchange_type", "u1"),
+    ("subscription_mode", "u1"),
+    ("_reserved", "V6"),
+])
+
+# One entry per (flush, token) block of contiguous records in a segment
+INDEX_DTYPE = np.dtype([
+    ("token", "<i8"),
+    ("start", "<i8"),
+    ("count", "<i8"),
+    ("first_timestamp", "<i8"),
+    ("last_timestamp", "<i8"),
+])
+
+MAGIC = b"QTJ1"
+HEADER_DTYPE = np.dtype([("magic", "S4"), ("record_size", "<u4"), ("_reserved", "V8")])
+HEADER_SIZE = HEADER_DTYPE.itemsize
+SEGMENT_SUFFIX = ".ticks"
+INDEX_SUFFIX = ".idx"
+
+# Segments roll over at IST midnight
+_IST_OFFSET_MS = 330 * 60 * 1000
+_DAY_MS = 24 * 60 * 60 * 1000
+
+def _segment_day(timestamps: np.ndarray) -> np.ndarray:
+    """IST trading day number of epoch-millisecond timestamps"""
+    return (timestamps + _IST_OFFSET_MS) // _DAY_MS
+
+def _segment_name(day: int) -> str:
+    return datetime.fromtimestamp(day * 86400, tz=timezone.utc).strftime("%Y%m%d")
+
+def to_records(ticks: Union[Sequence[Dict], Dict[str, np.ndarray], np.ndarray]) -> np.ndarray:
+    """
+    Convert ticks to TICK_RECORD_DTYPE.
+    Accepts decoded tick dicts, the columnar dict from ws.tick_batch.decode_frames
+    or an already structured array; missing fields are stored as 0.
+    """
+    if isinstance(ticks, np.ndarray) and ticks.dtype == TICK_RECORD_DTYPE:
+        return ticks
+    if isinstance(ticks, dict):
+        n = len(ticks["token"])
+        records = np.zeros(n, dtype=TICK_RECORD_DTYPE)
+        for name in TICK_RECORD_DTYPE.names:
+            if name in ticks:
+                records[name] = ticks[name]
+        return records
+
+    records = np.zeros(len(ticks), dtype=TICK_RECORD_DTYPE)
+    for i, tick in enumerate(ticks):
+        records[i] = (
+            tick.get("exchange_timestamp", 0),
+            int(tick["token"]),
+            tick.get("sequence_number", 0),
+            tick.get("last_traded_price", 0),
+            tick.get("last_traded_quantity", 0),
+            tick.get("volume_trade_for_the_day", tick.get("volume", 0)),
+            tick.get("open_interest", 0),
+            tick.get("total_buy_quantity", 0.0),
+            tick.get("total_sell_quantity", 0.0),
+            tick.get("exchange_type", 0),
+            tick.get("subscription_mode", 0),
+            b"",
+        )
+    return records
+
+class TickJournalWriter:
+    """
+    Append-only recorder of ticks into daily segment files.
+    Ticks are buffered and written in blocks sorted by (token, timestamp); each
+    block gets an entry in the segment's index so readers can jump straight to a
+    token's records. Segments are named by IST trading day: YYYYMMDD.ticks/.idx.
+    Tick dicts are kept as they arrive and converted once per flush; writes run
+    in order on a single writer thread, so consume never sorts or writes on the loop.
+    """
+
+    def __init__(self, root: str, flush_records: int = 65536):
+        """
+        :param root: Directory holding the segment files
+        :param flush_records: Buffered records that trigger a write
+        """
+        self.root = root
+        self.flush_records = flush_records
+        self.records_written = 0
+        self.dropped = 0  # ticks the bus dropped before they reached consume
+        # Record arrays and runs of tick dicts, in arrival order
+        self._buffer: List[Union[List[Dict], np.ndarray]] = []
+        self._buffered = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        os.makedirs(root, exist_ok=True)
+
+    def append(self, tick: Dict):
+        """Buffer one decoded tick"""
+        self._add(tick)
+        if self._buffered >= self.flush_records:
+            self.flush()
+
+    def append_batch(self, ticks: Union[Sequence[Dict], Dict[str, np.ndarray], np.ndarray]):
+        """Buffer a batch of ticks (see to_records for accepted inputs)"""
+        records = to_records(ticks)
+        self._buffer.append(records)
+        self._buffered += records.size
+        if self._buffered >= self.flush_records:
+            self.flush()
+
+    def flush(self):
+        """Write buffered ticks to their day segments and extend the indexes"""
+        if self._buffered:
+            self._pool().submit(self._write, self._take()).result()
+
+    async def flush_async(self):
+        """flush on the writer thread, without blocking the event loop"""
+        if self._buffered:
+            await asyncio.get_running_loop().run_in_executor(self._pool(), self._write, self._take())
+
+    def _add(self, tick: Dict):
+        if not self._buffer or isinstance(self._buffer[-1], np.ndarray):
+            self._buffer.append([])
+        self._buffer[-1].append(tick)
+        self._buffered += 1
+
+    def _take(self) -> List[Union[List[Dict], np.ndarray]]:
+        buffer, self._buffer, self._buffered = self._buffer, [], 0
+        return buffer
+
+    def _pool(self) -> ThreadPoolExecutor:
+        # One worker: writes stay in buffer order and never touch a segment concurrently
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix="tick-journal")
+        return self._executor
+
+    def _write(self, buffer: List[Union[List[Dict], np.ndarray]]):
+        records = np.concatenate([self._records(part) for part in buffer])
+        days = _segment_day(records["exchange_timestamp"])
+        order = np.lexsort((records["exchange_timestamp"], records["token"], days))
+        records, days = records[order], days[order]
+        for day_start, day_end in _runs(days):
+            self._write_segment(_segment_name(int(days[day_start])), records[day_start:day_end])
+        self.records_written += records.size
+
+    @staticmethod
+    def _records(part: Union[List[Dict], np.ndarray]) -> np.ndarray:
+        """to_records, skipping malformed ticks of a dict run instead of failing the flush"""
+        try:
+            return to_records(part)
+        except Exception:
+            valid = []
+            for tick in part:
+                try:
+                    to_records([tick])
+                    valid.append(tick)
+                except Exception as e:
+                    logger.error(f"Error journaling tick {tick!r}: {e}")
+            return to_records(valid)
+
+    def close(self):
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    async def consume(self, subscription, flush_interval: float = 1.0):
+        """
+        Record every tick of a TickBus subscription, flushing when it closes.
+        :param flush_interval: Seconds between writes of whatever is buffered, so a
+            quiet feed or a restart loses at most this much
+        """
+        flusher = asyncio.create_task(self._flush_periodically(subscription, flush_interval))
+        try:
+            async for message in subscription:
+                self._add(message.data)
+                if self._buffered >= self.flush_records:
+                    await self._flush_logged()
+        finally:
+            flusher.cancel()
+            await self._flush_logged()
+
+    async def _flush_periodically(self, subscription, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            await self._flush_logged()
+            if subscription.dropped > self.dropped:
+                logger.warning(f"Tick journal missed {subscription.dropped - self.dropped} ticks "
+                               f"({subscription.dropped} in total); the bus queue overflowed")
+                self.dropped = subscription.dropped
+
+    async def _flush_logged(self):
+        try:
+            await self.flush_async()
+        except Exception as e:
+            logger.error(f"Error flushing tick journal: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        return {"records_written": self.records_written, "buffered": self._buffered, "dropped": self.dropped}
+
+    def _write_segment(self, name: str, records: np.ndarray):
+        path = os.path.join(self.root, name + SEGMENT_SUFFIX)
+        with open(path, "ab") as f:
+            if f.tell() == 0:
+                header = np.zeros(1, dtype=HEADER_DTYPE)
+                header["magic"] = MAGIC
+                header["record_size"] = TICK_RECORD_DTYPE.itemsize
+                f.write(header.tobytes())
+            first_record = (f.tell() - HEADER_SIZE) // TICK_RECORD_DTYPE.itemsize
+            f.write(records.tobytes())
+
+        runs = _runs(records["token"])
+        index = np.empty(len(runs), dtype=INDEX_DTYPE)
+        for i, (start, end) in enumerate(runs):
+            index[i] = (
+                records["token"][start], first_record + start, end - start,
+                records["exchange_timestamp"][start], records["exchange_timestamp"][end - 1]
+            )
+        with open(os.path.join(self.root, name + INDEX_SUFFIX), "ab") as f:
+            f.write(index.tobytes())
+
+class TickSegment:
+    """A memory-mapped day segment; reads return views into the mapping"""
+
+    def __init__(self, path: str):
+        self.path = path
+        header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+        if header.size == 0 or header["magic"][0] != MAGIC:
+            raise ValueError(f"Not a tick journal segment: {path}")
+        if header["record_size"][0] != TICK_RECORD_DTYPE.itemsize:
+            raise ValueError(f"Unsupported record size {header['record_size'][0]} in {path}")
+
+        size = os.path.getsize(path) - HEADER_SIZE
+        count = size // TICK_RECORD_DTYPE.itemsize
+        self.records = (np.memmap(path, dtype=TICK_RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+                        if count else np.empty(0, dtype=TICK_RECORD_DTYPE))
+        index_path = path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX
+        index = np.fromfile(index_path, dtype=INDEX_DTYPE) if os.path.exists(index_path) else np.empty(0, INDEX_DTYPE)
+        # Ignore index entries for records cut off by a partial write
+        self.index = index[index["start"] + index["count"] <= count]
+
+    def __len__(self) -> int:
+        return self.records.size
+
+    def tokens(self) -> np.ndarray:
+        return np.unique(self.index["token"])
+
+    def read(self,
+             tokens: Optional[Iterable[int]] = None,
+             start: Optional[int] = None,
+             end: Optional[int] = None) -> Iterator[np.ndarray]:
+        """
+        Yield zero-copy record views in write order.
+        :param tokens: Only these tokens (all by default)
+        :param start: Inclusive exchange_timestamp lower bound (epoch ms)
+        :param end: Exclusive exchange_timestamp upper bound (epoch ms)
+        """
+        index = self.index
+        if tokens is not None:
+            index = index[np.isin(index["token"], np.fromiter((int(t) for t in tokens), dtype=np.int64))]
+        if start is not None:
+            index = index[index["last_timestamp"] >= start]
+        if end is not None:
+            index = index[index["first_timestamp"] < end]
+
+        for entry in index:
+            block = self.records[entry["start"]:entry["start"] + entry["count"]]
+            # Blocks are sorted by timestamp, so the range is a slice
+            timestamps = block["exchange_timestamp"]
+            lo = 0 if start is None else np.searchsorted(timestamps, start, side="left")
+            hi = block.size if end is None else np.searchsorted(timestamps, end, side="left")
+            if hi > lo:
+                yield block[lo:hi]
+
+class TickJournalReader:
+    """Replay across the day segments of a journal directory"""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def segments(self) -> List[str]:
+        """Segment day names (YYYYMMDD) in chronological order"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(f[:-len(SEGMENT_SUFFIX)] for f in os.listdir(self.root) if f.endswith(SEGMENT_SUFFIX))
+
+    def open(self, day: str) -> TickSegment:
+        return TickSegment(os.path.join(self.root, day + SEGMENT_SUFFIX))
+
+    def replay(self,
+               tokens: Optional[Iterable[int]] = None,
+               start: Optional[int] = None,
+               end: Optional[int] = None) -> Iterator[np.ndarray]:
+        """Yield record views from every segment overlapping [start, end)"""
+        tokens = None if tokens is None else [int(t) for t in tokens]
+        first_day = None if start is None else _segment_name(int(_segment_day(np.int64(start))))
+        last_day = None if end is None else _segment_name(int(_segment_day(np.int64(end))))
+        for day in self.segments():
+            if (first_day and day < first_day) or (last_day and day > last_day):
+                continue
+            yield from self.open(day).read(tokens, start, end)
+
+    def load(self,
+             tokens: Optional[Iterable[int]] = None,
+             start: Optional[int] = None,
+             end: Optional[int] = None) -> np.ndarray:
+        """Concatenate a replay into one array sorted by timestamp (copies)"""
+        blocks = list(self.replay(tokens, start, end))
+        if not blocks:
+            return np.empty(0, dtype=TICK_RECORD_DTYPE)
+        records = np.concatenate(blocks)
+        return records[np.argsort(records["exchange_timestamp"], kind="stable")]
+
+def _runs(values: np.ndarray) -> List[tuple]:
+    """(start, end) pairs of runs of equal consecutive values"""
+    if values.size == 0:
+        return []
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    ends = np.r_[starts[1:], values.size]
+    return list(zip(starts.tolist(), ends.tolist()))
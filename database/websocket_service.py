@@ -1,5 +1,5 @@
 from typing import Dict, List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 import asyncpg
 from core.logger import logger
 
@@ -98,6 +98,21 @@ class WebSocketDBService:
                 metrics['data_coherence'],
                 metrics['latency'])
 
+    async def update_health_metrics_batch(self, connection_id: str,
+                                        metrics: List[Dict[str, float]]) -> None:
+        """Insert several health metric samples in one round trip, keeping each sample's timestamp"""
+        now = datetime.now(timezone.utc)
+        async with self.pool.acquire() as conn:
+            await conn.executemany("""
+                INSERT INTO connection_health_metrics 
+                (connection_id, timestamp, connection_stability, data_coherence, latency, error_count)
+                VALUES ($1, $2, $3, $4, $5, $6)
+            """, [
+                (connection_id, m.get('timestamp') or now, m['connection_stability'],
+                 m['data_coherence'], m['latency'], m.get('error_count', 0))
+                for m in metrics
+            ])
+
     async def get_connection_status(self, connection_id: str) -> Optional[Dict]:
         """Get current connection status and metrics"""
         async with self.pool.acquire() as conn:
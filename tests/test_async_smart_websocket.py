@@ -0,0 +1,77 @@
+import asyncio
+import json
+import pytest
+import websockets
+from ws.async_smart_websocket import AsyncSmartWebSocket, log_task_errors
+from ws.tick_decoder import encode_tick
+
+def _tick(token, seq):
+    return encode_tick({"subscription_mode": 1, "exchange_type": 2, "token": token,
+                        "sequence_number": seq, "last_traded_price": 1950000 + seq})
+
+@pytest.mark.asyncio
+async def test_subscribe_and_receive_ticks():
+    requests = []
+
+    async def handler(ws):
+        requests.append(json.loads(await ws.recv()))
+        for seq in range(3):
+            await ws.send(_tick("43650", seq))
+        await ws.wait_closed()
+
+    async with websockets.serve(handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        client = AsyncSmartWebSocket("jwt", "key", "client", "feed", uri=f"ws://127.0.0.1:{port}")
+        await client.subscribe("abc", client.LTP_MODE, [{"exchangeType": 2, "tokens": ["43650"]}])
+        client.start()
+        ticks = [await asyncio.wait_for(client.get(), 2) for _ in range(3)]
+        await client.close()
+
+    assert requests[0]["params"] == {"mode": 1, "tokenList": [{"exchangeType": 2, "tokens": ["43650"]}]}
+    assert [t["sequence_number"] for t in ticks] == [0, 1, 2]
+    assert ticks[0]["token"] == "43650"
+    assert client.metrics.packets == 3 and client.metrics.receive_to_dispatch.total == 3
+
+@pytest.mark.asyncio
+async def test_reconnect_replays_subscriptions():
+    connections = []
+
+    async def handler(ws):
+        connections.append(json.loads(await ws.recv()))
+        if len(connections) == 1:
+            await ws.close()
+            return
+        await ws.send(_tick("26000", 7))
+        await ws.wait_closed()
+
+    async with websockets.serve(handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        client = AsyncSmartWebSocket("jwt", "key", "client", "feed", uri=f"ws://127.0.0.1:{port}")
+        client.RECONNECT_DELAY = 0.01
+        await client.subscribe("abc", client.QUOTE, [{"exchangeType": 1, "tokens": ["26000"]}])
+        client.start()
+        tick = await asyncio.wait_for(client.get(), 2)
+        await client.close()
+
+    assert len(connections) == 2
+    assert connections[1]["params"]["tokenList"] == [{"exchangeType": 1, "tokens": ["26000"]}]
+    assert tick["sequence_number"] == 7
+    assert client.reconnect_count >= 1
+
+def test_full_queue_drops_oldest():
+    client = AsyncSmartWebSocket("jwt", "key", "client", "feed", queue_size=2)
+    for seq in range(3):
+        client._put({"sequence_number": seq})
+    assert client.dropped_ticks == 1
+    assert client.ticks.get_nowait()[1]["sequence_number"] == 1
+
+@pytest.mark.asyncio
+async def test_background_task_errors_are_logged(caplog):
+    async def fail():
+        raise RuntimeError("socket gone")
+
+    task = log_task_errors(asyncio.create_task(fail()), "Websocket heartbeat")
+    with pytest.raises(RuntimeError):
+        await task
+    await asyncio.sleep(0)
+    assert "Websocket heartbeat task failed: RuntimeError('socket gone')" in caplog.text
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading.market_data.bar_aggregator import BarAggregator
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+def ist_ms(hour, minute, second=0, day=15):
+    return int(datetime(2024, 1, day, hour, minute, second, tzinfo=IST).timestamp() * 1000)
+
+def test_bars_align_to_session_and_match_pandas_resample():
+    rng = np.random.default_rng(5)
+    start = ist_ms(9, 15)
+    offsets = np.sort(rng.integers(0, 3600_000, 2000))
+    prices = 100 + np.cumsum(rng.normal(0, 0.1, offsets.size))
+    aggregator = BarAggregator(timeframes=("1m", "5m"))
+    for offset, price in zip(offsets.tolist(), prices.tolist()):
+        aggregator.add("26000", start + offset, price, quantity=1)
+    aggregator.close_all()
+
+    ticks = pd.Series(prices, index=pd.to_datetime(start + offsets, unit="ms"))
+    for name, rule in (("1m", "1min"), ("5m", "5min")):
+        expected = ticks.resample(rule, origin=pd.Timestamp(start, unit="ms")).ohlc().dropna()
+        bars = aggregator.frame("26000", name)
+        np.testing.assert_allclose(bars[["open", "high", "low", "close"]], expected)
+        assert (bars.index == expected.index).all()
+        assert bars["volume"].sum() == offsets.size
+
+def test_closed_bar_events_are_published():
+    aggregator = BarAggregator(timeframes=("1m",), emit_partial=True)
+    subscription = aggregator.bus.subscribe(topics=[("26000", "1m")])
+    aggregator.add("26000", ist_ms(9, 15, 10), 100.0)
+    aggregator.add("26000", ist_ms(9, 15, 50), 101.0)
+    closed = aggregator.add("26000", ist_ms(9, 16, 5), 99.0)
+    assert len(closed) == 1 and closed[0]["high"] == 101.0 and closed[0]["closed"]
+    events = [subscription.get_nowait().data for _ in range(len(subscription))]
+    assert [event["closed"] for event in events] == [False, False, True, False]
+
+def test_session_boundaries():
+    aggregator = BarAggregator(timeframes=("15m",))
+    aggregator.add("1", ist_ms(9, 14, 59), 100.0)   # pre-open
+    aggregator.add("1", ist_ms(15, 29), 101.0)
+    aggregator.add("1", ist_ms(15, 30), 102.0)      # stamped at the close: last bar
+    aggregator.add("1", ist_ms(15, 31), 103.0)      # after close
+    assert aggregator.out_of_session == 2
+    closed = aggregator.add("1", ist_ms(9, 15, 1, day=16), 104.0)
+    assert closed[0]["start"] == ist_ms(15, 15) and closed[0]["end"] == ist_ms(15, 30)
+    assert closed[0]["close"] == 102.0
+
+def test_volume_from_cumulative_day_volume_resets_each_session():
+    aggregator = BarAggregator(timeframes=("1m",))
+    tick = {"token": "1", "last_traded_price": 10000, "last_traded_quantity": 5}
+    aggregator.update({**tick, "exchange_timestamp": ist_ms(9, 20), "volume_trade_for_the_day": 1000})
+    aggregator.update({**tick, "exchange_timestamp": ist_ms(9, 20, 30), "volume_trade_for_the_day": 1300})
+    aggregator.update({**tick, "exchange_timestamp": ist_ms(9, 15, day=16), "volume_trade_for_the_day": 50})
+    aggregator.update({**tick, "exchange_timestamp": ist_ms(9, 15, 20, day=16), "volume_trade_for_the_day": 80})
+    aggregator.close_all()
+    bars = aggregator.last("1", "1m")
+    np.testing.assert_array_equal(bars["volume"], [305, 35])
+    assert bars["close"][0] == pytest.approx(100.0)
+
+def test_flush_closes_quiet_tokens_and_late_ticks_are_counted():
+    aggregator = BarAggregator(timeframes=("1s",))
+    aggregator.add("1", ist_ms(10, 0, 0), 1.0)
+    assert aggregator.flush(ist_ms(10, 0, 0) + 500) == []
+    assert len(aggregator.flush(ist_ms(10, 0, 1))) == 1
+    aggregator.add("1", ist_ms(10, 0, 5), 1.0)
+    aggregator.add("1", ist_ms(10, 0, 3), 1.0)
+    assert aggregator.late == 1
+
+def test_tick_into_flushed_bar_is_late_not_a_duplicate():
+    aggregator = BarAggregator(timeframes=("1s",))
+    aggregator.add("1", ist_ms(10, 0, 0), 1.0)
+    assert len(aggregator.flush(ist_ms(10, 0, 1))) == 1
+    assert aggregator.add("1", ist_ms(10, 0, 0) + 900, 2.0) == []
+    assert aggregator.late == 1
+    assert "1" not in {token for token, _ in aggregator.partial}
+    aggregator.add("1", ist_ms(10, 0, 1), 3.0)
+    aggregator.close_all()
+    assert aggregator.last("1", "1s")["start"].tolist() == [ist_ms(10, 0, 0), ist_ms(10, 0, 1)]
@@ -0,0 +1,52 @@
+import pytest
+import numpy as np
+import pandas as pd
+from trading.analysis import chain_stats
+from trading.analysis.option_chain import OptionChainAnalyzer
+
+def _brute_force_pain(strikes, call_oi, put_oi):
+    return np.array([
+        (np.maximum(s - strikes, 0) * call_oi).sum() + (np.maximum(strikes - s, 0) * put_oi).sum()
+        for s in strikes
+    ])
+
+def test_pain_curve_matches_brute_force():
+    rng = np.random.default_rng(7)
+    strikes = np.arange(21000, 23000, 50, dtype=float)
+    call_oi = rng.integers(0, 100000, strikes.size).astype(float)
+    put_oi = rng.integers(0, 100000, strikes.size).astype(float)
+
+    shuffled = rng.permutation(strikes.size)
+    sorted_strikes, pain = chain_stats.pain_curve(strikes[shuffled], call_oi[shuffled], put_oi[shuffled])
+    assert np.array_equal(sorted_strikes, strikes)
+    assert np.allclose(pain, _brute_force_pain(strikes, call_oi, put_oi))
+    assert chain_stats.max_pain(strikes, call_oi, put_oi) == strikes[np.argmin(pain)]
+
+def test_chain_statistics_per_expiry():
+    strikes = np.array([100.0, 110.0, 120.0, 130.0])
+    chain = pd.DataFrame({
+        'expiry': ['near'] * 4 + ['far'] * 4,
+        'strike': np.r_[strikes, strikes],
+        'call_oi': [0, 10, 50, 500, 500, 50, 10, 0],
+        'put_oi': [500, 50, 0, 0, 0, 0, 50, 500],
+    })
+    stats = chain_stats.chain_statistics(chain)
+    for expiry, rows in chain.groupby('expiry'):
+        pain = _brute_force_pain(strikes, rows['call_oi'].to_numpy(), rows['put_oi'].to_numpy())
+        assert stats[expiry]['max_pain'] == strikes[np.argmin(pain)]
+    assert stats['near']['resistance_levels'] == [130.0]
+    assert stats['near']['support_levels'] == [100.0]
+    assert stats['far']['pcr'] == pytest.approx(550 / 560)
+
+def test_analyzer_uses_chain_stats():
+    chain = pd.DataFrame({
+        'strike': [21800.0, 21900.0, 22000.0, 22100.0, 22200.0],
+        'call_oi': [100, 200, 900, 1500, 400],
+        'put_oi': [300, 1200, 800, 200, 100],
+        'call_iv': [0.16, 0.15, 0.14, 0.13, 0.13],
+        'put_iv': [0.19, 0.17, 0.15, 0.14, 0.14],
+    })
+    analysis = OptionChainAnalyzer().analyze_chain(chain, 22000.0)
+    assert analysis['max_pain'] == 22000.0
+    assert analysis['support_resistance']['resistance_levels'][0] == 22100.0
+    assert analysis['iv_skew'] > 0
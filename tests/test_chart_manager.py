@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading.chart_manager import ChartManager, lttb
+from trading.market_data.ring_buffer import PriceHistoryStore
+
+def test_lttb_keeps_endpoints_and_extremes():
+    x = np.arange(10_000)
+    y = np.sin(x / 500.0)
+    y[4321] = 5.0  # spike must survive downsampling
+    selected = lttb(x, y, 200)
+    assert len(selected) == 200
+    assert selected[0] == 0 and selected[-1] == len(x) - 1
+    assert np.all(np.diff(selected) > 0)
+    assert 4321 in selected
+
+def test_lttb_returns_everything_below_threshold():
+    np.testing.assert_array_equal(lttb(np.arange(5), np.arange(5), 10), np.arange(5))
+
+def test_series_indicators_are_incremental_and_match_pandas():
+    history = PriceHistoryStore(capacity=1000)
+    chart = ChartManager(history, symbol="NIFTY")
+    prices = 100 + np.cumsum(np.random.default_rng(3).normal(0, 1, 300))
+    for i, price in enumerate(prices[:150]):
+        chart.update_data({"symbol": "NIFTY", "price": price})
+    assert chart.get_series().synced == 150
+    for price in prices[150:]:
+        history.append("NIFTY", price)  # written by another component
+    data = chart.data
+    assert len(data) == 300
+    close = pd.Series(prices)
+    np.testing.assert_allclose(data["MA10"], close.rolling(10).mean(), equal_nan=True)
+    np.testing.assert_allclose(data["EMA10"], close.ewm(span=10, adjust=False).mean())
+
+def test_chart_data_is_downsampled():
+    history = PriceHistoryStore(capacity=50_000)
+    history.ring("NIFTY").extend(np.random.default_rng(0).normal(100, 1, 40_000), np.arange(40_000))
+    chart = ChartManager(history, window=40_000, points=500)
+    data = chart.chart_data()
+    assert {len(values) for values in data.values()} == {500}
+    assert data["timestamp"][0] == 0 and data["timestamp"][-1] == 39_999
+
+@pytest.mark.asyncio
+async def test_create_chart_async_renders_in_worker():
+    pytest.importorskip("matplotlib")
+    history = PriceHistoryStore(capacity=100)
+    history.ring("NIFTY").extend(np.linspace(100, 110, 50), np.arange(50) * 1000)
+    chart = ChartManager(history)
+    try:
+        png = await chart.create_chart_async()
+        assert png.getvalue().startswith(b"\x89PNG")
+    finally:
+        chart.close()
@@ -0,0 +1,100 @@
+import os
+import numpy as np
+import pytest
+
+from ai_strategy.panel_features import compute_panel
+from core.compute_executor import ComputeExecutor
+from trading.analysis.greeks_calculator import GreeksCalculator, chain_greeks, greeks_batch
+
+def make_fields(time: int = 300, symbols: int = 4, seed: int = 5):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, (time, symbols)), axis=0)
+    return {
+        "close": close,
+        "high": close + rng.uniform(0, 1, close.shape),
+        "low": close - rng.uniform(0, 1, close.shape),
+        "volume": rng.integers(1000, 5000, close.shape).astype(float)
+    }
+
+def segments():
+    """Named shared memory segments currently allocated (POSIX)"""
+    if not os.path.isdir("/dev/shm"):
+        return set()
+    return {name for name in os.listdir("/dev/shm") if name.startswith("psm_")}
+
+def failing_task(arrays, message):
+    raise ValueError(message)
+
+@pytest.fixture(scope="module")
+def process_executor():
+    executor = ComputeExecutor("process", max_workers=1)
+    yield executor
+    executor.close()
+
+@pytest.mark.asyncio
+async def test_process_pool_matches_inline_and_frees_segments(process_executor):
+    fields = make_fields()
+    before = segments()
+    result = await process_executor.run(compute_panel, fields, features=["rsi_14", "macd", "atr_14"])
+    assert segments() == before
+    expected = compute_panel(fields, ["rsi_14", "macd", "atr_14"])
+    assert set(result) == set(expected)
+    for name in expected:
+        np.testing.assert_array_equal(result[name], expected[name])
+        assert result[name].flags.writeable
+
+@pytest.mark.asyncio
+async def test_greeks_task_with_scalar_inputs(process_executor):
+    strikes = np.arange(18000, 20000, 50, dtype=float)
+    is_call = np.arange(len(strikes)) % 2 == 0
+    arrays = {"spot_price": 19000.0, "strike_price": strikes, "time_to_expiry": 0.05,
+              "volatility": np.full(len(strikes), 0.18), "risk_free_rate": 0.06, "is_call": is_call}
+    result = await process_executor.run(greeks_batch, arrays, include_price=True)
+    expected = GreeksCalculator().calculate_greeks_batch(19000.0, strikes, 0.05, np.full(len(strikes), 0.18),
+                                                         0.06, is_call, include_price=True)
+    for name in expected:
+        np.testing.assert_allclose(result[name], expected[name])
+
+@pytest.mark.asyncio
+async def test_task_errors_propagate_without_leaking(process_executor):
+    before = segments()
+    with pytest.raises(ValueError, match="bad batch"):
+        await process_executor.run(failing_task, {"x": np.ones(10)}, message="bad batch")
+    assert segments() == before
+    assert process_executor.failed == 1
+    # The pool is still usable
+    result = await process_executor.run(compute_panel, {"close": np.arange(1.0, 40.0)}, features=["sma_10"])
+    assert result["sma_10"][-1] == pytest.approx(34.5)
+
+@pytest.mark.asyncio
+async def test_thread_and_inline_modes():
+    fields = make_fields(time=60, symbols=2)
+    expected = compute_panel(fields, ["ema_10"])["ema_10"]
+    for mode in ("thread", "inline"):
+        executor = ComputeExecutor(mode, max_workers=2)
+        result = await executor.run(compute_panel, fields, features=["ema_10"])
+        executor.close()
+        np.testing.assert_array_equal(result["ema_10"], expected)
+
+@pytest.mark.asyncio
+async def test_object_arrays_are_rejected(process_executor):
+    with pytest.raises(TypeError):
+        await process_executor.run(compute_panel, {"close": np.array(["a", None], dtype=object)})
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        ComputeExecutor("gpu")
+
+@pytest.mark.asyncio
+async def test_chain_greeks_task_solves_iv_then_greeks(process_executor):
+    calculator = GreeksCalculator()
+    strikes = np.arange(21000, 23050, 100.0)
+    is_call = strikes >= 22000
+    prices = calculator.calculate_greeks_batch(22000.0, strikes, 30 / 365, 0.15, 0.05, is_call, include_price=True)["price"]
+    arrays = {"option_price": prices, "spot_price": 22000.0, "strike_price": strikes,
+              "time_to_expiry": 30 / 365, "is_call": is_call}
+    result = await process_executor.run(chain_greeks, arrays, risk_free_rate=0.05)
+    np.testing.assert_allclose(result["iv"], 0.15, atol=1e-4)
+    expected = calculator.calculate_greeks_batch(22000.0, strikes, 30 / 365, result["iv"], 0.05, is_call)
+    for name in expected:
+        np.testing.assert_allclose(result[name], expected[name])
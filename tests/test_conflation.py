@@ -0,0 +1,49 @@
+import asyncio
+import pytest
+from ws.conflation import Conflator
+from ws.tick_bus import TickBus, CONFLATE
+
+def test_field_level_merge_and_snapshot():
+    conflator = Conflator()
+    consumer = conflator.add_consumer("ui", None, hz=4)
+    conflator.update("43650", {"last_traded_price": 100, "volume": 10})
+    for price in range(101, 200):
+        conflator.update("43650", {"last_traded_price": price})
+    conflator.update("26000", {"open_interest": 5})
+
+    snapshot = consumer.snapshot()
+    assert snapshot == {
+        "43650": {"last_traded_price": 199, "volume": 10},
+        "26000": {"open_interest": 5},
+    }
+    assert consumer.snapshot() == {}
+
+def test_field_filter():
+    conflator = Conflator(fields=["last_traded_price"])
+    conflator.update("1", {"last_traded_price": 5, "best_5_buy_data": []})
+    assert conflator.get("1") == {"last_traded_price": 5}
+
+@pytest.mark.asyncio
+async def test_consumers_run_at_their_own_cadence():
+    bus = TickBus()
+    conflator = Conflator()
+    fast, slow = [], []
+
+    async def on_fast(snapshot):
+        fast.append(snapshot)
+
+    async def on_slow(snapshot):
+        slow.append(snapshot)
+
+    conflator.add_consumer("fast", on_fast, hz=100)
+    conflator.add_consumer("slow", on_slow, hz=10)
+    feeder = asyncio.create_task(conflator.consume(bus.subscribe(policy=CONFLATE)))
+    for i in range(12):
+        await bus.publish("NIFTY", {"last_traded_price": i})
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.12)
+    conflator.stop()
+    feeder.cancel()
+
+    assert len(fast) > len(slow) >= 1
+    assert slow[-1]["NIFTY"]["last_traded_price"] == 11
@@ -0,0 +1,162 @@
+import numpy as np
+import pytest
+
+from trading.market_data.data_quality import (
+    CIRCUIT, INVALID, OK, OUT_OF_ORDER, REASONS, SPIKE, STALE,
+    DataQualityFilter, _median_abs_deviation, quality_snapshot, validate_batch
+)
+from trading.market_data.pipeline import MarketDataPipeline
+
+def make_prices(n: int = 400, seed: int = 3):
+    rng = np.random.default_rng(seed)
+    return 20000 + np.cumsum(rng.normal(0, 2, n))
+
+def test_median_abs_deviation_matches_numpy():
+    rng = np.random.default_rng(0)
+    for n in range(1, 40):
+        values = sorted(rng.normal(100, 5, n).round(1))
+        median = float(np.median(values))
+        assert _median_abs_deviation(values, median) == pytest.approx(np.median(np.abs(np.array(values) - median)))
+
+def test_spikes_are_rejected_and_window_unaffected():
+    quality = DataQualityFilter()
+    prices = make_prices()
+    for price in prices[:100]:
+        assert quality.check("NIFTY", price) == OK
+    assert quality.check("NIFTY", prices[99] * 1.05) == SPIKE
+    assert quality.check("NIFTY", prices[99] * 0.95) == SPIKE
+    for price in prices[100:]:
+        assert quality.check("NIFTY", price) == OK
+    assert quality.snapshot()["rejected"]["spike"] == 2
+    assert quality.snapshot()["rejected_by_token"] == {"NIFTY": 2}
+    assert quality.accepted == len(prices)
+
+def test_confirmed_level_shift_is_accepted():
+    quality = DataQualityFilter(confirm=3)
+    for price in make_prices(50):
+        quality.check(1, price)
+    gap = make_prices(50)[-1] * 1.03
+    assert [quality.check(1, gap + i * 0.5) for i in range(4)] == [SPIKE, SPIKE, OK, OK]
+    assert quality.level_shifts == 1
+    # Spike checks stay on at the new level
+    assert quality.check(1, gap * 1.5) == SPIKE
+    assert quality.check(1, gap + 1) == OK
+
+def test_alternating_bad_prints_never_confirm_a_shift():
+    quality = DataQualityFilter(confirm=3)
+    rng = np.random.default_rng(1)
+    prices = 100 + rng.normal(0, 0.05, 50)
+    for price in prices:
+        assert quality.check("X", price) == OK
+    assert [quality.check("X", price) for price in (1000, 5, 999, 3000, 4, 1500)] == [SPIKE] * 6
+    assert quality.level_shifts == 0
+    assert quality.check("X", 100.02) == OK
+    assert quality.check("X", 1000) == SPIKE
+
+def test_isolated_bad_prints_never_confirm_a_shift():
+    quality = DataQualityFilter(confirm=3)
+    rng = np.random.default_rng(2)
+    for _ in range(3):
+        for price in 100 + rng.normal(0, 0.05, 50):
+            assert quality.check("X", price) == OK
+        assert quality.check("X", 200.0) == SPIKE
+    assert quality.level_shifts == 0
+    assert quality.check("X", 100.0) == OK
+    assert quality.check("X", 100.0) == OK
+
+def test_invalid_sequence_and_stale_ticks():
+    quality = DataQualityFilter(max_age_ms=5000)
+    now = 1_700_000_000_000
+    assert quality.check("X", None) == INVALID
+    assert quality.check("X", float("nan")) == INVALID
+    assert quality.check("X", 0.0) == INVALID
+    assert quality.check("X", 100.0, timestamp=now, sequence=10, now=now) == OK
+    assert quality.check("X", 100.1, timestamp=now + 5, sequence=10, now=now) == OUT_OF_ORDER
+    assert quality.check("X", 100.1, timestamp=now - 5, sequence=11, now=now) == OUT_OF_ORDER
+    assert quality.check("X", 100.1, timestamp=now + 10, sequence=11, now=now + 10) == OK
+    assert quality.check("X", 100.2, timestamp=now + 20, sequence=12, now=now + 6000) == STALE
+    # Other tokens keep their own sequence
+    assert quality.check("Y", 50.0, timestamp=now, sequence=1, now=now) == OK
+
+def test_circuit_limits_from_snap_quote_ticks():
+    quality = DataQualityFilter()
+    tick = {"token": "2885", "last_traded_price": 250000, "exchange_timestamp": 1,
+            "sequence_number": 1, "upper_circuit_limit": 275000, "lower_circuit_limit": 225000}
+    assert quality.check_tick(tick) == OK
+    # LTP packets carry no limits; the last known ones apply
+    assert quality.check_tick({"token": "2885", "last_traded_price": 280000, "exchange_timestamp": 2,
+                               "sequence_number": 2}) == CIRCUIT
+    assert quality.check_tick({"token": "2885", "last_traded_price": 260000, "exchange_timestamp": 3,
+                               "sequence_number": 3}) == OK
+    snapshot = quality.snapshot()
+    assert snapshot["rejected"]["circuit"] == 1
+    assert set(snapshot["rejected"]) == set(REASONS[1:])
+
+def test_batch_matches_streaming_on_isolated_bad_ticks():
+    rng = np.random.default_rng(7)
+    n = 600
+    tokens = rng.choice([11, 22, 33], n)
+    price = np.empty(n)
+    for token in (11, 22, 33):
+        rows = tokens == token
+        price[rows] = 1000 * token / 11 + np.cumsum(rng.normal(0, 0.5, rows.sum()))
+    timestamp = np.arange(n, dtype=np.float64) * 100
+    sequence = np.arange(1, n + 1, dtype=np.float64)
+    for row in (100, 250, 400):
+        price[row] *= 1.2
+    price[300] = np.nan
+    sequence[500] = 3
+    upper = np.zeros(n)
+    upper[0:3] = price[0:3] * 1.5
+
+    batch = validate_batch(price, token=tokens, timestamp=timestamp, sequence=sequence, upper=upper)
+    quality = DataQualityFilter()
+    streaming = [quality.check(token, p, int(t), int(s), u) for token, p, t, s, u
+                 in zip(tokens, price, timestamp, sequence, upper)]
+    np.testing.assert_array_equal(batch, streaming)
+    assert set(np.flatnonzero(batch == SPIKE)) == {100, 250, 400}
+    assert batch[300] == INVALID and batch[500] == OUT_OF_ORDER
+
+def test_check_batch_on_decoded_columns():
+    quality = DataQualityFilter(max_age_ms=1000)
+    columns = {
+        "token": np.array([5, 5, 5, 6]),
+        "sequence_number": np.array([1, 2, 3, 1]),
+        "exchange_timestamp": np.array([10_000, 10_500, 11_000, 7_000]),
+        "last_traded_price": np.array([10000, -1, 12000, 500]),
+        "upper_circuit_limit": np.array([11000, -1, -1, -1]),
+        "lower_circuit_limit": np.array([9000, -1, -1, -1]),
+    }
+    codes = quality.check_batch(columns, now=11_000)
+    assert codes.tolist() == [OK, INVALID, CIRCUIT, STALE]
+
+@pytest.mark.asyncio
+async def test_pipeline_keeps_spikes_out_of_indicators():
+    pipeline = MarketDataPipeline()
+    prices = make_prices(60)
+    for price in prices[:40]:
+        result = await pipeline.process_market_data({"symbol": "NIFTY", "close": price, "volume": 1000.0})
+    before = result["MA20"]
+    assert await pipeline.process_market_data({"symbol": "NIFTY", "close": prices[39] * 10, "volume": 1000.0}) is None
+    result = await pipeline.process_market_data({"symbol": "NIFTY", "close": prices[39], "volume": 1000.0})
+    assert result["MA20"] == pytest.approx(before + (prices[39] - prices[20]) / 20)
+
+@pytest.mark.asyncio
+async def test_pipeline_drops_unparseable_ticks():
+    pipeline = MarketDataPipeline()
+    assert await pipeline.process_market_data({"symbol": "X", "close": None}) is None
+    assert await pipeline.process_market_data({"symbol": "X", "close": "n/a", "volume": 1.0}) is None
+    assert pipeline.quality.snapshot()["rejected"]["invalid"] == 2
+
+def test_quality_snapshot_covers_every_filter():
+    feed = DataQualityFilter(name="snapshot-feed")
+    first, second = DataQualityFilter(name="snapshot-pipeline"), DataQualityFilter(name="snapshot-pipeline")
+    feed.check("A", None)
+    first.check("A", 100.0)
+    first.check("A", -1.0)
+    second.check("B", None)
+    stages = quality_snapshot()
+    assert stages["snapshot-feed"]["rejected"]["invalid"] == 1
+    assert stages["snapshot-pipeline"]["accepted"] == 1
+    assert stages["snapshot-pipeline"]["rejected"]["invalid"] == 2
+    assert stages["snapshot-pipeline"]["rejected_by_token"] == {"A": 1, "B": 1}
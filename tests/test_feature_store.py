@@ -0,0 +1,83 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_strategy.feature_store import FeatureSet, FeatureStore
+from ai_strategy.panel_features import compute_panel
+
+def make_bars(n: int = 1500, seed: int = 4) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    index = pd.date_range("2024-01-01 03:45", periods=n, freq="min")  # 09:15 IST onwards
+    return pd.DataFrame({
+        "open": close, "high": close + 1, "low": close - 1, "close": close,
+        "volume": rng.integers(1000, 5000, n).astype(float)
+    }, index=index)
+
+def test_write_read_roundtrip_partitions_by_day(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    bars = make_bars()
+    store.write("NIFTY", "1m", bars)
+    assert store.partitions("NIFTY", "1m") == ["20240101", "20240102"]
+    stored = store.read("NIFTY", "1m")
+    assert stored.index.equals(bars.index)
+    expected = compute_panel({name: bars[name].to_numpy() for name in bars})
+    np.testing.assert_allclose(stored["rsi_14"], expected["rsi_14"], equal_nan=True)
+    np.testing.assert_allclose(stored["close"], bars["close"])
+
+def test_incremental_append_matches_full_write(tmp_path):
+    bars = make_bars()
+    full = FeatureStore(str(tmp_path / "full"))
+    full.write("NIFTY", "1m", bars)
+    incremental = FeatureStore(str(tmp_path / "incremental"))
+    incremental.write("NIFTY", "1m", bars.iloc[:900])
+    for start in range(900, len(bars), 150):
+        incremental.append("NIFTY", "1m", bars.iloc[start:start + 150])
+    assert incremental.rows("NIFTY", "1m") == len(bars)
+    pd.testing.assert_frame_equal(incremental.read("NIFTY", "1m"), full.read("NIFTY", "1m"), rtol=1e-9)
+    with pytest.raises(ValueError):
+        incremental.append("NIFTY", "1m", bars.iloc[-5:])
+
+def test_overlapping_write_rewrites_from_first_new_bar(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    bars = make_bars()
+    store.write("NIFTY", "1m", bars)
+    first_day = os.path.join(store.path("NIFTY", "1m"), "20240101", "close.bin")
+    modified = os.stat(first_day).st_mtime_ns
+    revised = bars.iloc[1200:].copy()
+    revised["close"] += 10
+    assert store.write("NIFTY", "1m", revised) == ["20240102"]
+    assert os.stat(first_day).st_mtime_ns == modified
+    stored = store.read("NIFTY", "1m", ["close"])
+    np.testing.assert_allclose(stored["close"].iloc[1200:], revised["close"])
+    assert len(stored) == len(bars)
+
+def test_changed_definition_rebuilds_only_that_feature(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    store.write("NIFTY", "1m", make_bars())
+
+    def compute(bars):
+        values = compute_panel(bars)
+        values["rsi_14"] = values["rsi_14"] / 100.0  # redefined feature
+        return values
+
+    changed = FeatureStore(str(tmp_path), FeatureSet(compute=compute))
+    assert changed.rebuild("NIFTY", "1m") == ["rsi_14"]
+    assert changed.rebuild("NIFTY", "1m") == []
+    assert changed.read("NIFTY", "1m", ["rsi_14"])["rsi_14"].max() <= 1.0
+    with open(os.path.join(store.path("NIFTY", "1m"), "manifest.json")) as f:
+        assert json.load(f)["features"]["rsi_14"] == changed.feature_set.fingerprints()["rsi_14"]
+
+def test_reads_are_memory_mapped_and_time_windowed(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    bars = make_bars()
+    store.write("NIFTY", "1m", bars)
+    day_two = int(pd.Timestamp("2024-01-01 18:30").value // 1_000_000)  # IST midnight
+    arrays = store.read_arrays("NIFTY", "1m", ["timestamp", "close"], start=day_two)
+    assert isinstance(arrays["close"], np.memmap)
+    assert arrays["timestamp"][0] >= day_two
+    latest = store.latest("NIFTY", "1m", 3, ["close"])
+    np.testing.assert_allclose(latest["close"], bars["close"].iloc[-3:])
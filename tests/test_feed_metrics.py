@@ -0,0 +1,76 @@
+import asyncio
+import numpy as np
+import pytest
+from ws.feed_metrics import FeedMetrics, LatencyHistogram
+
+def test_histogram_percentiles_within_bucket_error():
+    histogram = LatencyHistogram()
+    values = np.random.default_rng(1).integers(0, 2_000_000, 100_000)
+    histogram.record_many(values)
+    for q in (50, 90, 99):
+        exact = np.percentile(values, q)
+        assert abs(histogram.percentile(q) - exact) <= 0.07 * exact
+    assert histogram.total == values.size and histogram.max == values.max()
+    assert histogram.counts.size == LatencyHistogram.BUCKET_COUNT
+
+def test_small_values_are_exact():
+    histogram = LatencyHistogram()
+    histogram.record_many(np.arange(32))
+    assert histogram.percentile(50) == 15
+    assert histogram.percentile(100) == 31
+
+def test_scalar_record_matches_record_many():
+    values = np.r_[np.arange(100), np.random.default_rng(2).integers(0, 1 << 41, 5000), -3]
+    scalar, vector = LatencyHistogram(), LatencyHistogram()
+    for value in values.tolist():
+        scalar.record(value)
+    vector.record_many(values)
+    assert np.array_equal(scalar.counts, vector.counts)
+    assert (scalar.total, scalar.sum, scalar.min, scalar.max) == (vector.total, vector.sum, vector.min, vector.max)
+
+def test_record_tick_matches_record_batch():
+    rng = np.random.default_rng(3)
+    now = 1_700_000_000.0
+    tokens = rng.choice([1, 2, 3], 500)
+    sequences = rng.integers(0, 400, 500)
+    exchange_ms = int(now * 1000) - rng.integers(-5, 2000, 500)
+    per_tick, batched = FeedMetrics(), FeedMetrics()
+    for token, sequence, timestamp in zip(tokens.tolist(), sequences.tolist(), exchange_ms.tolist()):
+        per_tick.record_tick({"token": token, "sequence_number": sequence, "exchange_timestamp": timestamp},
+                             received_at=now)
+    batched.record_batch(tokens, sequences, exchange_ms, received_at=now)
+    for name in ("packets", "gaps", "missing", "duplicates", "out_of_order", "clock_skew", "last_sequence"):
+        assert getattr(per_tick, name) == getattr(batched, name)
+    assert np.array_equal(per_tick.exchange_to_receive.counts, batched.exchange_to_receive.counts)
+
+def test_sequence_gaps_duplicates_and_batches():
+    metrics = FeedMetrics()
+    now = 1_700_000_000.0
+    exchange_ms = np.full(7, int(now * 1000) - 5)
+    metrics.record_batch([1, 2, 1, 1, 2, 1, 2], [10, 50, 11, 14, 50, 13, 51], exchange_ms, received_at=now)
+    metrics.record_tick({"token": "1", "sequence_number": 15, "exchange_timestamp": int(now * 1000)}, received_at=now)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["gaps"] == 1 and snapshot["missing"] == 2
+    assert snapshot["duplicates"] == 1
+    assert snapshot["out_of_order"] == 1
+    assert metrics.last_sequence == {1: 15, 2: 51}
+    assert snapshot["exchange_to_receive_us"]["max"] == 5000
+    assert metrics.health_metrics()["error_count"] == 3
+
+@pytest.mark.asyncio
+async def test_persisted_samples_keep_their_own_timestamps():
+    class Recorder:
+        def __init__(self):
+            self.batches = []
+        async def update_health_metrics_batch(self, connection_id, rows):
+            self.batches.append(rows)
+
+    db = Recorder()
+    task = asyncio.create_task(FeedMetrics().persist(db, "client", sample_interval=0.01, batch_size=3))
+    while not db.batches:
+        await asyncio.sleep(0.01)
+    task.cancel()
+    stamps = [row["timestamp"] for row in db.batches[0]]
+    assert len(stamps) == 3 and stamps == sorted(set(stamps))
+    assert all(stamp.tzinfo is not None for stamp in stamps)
@@ -0,0 +1,57 @@
+import asyncio
+import json
+import numpy as np
+import pytest
+import websockets
+from ws.feed_simulator import FeedSimulator
+from ws.tick_decoder import TickDecoder
+from database.tick_journal import to_records
+
+def _subscribe(mode, tokens):
+    return json.dumps({"action": 1, "params": {"mode": mode, "tokenList": [{"exchangeType": 2, "tokens": tokens}]}})
+
+@pytest.mark.asyncio
+async def test_streams_valid_frames_for_subscribed_tokens():
+    decoder = TickDecoder()
+    async with FeedSimulator(tick_rate=2000) as simulator:
+        async with websockets.connect(simulator.uri) as ws:
+            await ws.send("ping")
+            assert await ws.recv() == "pong"
+            await ws.send(_subscribe(3, ["1", "2"]))
+            ticks = [decoder.decode(await asyncio.wait_for(ws.recv(), 2)) for _ in range(20)]
+
+    assert {t["token"] for t in ticks} == {"1", "2"}
+    assert all(t["subscription_mode"] == 3 and len(t["best_5_buy_data"]) == 5 for t in ticks)
+    ones = [t["sequence_number"] for t in ticks if t["token"] == "1"]
+    assert ones == list(range(1, len(ones) + 1))
+    assert ticks[0]["best_5_buy_data"][0]["price"] < ticks[0]["best_5_sell_data"][0]["price"]
+
+@pytest.mark.asyncio
+async def test_injected_gaps_and_disconnects():
+    simulator = FeedSimulator(gap_probability=1.0, disconnect_every=0.05)
+    frames = [simulator.next_tick("7", 1) for _ in range(3)]
+    sequences = [TickDecoder().decode(f)["sequence_number"] for f in frames]
+    assert all(b - a >= 2 for a, b in zip(sequences, sequences[1:]))
+
+    async with simulator:
+        async with websockets.connect(simulator.uri) as ws:
+            await ws.send(_subscribe(1, ["7"]))
+            with pytest.raises(websockets.ConnectionClosed):
+                while True:
+                    await asyncio.wait_for(ws.recv(), 2)
+    assert len(simulator.disconnect_times) == 1
+
+@pytest.mark.asyncio
+async def test_replays_recorded_ticks_in_order():
+    records = to_records({
+        "token": np.array([5, 6, 5]),
+        "sequence_number": np.array([1, 1, 2]),
+        "exchange_timestamp": np.array([1000, 1001, 1002]),
+        "last_traded_price": np.array([100, 200, 101]),
+        "subscription_mode": np.array([2, 2, 2]),
+    })
+    async with FeedSimulator(replay=records) as simulator:
+        async with websockets.connect(simulator.uri) as ws:
+            await ws.send(_subscribe(2, ["5"]))
+            ticks = [TickDecoder().decode(await asyncio.wait_for(ws.recv(), 2)) for _ in range(2)]
+    assert [(t["token"], t["last_traded_price"]) for t in ticks] == [("5", 100), ("5", 101)]
@@ -0,0 +1,65 @@
+import pytest
+import numpy as np
+from trading.analysis.greeks_cache import GreeksCache
+from trading.analysis.greeks_calculator import GreeksCalculator
+
+def test_scalar_requests_within_bucket_hit_cache():
+    cache = GreeksCache(spot_tick=1.0, vol_step=0.001)
+    first = cache.calculate_greeks(22000.2, 22000, 0.05, 0.1501, 0.065, "call")
+    second = cache.calculate_greeks(22000.4, 22000, 0.05, 0.1502, 0.065, "call")
+    assert first == second
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+def test_batch_requests_share_entries_and_are_read_only():
+    cache = GreeksCache()
+    strikes = np.arange(21000, 23000, 50, dtype=float)
+    is_call = strikes >= 22000
+    first = cache.calculate_greeks_batch(22000.0, strikes, 0.05, 0.15, 0.065, is_call)
+    second = cache.calculate_greeks_batch(22000.01, strikes, 0.05, 0.15, 0.065, is_call)
+    for name in first:
+        np.testing.assert_array_equal(first[name], second[name])
+    assert cache.stats()["hit_rate"] == pytest.approx(0.5)
+    with pytest.raises(ValueError):
+        first["delta"][0] = 0.0
+
+def test_only_changed_strikes_are_repriced():
+    cache = GreeksCache()
+    strikes = np.arange(21000, 23000, 50, dtype=float)
+    is_call = strikes >= 22000
+    vols = np.full(strikes.size, 0.15)
+    cache.calculate_greeks_batch(22000.0, strikes, 0.05, vols, 0.065, is_call)
+    vols[[3, 17]] += 0.01
+    result = cache.calculate_greeks_batch(22000.0, strikes, 0.05, vols, 0.065, is_call)
+    assert cache.stats()["misses"] == strikes.size + 2
+    expected = GreeksCalculator().calculate_greeks_batch(22000.0, strikes, 0.05, vols, 0.065, is_call)
+    for name in expected:
+        np.testing.assert_allclose(result[name], expected[name])
+    prices = cache.calculate_option_price_batch(22000.0, strikes, 0.05, vols, 0.065, is_call)
+    assert prices.shape == strikes.shape
+
+def test_batch_price_is_part_of_the_key():
+    cache = GreeksCache()
+    strikes = np.arange(21000, 23000, 50, dtype=float)
+    is_call = strikes >= 22000
+    greeks = cache.calculate_greeks_batch(22000.0, strikes, 0.05, 0.15, 0.065, is_call)
+    priced = cache.calculate_greeks_batch(22000.0, strikes, 0.05, 0.15, 0.065, is_call, include_price=True)
+    assert "price" not in greeks
+    np.testing.assert_array_equal(priced["price"], cache.calculate_option_price_batch(22000.0, strikes, 0.05, 0.15, 0.065, is_call))
+    assert cache.stats()["misses"] == 3 * strikes.size
+
+def test_implied_volatility_passes_through():
+    cache = GreeksCache()
+    strikes = np.array([21500.0, 22000.0, 22500.0])
+    prices = cache.calculate_option_price_batch(22000.0, strikes, 0.05, 0.15, 0.065, True)
+    iv = cache.calculate_implied_volatility_batch(prices, 22000.0, strikes, 0.05, 0.065, True)["iv"]
+    np.testing.assert_allclose(iv, 0.15, atol=1e-6)
+    assert cache.calculate_implied_volatility(float(prices[1]), 22000.0, 22000.0, 0.05, 0.065) == pytest.approx(0.15, abs=1e-6)
+
+def test_lru_eviction_is_bounded():
+    cache = GreeksCache(maxsize=2)
+    for spot in (100.0, 101.0, 102.0):
+        cache.calculate_option_price(spot, 100.0, 0.1, 0.2, 0.05)
+    assert cache.stats()["size"] == 2
+    cache.calculate_option_price(100.0, 100.0, 0.1, 0.2, 0.05)
+    assert cache.stats()["misses"] == 4
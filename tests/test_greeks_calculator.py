@@ -0,0 +1,61 @@
+import pytest
+import numpy as np
+from trading.analysis.greeks_calculator import GreeksCalculator
+
+def test_batch_greeks_match_scalar():
+    calc = GreeksCalculator()
+    strikes = np.arange(21000, 23000, 250, dtype=float)
+    is_call = np.arange(len(strikes)) % 2 == 0
+    batch = calc.calculate_greeks_batch(22000.0, strikes, 0.05, 0.15, 0.065, is_call)
+
+    for i, strike in enumerate(strikes):
+        scalar = calc.calculate_greeks(22000.0, strike, 0.05, 0.15, 0.065,
+                                       "call" if is_call[i] else "put")
+        for name, value in scalar.items():
+            assert batch[name][i] == pytest.approx(value, abs=1e-4)
+
+def test_batch_prices_satisfy_put_call_parity():
+    calc = GreeksCalculator()
+    strikes = np.linspace(40000, 50000, 41)
+    calls = calc.calculate_option_price_batch(45000.0, strikes, 0.1, 0.18, 0.07, True)
+    puts = calc.calculate_option_price_batch(45000.0, strikes, 0.1, 0.18, 0.07, False)
+    parity = 45000.0 - strikes * np.exp(-0.07 * 0.1)
+    assert np.allclose(calls - puts, parity)
+
+def test_batch_greeks_handle_expired_options():
+    calc = GreeksCalculator()
+    greeks = calc.calculate_greeks_batch(100.0, [90.0, 110.0], 0.0, 0.2, 0.05, [True, False])
+    assert np.all(np.isfinite(greeks["delta"]))
+    assert greeks["delta"] == pytest.approx([1.0, -1.0])
+
+def test_batch_implied_volatility_recovers_input_vol():
+    calc = GreeksCalculator()
+    strikes = np.linspace(20000, 24000, 81)
+    is_call = strikes >= 22000
+    vols = 0.12 + 0.5 * np.log(strikes / 22000) ** 2
+    prices = calc.calculate_option_price_batch(22000.0, strikes, 0.08, vols, 0.065, is_call)
+
+    result = calc.calculate_implied_volatility_batch(prices, 22000.0, strikes, 0.08, 0.065, is_call)
+    assert result["converged"].all()
+    assert np.allclose(result["iv"], vols, atol=1e-4)
+    assert result["iterations"].max() <= 10
+
+def test_batch_implied_volatility_rejects_arbitrage_prices():
+    calc = GreeksCalculator()
+    # Below intrinsic value and above the spot price
+    result = calc.calculate_implied_volatility_batch([5.0, 150.0], 100.0, [90.0, 90.0], 0.5, 0.05, True)
+    assert not result["converged"].any()
+    assert np.isnan(result["iv"]).all()
+
+def test_scalar_implied_volatility_uses_batch_solver():
+    calc = GreeksCalculator()
+    price = calc.calculate_option_price(100.0, 110.0, 0.5, 0.3, 0.05, "put")
+    assert calc.calculate_implied_volatility(price, 100.0, 110.0, 0.5, 0.05, "put") == pytest.approx(0.3, abs=1e-5)
+
+def test_batch_implied_volatility_broadcasts_prices_over_scalar_inputs():
+    calc = GreeksCalculator()
+    vols = np.array([0.15, 0.25, 0.4])
+    prices = [calc.calculate_option_price(100.0, 105.0, 0.25, vol, 0.05, "call") for vol in vols]
+    result = calc.calculate_implied_volatility_batch(prices, 100.0, 105.0, 0.25, 0.05, True)
+    assert result["iv"].shape == (3,)
+    assert np.allclose(result["iv"], vols, atol=1e-4)
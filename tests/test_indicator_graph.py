@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_strategy.data_preprocessing import DataPreprocessor
+from trading.analysis.indicator_graph import IndicatorCache, default_graph, indicator_cache
+from trading.analysis.option_chain import OptionChainAnalyzer
+from trading.chart_manager import ChartManager
+from trading.market_data.pipeline import MarketDataPipeline
+from trading.market_data.ring_buffer import PriceHistoryStore
+
+def make_bars(n: int = 200, seed: int = 11) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame({
+        "close": close,
+        "high": close + rng.uniform(0, 1, n),
+        "low": close - rng.uniform(0, 1, n),
+        "volume": rng.integers(1000, 5000, n).astype(float)
+    })
+
+def test_shared_nodes_are_computed_once():
+    graph = default_graph()
+    memo = {}
+    results = graph.compute(make_bars(), ["macd_lines", "bollinger", "ema_12"], memo)
+    # ema_12, ema_26, macd, macd_signal, macd_hist, sma_20, std_20, bb_upper_20, bb_lower_20
+    assert graph.evaluations == 9
+    graph.compute(make_bars(), ["macd", "sma_20"], memo)
+    assert graph.evaluations == 9
+    np.testing.assert_allclose(results["macd"], results["ema_12"] - memo["ema_26"])
+
+def test_unknown_and_cyclic_nodes_raise():
+    graph = default_graph()
+    with pytest.raises(KeyError):
+        graph.compute(make_bars(), ["nope_3"])
+    graph.add("a", ["b"], lambda b: b).add("b", ["a"], lambda a: a)
+    with pytest.raises(ValueError):
+        graph.compute(make_bars(), ["a"])
+
+def test_cache_memoizes_per_symbol_and_bar():
+    cache = IndicatorCache()
+    bars = make_bars()
+    cache.compute("NIFTY", bars, ["rsi_14"])
+    evaluations = cache.graph.evaluations
+    cache.compute("NIFTY", bars, ["rsi_14"])
+    assert cache.graph.evaluations == evaluations
+    cache.compute("BANKNIFTY", bars, ["rsi_14"])
+    assert cache.graph.evaluations == 2 * evaluations
+    cache.compute("NIFTY", bars.iloc[:-1], ["rsi_14"])  # different bar: recomputed
+    assert cache.graph.evaluations == 3 * evaluations
+
+def test_call_sites_are_numerically_consistent():
+    bars = make_bars()
+    pipeline = MarketDataPipeline().calculate_indicators(bars)
+    preprocessed = DataPreprocessor(bars.copy()).add_rsi()
+    chain = OptionChainAnalyzer().calculate_technical_indicators(bars["close"])
+
+    history = PriceHistoryStore(capacity=1000)
+    history.ring("NIFTY").extend(bars["close"], np.arange(len(bars)))
+    chart = ChartManager(history).data
+
+    assert chain["rsi"] == pytest.approx(pipeline["RSI"].iloc[-1])
+    assert chain["macd"] == pytest.approx(pipeline["MACD"].iloc[-1])
+    np.testing.assert_allclose(preprocessed["RSI"], pipeline["RSI"], equal_nan=True)
+    np.testing.assert_allclose(chart["RSI"], pipeline["RSI"], equal_nan=True)
+    np.testing.assert_allclose(chart["EMA10"], default_graph().compute(bars, ["ema_10"])["ema_10"])
+
+def test_call_sites_share_the_indicator_cache_per_symbol():
+    bars = make_bars()
+    indicator_cache.clear("TEST")
+    pipeline = MarketDataPipeline().calculate_indicators(bars, "TEST")
+    evaluations = indicator_cache.graph.evaluations
+    chain = OptionChainAnalyzer().calculate_technical_indicators(bars["close"], "TEST")
+    assert indicator_cache.graph.evaluations == evaluations + 1  # only macd_hist is new
+    assert chain["rsi"] == pytest.approx(pipeline["RSI"].iloc[-1])
+    assert chain["macd"] == pytest.approx(pipeline["MACD"].iloc[-1])
+    indicator_cache.clear("TEST")
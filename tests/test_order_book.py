@@ -0,0 +1,39 @@
+import math
+from trading.market_data.order_book import OrderBookStore, DepthBook, BID, ASK
+from ws.tick_decoder import encode_tick, TickDecoder
+
+def _levels(flag, prices, quantities):
+    return [{"flag": flag, "quantity": q, "price": p, "no of orders": 1} for p, q in zip(prices, quantities)]
+
+BUY = _levels(0, [10000, 9995, 9990, 9985, 9980], [100, 200, 300, 400, 500])
+SELL = _levels(1, [10005, 10010, 10015, 10020, 10025], [50, 150, 250, 350, 450])
+
+def test_top_of_book_queries():
+    book = DepthBook("43650")
+    book.update_from_dicts(BUY, SELL)
+    assert book.best_bid == 100.0 and book.best_ask == 100.05
+    assert math.isclose(book.spread(), 0.05)
+    assert math.isclose(book.mid(), 100.025)
+    assert math.isclose(book.microprice(), (100.0 * 50 + 100.05 * 100) / 150)
+    assert math.isclose(book.imbalance(), (1500 - 1250) / 2750)
+    assert book.depth_to_price(BID, 99.9) == 600
+    assert book.depth_to_price(ASK, 100.15) == 450
+    assert math.isclose(book.fill_price(ASK, 100), (50 * 100.05 + 50 * 100.10) / 100)
+    assert math.isnan(book.fill_price(ASK, 10_000))
+
+def test_packet_update_matches_dict_update():
+    packet = encode_tick({"subscription_mode": 3, "token": "43650",
+                          "best_5_buy_data": BUY, "best_5_sell_data": SELL})
+    store = OrderBookStore()
+    from_packet = store.update_packet(packet)
+    bids_before = from_packet.bids
+    from_dict = OrderBookStore().update(TickDecoder().decode(packet))
+
+    assert (from_packet.bids == from_dict.bids).all() and (from_packet.asks == from_dict.asks).all()
+    store.update_packet(packet)
+    assert store.get("43650").bids is bids_before and store.get("43650").updates == 2
+
+def test_empty_book_is_invalid():
+    book = DepthBook()
+    assert math.isnan(book.mid()) and book.imbalance() == 0.0
+    assert OrderBookStore().update({"token": "1", "last_traded_price": 5}) is None
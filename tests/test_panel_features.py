@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from ai_strategy.panel_features import PANEL_FEATURES, FeaturePanel, compute_panel
+from trading.analysis.indicator_graph import default_graph
+
+def make_panel(time: int = 250, symbols: int = 6, seed: int = 2):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, (time, symbols)), axis=0)
+    return {
+        "close": close,
+        "high": close + rng.uniform(0, 1, close.shape),
+        "low": close - rng.uniform(0, 1, close.shape),
+        "volume": rng.integers(1000, 5000, close.shape).astype(float)
+    }
+
+def test_panel_matches_per_symbol_indicator_graph():
+    fields = make_panel()
+    panel = compute_panel(fields)
+    graph = default_graph()
+    nodes = [name for name in PANEL_FEATURES if not name.startswith(("high_", "low_"))]
+    for column in range(fields["close"].shape[1]):
+        frame = pd.DataFrame({name: values[:, column] for name, values in fields.items()})
+        expected = graph.compute(frame, nodes)
+        for name in nodes:
+            np.testing.assert_allclose(panel[name][:, column], expected[name], equal_nan=True,
+                                       rtol=1e-9, atol=1e-9, err_msg=name)
+        np.testing.assert_allclose(panel["high_20"][:, column], frame["high"].rolling(20).max(), equal_nan=True)
+
+def test_short_history_and_single_symbol():
+    fields = {"close": np.array([[1.0], [2.0], [3.0]])}
+    panel = compute_panel(fields, ["sma_10", "rsi_14", "ema_10"])
+    assert np.isnan(panel["sma_10"]).all() and np.isnan(panel["rsi_14"]).all()
+    np.testing.assert_allclose(panel["ema_10"][:, 0], pd.Series([1.0, 2.0, 3.0]).ewm(span=10, adjust=False).mean())
+
+def test_feature_panel_from_frames_and_scan():
+    fields = make_panel(time=60, symbols=3)
+    frames = {
+        symbol: pd.DataFrame({name: values[:, i] for name, values in fields.items()},
+                             index=pd.date_range("2024-01-01", periods=60, freq="min"))
+        for i, symbol in enumerate(["NIFTY", "BANKNIFTY", "RELIANCE"])
+    }
+    frames["RELIANCE"] = frames["RELIANCE"].drop(frames["RELIANCE"].index[30])  # gap is forward-filled
+    panel = FeaturePanel.from_frames(frames)
+    panel.compute()
+    latest = panel.latest()
+    assert list(latest.index) == ["NIFTY", "BANKNIFTY", "RELIANCE"]
+    assert set(PANEL_FEATURES) == set(latest.columns)
+    assert panel.feature("rsi_14").shape == (60, 3)
+    oversold = panel.scan(lambda snapshot: snapshot["rsi_14"] < 101)
+    assert oversold == ["NIFTY", "BANKNIFTY", "RELIANCE"]
+
+def test_leading_nan_histories_match_trimmed_computation():
+    fields = make_panel(time=80, symbols=4)
+    fields = {name: values.copy() for name, values in fields.items()}
+    for name in fields:
+        fields[name][:30, 1] = np.nan  # listed later
+        fields[name][:, 3] = np.nan    # no data at all
+    panel = compute_panel(fields)
+    trimmed = compute_panel({name: values[30:, 1:2] for name, values in fields.items()})
+    full = compute_panel({name: values[:, 0:1] for name, values in fields.items()})
+    for name in PANEL_FEATURES:
+        assert np.isnan(panel[name][:30, 1]).all()
+        np.testing.assert_allclose(panel[name][30:, 1], trimmed[name][:, 0], equal_nan=True, err_msg=name)
+        np.testing.assert_allclose(panel[name][:, 0], full[name][:, 0], equal_nan=True, err_msg=name)
+        assert np.isnan(panel[name][:, 3]).all()
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from core.market_analyzer import MarketAnalyzer
+from trading.market_data.ring_buffer import PriceHistoryStore, PriceRing
+
+def test_wraparound_keeps_latest_values_contiguous():
+    ring = PriceRing(capacity=8)
+    for i in range(20):
+        ring.append(float(i), timestamp=1000 + i, volume=i, oi=2 * i)
+    assert len(ring) == 8
+    window = ring.last()
+    np.testing.assert_array_equal(window.price, np.arange(12, 20, dtype=float))
+    np.testing.assert_array_equal(window.oi, 2 * np.arange(12, 20))
+    assert ring.latest_price() == 19.0
+    np.testing.assert_array_equal(ring.last(3).timestamp, [1017, 1018, 1019])
+
+def test_windows_are_read_only_views():
+    ring = PriceRing(capacity=4)
+    ring.extend([1.0, 2.0, 3.0, 4.0, 5.0], [1, 2, 3, 4, 5])
+    window = ring.last(2)
+    assert np.shares_memory(window.price, ring.price)
+    with pytest.raises(ValueError):
+        window.price[0] = 0.0
+    ring.append(6.0, timestamp=6)  # later appends do not disturb the ring
+    np.testing.assert_array_equal(ring.last().price, [3.0, 4.0, 5.0, 6.0])
+
+def test_extend_matches_append():
+    by_append, by_extend = PriceRing(capacity=16), PriceRing(capacity=16)
+    prices = np.random.default_rng(1).normal(100, 1, 50)
+    by_extend.extend(prices[:5], np.arange(5))
+    for i in range(5, 50):
+        by_append.append(prices[i], timestamp=i)
+    by_extend.extend(prices[5:], np.arange(5, 50))
+    np.testing.assert_array_equal(by_extend.last().price, prices[-16:])
+    np.testing.assert_array_equal(by_append.last().timestamp, by_extend.last().timestamp)
+
+def test_time_window_queries():
+    ring = PriceRing(capacity=100)
+    ring.extend(np.arange(10, dtype=float), np.arange(10) * 1000)
+    np.testing.assert_array_equal(ring.since(7000).price, [7.0, 8.0, 9.0])
+    np.testing.assert_array_equal(ring.between(2500, 5000).price, [3.0, 4.0])
+    assert len(ring.since(20000)) == 0
+
+def test_store_is_per_symbol_and_bounded():
+    store = PriceHistoryStore(capacity=32)
+    for i in range(100):
+        store.append("NIFTY", 100.0 + i, timestamp=i)
+        store.append("BANKNIFTY", 200.0 + i, timestamp=i)
+    assert store.symbols() == ["NIFTY", "BANKNIFTY"]
+    assert store.last("NIFTY", 1).price[0] == 199.0
+    assert store.nbytes() == 2 * 2 * 32 * 4 * 8
+
+def test_market_analyzer_vwap():
+    analyzer = MarketAnalyzer(PriceHistoryStore(capacity=8))
+    assert analyzer.calculate_vwap("NIFTY") == 0
+    analyzer.update_price("NIFTY", 100.0, volume=1)
+    analyzer.update_price("NIFTY", 110.0, volume=3)
+    assert analyzer.calculate_vwap("NIFTY") == pytest.approx(107.5)
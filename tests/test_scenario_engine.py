@@ -0,0 +1,77 @@
+import pytest
+import numpy as np
+from types import SimpleNamespace
+from trading.risk_management.scenario_engine import ScenarioEngine, trade_leg
+
+def _book(n=50, seed=3):
+    rng = np.random.default_rng(seed)
+    return dict(
+        spot=22000.0,
+        strike=rng.choice(np.arange(21000, 23000, 50, dtype=float), n),
+        time_to_expiry=rng.choice([7 / 365, 30 / 365], n),
+        volatility=rng.uniform(0.1, 0.25, n),
+        is_call=rng.random(n) < 0.5,
+        quantity=rng.choice([-50.0, 50.0], n),
+    )
+
+def test_unshocked_scenario_has_zero_pnl():
+    engine = ScenarioEngine(spot_shocks=[-0.05, 0.0, 0.05], vol_shocks=[0.0, 0.02])
+    engine.set_positions(**_book())
+    assert engine.cube("pnl").shape == (3, 2, 1)
+    assert engine.cube("pnl")[1, 0, 0] == pytest.approx(0.0, abs=1e-6)
+
+def test_incremental_updates_match_full_revaluation():
+    book = _book()
+    engine = ScenarioEngine(days_forward=(0.0, 1.0))
+    engine.set_positions(**book)
+    engine.update_position(4, quantity=-100.0, volatility=0.3)
+    engine.remove_position(0)
+    index = engine.add_position(spot=22000.0, strike=22000.0, time_to_expiry=0.05,
+                                volatility=0.15, is_call=True, quantity=25.0)
+    assert index == len(book["strike"]) - 1
+
+    full = ScenarioEngine(days_forward=(0.0, 1.0))
+    full.set_positions(**engine.legs)
+    for name in ("pnl", "delta", "gamma", "vega"):
+        assert np.allclose(engine.cube(name), full.cube(name))
+
+def test_what_if_leaves_book_unchanged():
+    engine = ScenarioEngine()
+    engine.set_positions(**_book())
+    before = engine.cube("pnl").copy()
+    short_straddle_leg = dict(spot=22000.0, strike=22000.0, time_to_expiry=0.02,
+                              volatility=0.15, is_call=True, quantity=-500.0)
+    assert engine.worst_loss(engine.what_if(**short_straddle_leg)) > engine.worst_loss()
+    assert np.array_equal(engine.cube("pnl"), before)
+
+def test_hedges_pass_while_book_is_over_limit():
+    engine = ScenarioEngine()
+    engine.set_positions(spot=22000.0, strike=22000.0, time_to_expiry=0.02, volatility=0.15,
+                         is_call=False, quantity=[-500.0])
+    limit = engine.worst_loss() / 2
+    hedge = trade_leg(SimpleNamespace(strike=22000.0, option_type="PE", iv=15.0, time_to_expiry=0.02,
+                                      quantity=200, side="BUY"), spot=22000.0)
+    assert hedge["quantity"] == 200.0 and hedge["volatility"] == pytest.approx(0.15) and not hedge["is_call"]
+    assert engine.allows(hedge, limit)
+    worse = dict(hedge, quantity=-200.0)
+    assert not engine.allows(worse, limit)
+    assert engine.allows(worse, engine.worst_loss(engine.what_if(**worse)))
+    assert trade_leg(SimpleNamespace(symbol="NIFTY", quantity=50, side="BUY", price=19500)) is None
+
+def test_default_vol_grid_includes_unshocked_vol():
+    assert 0.0 in ScenarioEngine().vol_shocks
+
+def test_book_nets_fills_per_contract():
+    engine = ScenarioEngine()
+    leg = dict(spot=22000.0, strike=22000.0, time_to_expiry=0.02, volatility=0.15, is_call=True)
+    other = dict(leg, strike=22500.0, quantity=-50.0)
+    assert engine.book("A", **leg, quantity=-100.0) == 0
+    assert engine.book("B", **other) == 1
+    assert engine.book("A", **leg, quantity=40.0) == 0
+    assert engine.legs["quantity"].tolist() == [-60.0, -50.0]
+    # Closing A shifts B down and leaves exactly B's risk in the book
+    assert engine.book("A", **leg, quantity=60.0) is None
+    assert engine.contracts == {"B": 0}
+    alone = ScenarioEngine()
+    alone.add_position(**other)
+    assert np.allclose(engine.cube("pnl"), alone.cube("pnl"))
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading.market_data.pipeline import MarketDataPipeline
+from trading.market_data.streaming_indicators import (
+    ATR, EMA, MACD, RSI, SMA, Bollinger, IndicatorSet, IndicatorStore, RollingExtreme
+)
+
+def make_bars(n: int = 300, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    high = close + rng.uniform(0, 1, n)
+    low = close - rng.uniform(0, 1, n)
+    volume = rng.integers(1000, 5000, n).astype(float)
+    return pd.DataFrame({"close": close, "high": high, "low": low, "volume": volume})
+
+def stream(indicator, values):
+    return np.array([indicator.update(v) for v in values])
+
+def test_sma_ema_match_pandas():
+    close = make_bars()["close"]
+    np.testing.assert_allclose(stream(SMA(10), close), close.rolling(10).mean(), equal_nan=True)
+    np.testing.assert_allclose(stream(EMA(10), close), close.ewm(span=10, adjust=False).mean())
+
+def test_macd_matches_pandas():
+    close = make_bars()["close"]
+    macd = MACD()
+    lines, signals = [], []
+    for price in close:
+        lines.append(macd.update(price))
+        signals.append(macd.signal)
+    expected = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    np.testing.assert_allclose(lines, expected)
+    np.testing.assert_allclose(signals, expected.ewm(span=9, adjust=False).mean())
+
+def test_bollinger_matches_rolling_std():
+    close = make_bars(2000)["close"] * 1000  # large level stresses the running variance
+    bollinger = Bollinger(20)
+    means, stds = [], []
+    for price in close:
+        means.append(bollinger.update(price))
+        stds.append(bollinger.std)
+    np.testing.assert_allclose(means, close.rolling(20).mean(), equal_nan=True, rtol=1e-9)
+    np.testing.assert_allclose(stds, close.rolling(20).std(), equal_nan=True, rtol=1e-6)
+    assert bollinger.upper - bollinger.lower == pytest.approx(4 * bollinger.std)
+
+def test_rsi_and_atr_match_batch_pipeline():
+    bars = make_bars()
+    expected = MarketDataPipeline().calculate_indicators(bars)
+
+    np.testing.assert_allclose(stream(RSI(14), bars["close"]), expected["RSI"], equal_nan=True)
+    atr = ATR(14)
+    values = [atr.update(h, l, c) for h, l, c in zip(bars["high"], bars["low"], bars["close"])]
+    np.testing.assert_allclose(values, expected["ATR"], equal_nan=True)
+    assert np.isnan(values[12]) and not np.isnan(values[13])
+
+def test_rsi_all_gains_is_100():
+    rsi = RSI(5)
+    rsi.initialize(range(1, 10))
+    assert rsi.value == 100.0
+
+def test_rolling_extremes_match_pandas():
+    close = make_bars()["close"]
+    np.testing.assert_allclose(stream(RollingExtreme(20, "max"), close), close.rolling(20).max(), equal_nan=True)
+    np.testing.assert_allclose(stream(RollingExtreme(20, "min"), close), close.rolling(20).min(), equal_nan=True)
+
+def test_initialize_then_stream_equals_full_stream():
+    bars = make_bars()
+    warm, live = bars.iloc[:200], bars.iloc[200:]
+
+    full = IndicatorSet()
+    full.initialize(bars["close"], bars["high"], bars["low"], bars["volume"])
+
+    resumed = IndicatorSet()
+    resumed.initialize(warm["close"], warm["high"], warm["low"], warm["volume"])
+    for row in live.itertuples():
+        resumed.update(row.close, row.high, row.low, row.volume)
+
+    assert resumed.values == pytest.approx(full.values)
+
+@pytest.mark.asyncio
+async def test_pipeline_keeps_state_per_symbol():
+    bars = make_bars(60)
+    pipeline = MarketDataPipeline()
+    expected = pipeline.calculate_indicators(bars).iloc[-1]
+    for row in bars.itertuples():
+        result = await pipeline.process_market_data(
+            {"symbol": "NIFTY", "close": row.close, "high": row.high, "low": row.low, "volume": row.volume}
+        )
+        await pipeline.process_market_data({"symbol": "BANKNIFTY", "close": 1.0, "high": 1.0, "low": 1.0, "volume": 1.0})
+
+    for column in ("RSI", "MACD", "Signal_Line", "MA20", "Upper_Band", "ATR", "Price_Momentum", "Volume_Momentum"):
+        assert result[column] == pytest.approx(expected[column])
+    assert isinstance(pipeline.indicators, IndicatorStore)
+    assert set(pipeline.indicators.sets) == {"NIFTY", "BANKNIFTY"}
@@ -0,0 +1,30 @@
+from ws.subscription_manager import SubscriptionRegistry
+
+def test_add_and_remove_return_only_changes():
+    registry = SubscriptionRegistry()
+    assert registry.add(1, [{"exchangeType": 2, "tokens": ["1", "2"]}]) == [{"exchangeType": 2, "tokens": ["1", "2"]}]
+    assert registry.add(1, [{"exchangeType": 2, "tokens": ["2", "3", "3"]}]) == [{"exchangeType": 2, "tokens": ["3"]}]
+    assert registry.remove(1, [{"exchangeType": 2, "tokens": ["3", "9"]}]) == [{"exchangeType": 2, "tokens": ["3"]}]
+    assert registry.tokens(1, 2) == ["1", "2"]
+    assert (1, 2, "1") in registry and len(registry) == 2
+
+def test_update_diffs_against_current_set():
+    registry = SubscriptionRegistry()
+    registry.update(3, 2, ["a", "b", "c"])
+    added, removed = registry.update(3, 2, ["b", "c", "d"])
+    assert added == [{"exchangeType": 2, "tokens": ["d"]}]
+    assert removed == [{"exchangeType": 2, "tokens": ["a"]}]
+    assert registry.update(3, 2, ["b", "c", "d"]) == ([], [])
+
+def test_snapshot_uses_minimum_frames():
+    registry = SubscriptionRegistry(max_tokens_per_request=100)
+    registry.add(1, [{"exchangeType": 1, "tokens": [str(i) for i in range(150)]},
+                     {"exchangeType": 2, "tokens": [str(i) for i in range(120)]}])
+    registry.add(3, [{"exchangeType": 2, "tokens": ["x"]}])
+
+    frames = registry.snapshot()
+    assert [mode for mode, _ in frames] == [1, 1, 1, 3]
+    ltp_tokens = [sum(len(e["tokens"]) for e in token_list) for mode, token_list in frames if mode == 1]
+    assert ltp_tokens == [100, 100, 70]
+    assert frames[1][1] == [{"exchangeType": 1, "tokens": [str(i) for i in range(100, 150)]},
+                            {"exchangeType": 2, "tokens": [str(i) for i in range(50)]}]
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import numpy as np
+import pytest
+from ws.tick_decoder import TickDecoder, encode_tick, LTP_STRUCT, QUOTE_STRUCT, SNAP_QUOTE_STRUCT
+from ws.tick_batch import TickBatcher, decode_frames, decode_records, LTP_DTYPE, QUOTE_DTYPE, SNAP_QUOTE_DTYPE
+
+def _frame(mode, token, seq):
+    return encode_tick({
+        "subscription_mode": mode, "exchange_type": 2, "token": str(token),
+        "sequence_number": seq, "exchange_timestamp": 1708400000000 + seq,
+        "last_traded_price": 1950000 + seq, "volume_trade_for_the_day": 1000 * seq,
+        "open_interest": 500 * seq,
+    })
+
+def test_dtypes_match_struct_layouts():
+    assert LTP_DTYPE.itemsize == LTP_STRUCT.size
+    assert QUOTE_DTYPE.itemsize == QUOTE_STRUCT.size
+    assert SNAP_QUOTE_DTYPE.itemsize == SNAP_QUOTE_STRUCT.size
+
+def test_mixed_modes_decode_in_arrival_order():
+    frames = [_frame(mode, 40000 + i, i) for i, mode in enumerate([1, 3, 2, 3, 1])]
+    columns = decode_frames(frames)
+    assert columns["token"].tolist() == [40000, 40001, 40002, 40003, 40004]
+    assert columns["sequence_number"].tolist() == [0, 1, 2, 3, 4]
+    assert columns["volume"].tolist() == [-1, 1000, 2000, 3000, -1]
+    assert columns["open_interest"].tolist() == [-1, 500, -1, 1500, -1]
+
+def test_bulk_records_match_per_packet_decoder():
+    frames = [_frame(3, 43650, i) for i in range(20)]
+    records = decode_records(frames)[3]
+    decoder = TickDecoder()
+    for record, frame in zip(records, frames):
+        tick = decoder.decode(frame)
+        assert record["last_traded_price"] == tick["last_traded_price"]
+        assert record["best_5"]["price"].tolist() == [0] * 10
+
+def test_batcher_flushes_on_size():
+    batches = []
+    batcher = TickBatcher(batches.append, window_ms=1000, max_frames=4)
+    for i in range(10):
+        batcher.add(_frame(1, 26000, i))
+    assert [len(b["token"]) for b in batches] == [4, 4]
+    batcher.flush()
+    assert np.array_equal(batches[-1]["sequence_number"], [8, 9])
+
+@pytest.mark.asyncio
+async def test_batcher_flushes_quiet_feed_on_timer():
+    batches = []
+    batcher = TickBatcher(batches.append, window_ms=20, max_frames=100)
+    batcher.add(_frame(1, 26000, 0))
+    batcher.add(_frame(1, 26000, 1))
+    assert batches == []
+    await asyncio.sleep(0.1)
+    assert [len(b["token"]) for b in batches] == [2]
+    # A batch flushed on size cancels its timer
+    batcher = TickBatcher(batches.append, window_ms=20, max_frames=1)
+    batcher.add(_frame(1, 26000, 2))
+    await asyncio.sleep(0.1)
+    assert len(batches) == 2
+
+def test_batcher_flushes_on_timer_without_a_loop():
+    batches = []
+    flushed = threading.Event()
+    batcher = TickBatcher(lambda batch: (batches.append(batch), flushed.set()), window_ms=10)
+    threads = threading.active_count()
+    for i in range(5):
+        flushed.clear()
+        batcher.add(_frame(1, 26000, i))
+        assert flushed.wait(1.0)
+    assert len(batcher) == 0 and len(batches) == 5
+    # One flusher thread serves every window
+    assert threading.active_count() == threads + 1
+    batcher.close()
+
+@pytest.mark.asyncio
+async def test_feed_thread_batches_are_delivered_on_the_loop():
+    loop = asyncio.get_running_loop()
+    delivered = asyncio.Event()
+    threads = []
+    batcher = TickBatcher(lambda batch: (threads.append(threading.current_thread()), delivered.set()),
+                          window_ms=10, loop=loop)
+    feed = threading.Thread(target=batcher.add, args=(_frame(1, 26000, 0),))
+    feed.start()
+    feed.join()
+    await asyncio.wait_for(delivered.wait(), 1.0)
+    assert threads == [threading.main_thread()]
+    batcher.close()
+
+def test_malformed_frames_are_dropped_not_misaligned():
+    good = [_frame(2, 40000 + i, i) for i in range(4)]
+    frames = [good[0], good[1][:-3], good[2], good[3] + b"xx", b"", bytes([9]) + good[0][1:]]
+    with pytest.raises(ValueError):
+        decode_records(frames[:2])
+    columns = decode_frames(frames)
+    assert columns["token"].tolist() == [40000, 40002]
+    assert columns["sequence_number"].tolist() == [0, 2]
+
+    batches = []
+    batcher = TickBatcher(batches.append, window_ms=1000, max_frames=len(frames))
+    for frame in frames:
+        batcher.add(frame)
+    assert batcher.dropped == 4
+    assert batches[0]["token"].tolist() == [40000, 40002]
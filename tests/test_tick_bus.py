@@ -0,0 +1,43 @@
+import asyncio
+import pytest
+from ws.tick_bus import TickBus, DROP_OLDEST, CONFLATE, BLOCK
+
+@pytest.mark.asyncio
+async def test_topic_routing_and_shared_payload():
+    bus = TickBus()
+    nifty = bus.subscribe(["NIFTY"])
+    everything = bus.subscribe()
+    bus.publish_nowait("NIFTY", {"ltp": 1})
+    bus.publish_nowait("BANKNIFTY", {"ltp": 2})
+
+    assert len(nifty) == 1 and len(everything) == 2
+    first = await nifty.get()
+    assert first is await everything.get()
+    assert first.payload == '{"ltp": 1}'
+
+def test_drop_oldest_and_conflate_policies():
+    bus = TickBus()
+    oldest = bus.subscribe(["A", "B"], maxsize=2, policy=DROP_OLDEST)
+    latest = bus.subscribe(["A", "B"], maxsize=2, policy=CONFLATE)
+    for topic, value in [("A", 1), ("B", 1), ("A", 2), ("A", 3)]:
+        bus.publish_nowait(topic, value)
+
+    assert [oldest.get_nowait().data for _ in range(2)] == [2, 3]
+    assert oldest.dropped == 2
+    assert [(m.topic, m.data) for m in (latest.get_nowait(), latest.get_nowait())] == [("A", 3), ("B", 1)]
+
+@pytest.mark.asyncio
+async def test_block_policy_waits_for_consumer():
+    bus = TickBus()
+    slow = bus.subscribe(["A"], maxsize=1, policy=BLOCK)
+    await bus.publish("A", 1)
+    publisher = asyncio.create_task(bus.publish("A", 2))
+    await asyncio.sleep(0)
+    assert not publisher.done()
+    assert (await slow.get()).data == 1
+    await asyncio.wait_for(publisher, 1)
+    assert (await slow.get()).data == 2
+
+    bus.unsubscribe(slow)
+    received = [m async for m in slow]
+    assert received == [] and bus.stats()["subscribers"] == 0
@@ -0,0 +1,49 @@
+import struct
+import pytest
+from ws.tick_decoder import TickDecoder, Tick, encode_tick, LTP_MODE, QUOTE, SNAP_QUOTE
+
+def _snap_quote():
+    return {
+        "subscription_mode": SNAP_QUOTE, "exchange_type": 2, "token": "43650",
+        "sequence_number": 991, "exchange_timestamp": 1708400000000, "last_traded_price": 1950025,
+        "last_traded_quantity": 50, "average_traded_price": 1949800, "volume_trade_for_the_day": 123450,
+        "total_buy_quantity": 1500.0, "total_sell_quantity": 1750.0, "open_price_of_the_day": 1940000,
+        "high_price_of_the_day": 1960000, "low_price_of_the_day": 1935000, "closed_price": 1938000,
+        "last_traded_timestamp": 1708399999, "open_interest": 880000, "open_interest_change_percentage": 3,
+        "upper_circuit_limit": 2100000, "lower_circuit_limit": 1800000,
+        "52_week_high_price": 2200000, "52_week_low_price": 1600000,
+        "best_5_buy_data": [
+            {"flag": 0, "quantity": 100 * i, "price": 1950000 - i * 5, "no of orders": i} for i in range(1, 6)
+        ],
+        "best_5_sell_data": [
+            {"flag": 1, "quantity": 90 * i, "price": 1950050 + i * 5, "no of orders": i} for i in range(1, 6)
+        ],
+    }
+
+def test_ltp_packet_matches_legacy_layout():
+    packet = struct.pack("<BB", LTP_MODE, 1) + b"26000".ljust(25, b"\x00") + struct.pack("<qqq", 7, 1708400000000, 2198050)
+    tick = TickDecoder().decode(packet)
+    assert tick == {
+        "subscription_mode": 1, "exchange_type": 1, "token": "26000", "sequence_number": 7,
+        "exchange_timestamp": 1708400000000, "last_traded_price": 2198050, "subscription_mode_val": "LTP",
+    }
+
+def test_snap_quote_round_trip():
+    data = _snap_quote()
+    packet = encode_tick(data)
+    assert len(packet) == 379
+    decoded = TickDecoder().decode(memoryview(packet))
+    assert decoded == dict(data, subscription_mode_val="SNAP_QUOTE")
+
+def test_tick_object_mode():
+    data = dict(_snap_quote(), subscription_mode=QUOTE)
+    tick = TickDecoder(as_object=True).decode(encode_tick(data))
+    assert isinstance(tick, Tick)
+    assert tick.token == "43650"
+    assert tick.volume_trade_for_the_day == 123450
+    assert tick.open_interest is None
+    assert tick.to_dict()["subscription_mode_val"] == "QUOTE"
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        TickDecoder().decode(b"\x09" + bytes(60))
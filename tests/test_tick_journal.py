@@ -0,0 +1,87 @@
+import asyncio
+import numpy as np
+import pytest
+from database.tick_journal import TickJournalWriter, TickJournalReader, TICK_RECORD_DTYPE, to_records
+from ws.tick_bus import TickBus
+
+DAY_MS = 24 * 60 * 60 * 1000
+# 2024-02-20 09:15 IST
+OPEN_MS = 1708400700000
+
+def _columns(n, tokens, start_ms=OPEN_MS, step_ms=10):
+    rng = np.random.default_rng(0)
+    return {
+        "token": rng.choice(tokens, n),
+        "exchange_timestamp": start_ms + np.arange(n) * step_ms,
+        "sequence_number": np.arange(n),
+        "last_traded_price": rng.integers(1_900_000, 2_000_000, n),
+    }
+
+def test_record_layout_is_fixed_width():
+    assert TICK_RECORD_DTYPE.itemsize == 80
+    records = to_records([{"token": "43650", "exchange_timestamp": 5, "volume_trade_for_the_day": 7}])
+    assert records["token"][0] == 43650 and records["volume"][0] == 7
+
+def test_replay_filters_by_token_and_time(tmp_path):
+    columns = _columns(10000, [26000, 43650, 99926])
+    with TickJournalWriter(str(tmp_path), flush_records=3000) as writer:
+        writer.append_batch(columns)
+
+    reader = TickJournalReader(str(tmp_path))
+    assert reader.segments() == ["20240220"]
+    start, end = OPEN_MS + 20000, OPEN_MS + 60000
+    blocks = list(reader.replay(tokens=[43650], start=start, end=end))
+    assert all(isinstance(b, np.memmap) for b in blocks)
+
+    got = np.sort(np.concatenate(blocks)["sequence_number"])
+    ts = columns["exchange_timestamp"]
+    expected = np.flatnonzero((columns["token"] == 43650) & (ts >= start) & (ts < end))
+    assert np.array_equal(got, expected)
+
+def test_segments_split_by_day_and_append(tmp_path):
+    writer = TickJournalWriter(str(tmp_path))
+    writer.append_batch(_columns(100, [1]))
+    writer.append_batch(_columns(100, [1], start_ms=OPEN_MS + DAY_MS))
+    writer.flush()
+    writer.append({"token": 1, "exchange_timestamp": OPEN_MS + 5, "sequence_number": 999})
+    writer.close()
+
+    reader = TickJournalReader(str(tmp_path))
+    assert reader.segments() == ["20240220", "20240221"]
+    first_day = reader.load()
+    assert first_day.size == 201
+    assert np.all(np.diff(first_day["exchange_timestamp"]) >= 0)
+    assert len(reader.open("20240221")) == 100
+
+@pytest.mark.asyncio
+async def test_consume_flushes_on_a_timer_and_counts_drops(tmp_path):
+    bus = TickBus()
+    subscription = bus.subscribe(maxsize=2)
+    writer = TickJournalWriter(str(tmp_path))
+    task = asyncio.create_task(writer.consume(subscription, flush_interval=0.05))
+    for i in range(5):
+        bus.publish_nowait(1, {"token": 1, "exchange_timestamp": OPEN_MS + i, "sequence_number": i})
+    await asyncio.sleep(0.2)
+    # Still subscribed, yet the buffered ticks are on disk
+    assert TickJournalReader(str(tmp_path)).load().size == 2
+    assert writer.stats() == {"records_written": 2, "buffered": 0, "dropped": 3}
+    subscription.close()
+    await task
+
+@pytest.mark.asyncio
+async def test_consume_converts_on_flush_and_skips_malformed_ticks(tmp_path):
+    bus = TickBus()
+    subscription = bus.subscribe(maxsize=100)
+    writer = TickJournalWriter(str(tmp_path), flush_records=3)
+    task = asyncio.create_task(writer.consume(subscription, flush_interval=10))
+    for i in (2, 1, 0):
+        bus.publish_nowait(1, {"token": 1, "exchange_timestamp": OPEN_MS + i})
+    bus.publish_nowait(1, {"exchange_timestamp": OPEN_MS})  # no token
+    bus.publish_nowait(1, {"token": 2, "exchange_timestamp": OPEN_MS})
+    await asyncio.sleep(0.05)
+    assert writer.stats()["buffered"] == 2
+    subscription.close()
+    await task
+    records = TickJournalReader(str(tmp_path)).load()
+    assert records["token"].tolist() == [1, 2, 1, 1]
+    assert writer.stats() == {"records_written": 4, "buffered": 0, "dropped": 0}
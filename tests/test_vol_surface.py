@@ -0,0 +1,54 @@
+import pytest
+import numpy as np
+from trading.analysis.vol_surface import VolSurface
+
+def _smile(strikes, forward, t):
+    params = np.array([0.002, 0.05, -0.4, 0.0, 0.1])
+    w = VolSurface.svi_total_variance(params, np.log(strikes / forward))
+    return np.sqrt(w / t)
+
+def test_svi_fit_recovers_smile():
+    surface = VolSurface("NIFTY")
+    strikes = np.linspace(20000, 24000, 33)
+    ivs = _smile(strikes, 22100.0, 0.1)
+    assert surface.update_quotes("2024-02-29", strikes, ivs, 22100.0, 0.1)
+
+    query = np.array([20500.0, 22100.0, 23500.0])
+    assert np.allclose(surface.get_vol(query, "2024-02-29"), _smile(query, 22100.0, 0.1), atol=1e-4)
+    assert surface.skew() > 0
+
+def test_unchanged_quotes_skip_refit():
+    surface = VolSurface("NIFTY")
+    strikes = np.linspace(20000, 24000, 33)
+    ivs = _smile(strikes, 22100.0, 0.1)
+    surface.update_quotes("near", strikes, ivs, 22100.0, 0.1)
+    surface.update_quotes("far", strikes, ivs, 22100.0, 0.2)
+
+    assert not surface.update_quotes("near", strikes, ivs + 1e-6, 22100.0, 0.1)
+    assert surface.update_quotes("far", strikes, ivs + 0.01, 22100.0, 0.2)
+    assert surface.fit_count == 3
+    assert surface.expiries == ["near", "far"]
+
+def test_time_decay_without_quote_changes_keeps_vols():
+    surface = VolSurface("NIFTY")
+    strikes = np.linspace(20000, 24000, 33)
+    ivs = _smile(strikes, 22100.0, 0.1)
+    surface.update_quotes("near", strikes, ivs, 22100.0, 0.1)
+    surface.update_quotes("far", strikes, ivs, 22100.0, 0.2)
+    before = surface.get_vol(strikes, "near")
+
+    # A day passes with the same quotes: no refit, but T follows and vols hold
+    assert not surface.update_quotes("near", strikes, ivs, 22100.0, 0.1 - 1 / 365)
+    assert surface.time_to_expiry("near") == pytest.approx(0.1 - 1 / 365)
+    assert np.allclose(surface.get_vol(strikes, "near"), before)
+    assert surface.fit_count == 2
+    # Expiry ordering follows the rolled T
+    surface.update_quotes("far", strikes, ivs, 22100.0, 0.05)
+    assert surface.expiries == ["far", "near"]
+
+def test_vectorized_lookup_across_expiries():
+    surface = VolSurface("BANKNIFTY")
+    surface.update_quotes("near", [45000.0, 46000.0], [0.2, 0.18], 45500.0, 0.05)
+    vols = surface.get_vol([45000.0, 46000.0, 45000.0], ["near", "near", "missing"])
+    assert vols[:2] == pytest.approx([0.2, 0.18])
+    assert np.isnan(vols[2])
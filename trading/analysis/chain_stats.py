@@ -0,0 +1,176 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Hashable, List, Optional
+
+def max_pain(strikes, call_oi, put_oi) -> float:
+    """Strike at which total option holder payout is minimal"""
+    result = max_pain_by_expiry(np.zeros(np.shape(strikes), dtype=np.int64), strikes, call_oi, put_oi)
+    return result.get(0, np.nan)
+
+def pain_curve(strikes, call_oi, put_oi):
+    """
+    Total payout to option holders if the underlying settles at each strike.
+    :return: (sorted strikes, pain at each strike)
+    """
+    strikes = np.asarray(strikes, dtype=np.float64)
+    order = np.argsort(strikes, kind='stable')
+    pain = _segmented_pain(
+        np.zeros(strikes.size, dtype=np.int64), strikes[order],
+        np.asarray(call_oi, dtype=np.float64)[order],
+        np.asarray(put_oi, dtype=np.float64)[order]
+    )
+    return strikes[order], pain
+
+def max_pain_by_expiry(expiries, strikes, call_oi, put_oi) -> Dict[Hashable, float]:
+    """
+    Max pain for several expiries in one pass.
+    :param expiries: Expiry label per row
+    :return: Dict of expiry -> max pain strike
+    """
+    strikes = np.asarray(strikes, dtype=np.float64)
+    if strikes.size == 0:
+        return {}
+    labels, codes = np.unique(np.asarray(expiries), return_inverse=True)
+    order = np.lexsort((strikes, codes))
+    codes = codes[order]
+    sorted_strikes = strikes[order]
+    pain = _segmented_pain(
+        codes, sorted_strikes,
+        np.asarray(call_oi, dtype=np.float64)[order],
+        np.asarray(put_oi, dtype=np.float64)[order]
+    )
+
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], codes.size]
+    result = {}
+    for label, start, end in zip(labels[codes[starts]], starts, ends):
+        result[label] = float(sorted_strikes[start + np.argmin(pain[start:end])])
+    return result
+
+def _segmented_pain(codes: np.ndarray, strikes: np.ndarray,
+                    call_oi: np.ndarray, put_oi: np.ndarray) -> np.ndarray:
+    """
+    Pain at each row for rows sorted by (expiry code, strike).
+    Calls below the settlement strike pay K_j - K_i, puts above pay K_i - K_j;
+    both sums come from prefix sums restarted at every expiry boundary.
+    """
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    group_start = np.repeat(starts, np.diff(np.r_[starts, codes.size]))
+
+    def group_cumsum(values):
+        cumulative = np.cumsum(values)
+        offset = np.r_[0.0, cumulative][group_start]
+        return cumulative - offset
+
+    def group_total(values):
+        totals = np.add.reduceat(values, starts)
+        return np.repeat(totals, np.diff(np.r_[starts, codes.size]))
+
+    call_qty = group_cumsum(call_oi)
+    call_value = group_cumsum(call_oi * strikes)
+    call_pain = strikes * call_qty - call_value
+
+    put_weighted = put_oi * strikes
+    # Inclusive suffix sums: the row itself contributes K_j - K_j = 0
+    put_qty = group_total(put_oi) - group_cumsum(put_oi) + put_oi
+    put_value = group_total(put_weighted) - group_cumsum(put_weighted) + put_weighted
+    put_pain = put_value - strikes * put_qty
+
+    return call_pain + put_pain
+
+def put_call_ratio(call_oi, put_oi, default: float = 1.0) -> float:
+    """Put-Call Ratio of open interest"""
+    total_call = float(np.nansum(call_oi))
+    return float(np.nansum(put_oi)) / total_call if total_call > 0 else default
+
+def oi_weighted_skew(strikes, call_iv, put_iv, call_oi, put_oi, spot_price: float) -> float:
+    """
+    OI-weighted OTM put IV minus OI-weighted OTM call IV.
+    Positive values mean downside protection is priced richer.
+    """
+    strikes = np.asarray(strikes, dtype=np.float64)
+    otm_put = strikes < spot_price
+    otm_call = strikes > spot_price
+    put_vol = _weighted_mean(np.asarray(put_iv, dtype=np.float64)[otm_put],
+                             np.asarray(put_oi, dtype=np.float64)[otm_put])
+    call_vol = _weighted_mean(np.asarray(call_iv, dtype=np.float64)[otm_call],
+                              np.asarray(call_oi, dtype=np.float64)[otm_call])
+    if np.isnan(put_vol) or np.isnan(call_vol):
+        return 0.0
+    return float(put_vol - call_vol)
+
+def _weighted_mean(values: np.ndarray, weights: np.ndarray) -> float:
+    valid = np.isfinite(values) & np.isfinite(weights) & (weights > 0)
+    if not valid.any():
+        return np.nan
+    return float(np.average(values[valid], weights=weights[valid]))
+
+def oi_peaks(strikes, open_interest, top_n: int = 3) -> List[float]:
+    """Strikes of the largest local open interest maxima, biggest first"""
+    strikes = np.asarray(strikes, dtype=np.float64)
+    order = np.argsort(strikes, kind='stable')
+    strikes = strikes[order]
+    oi = np.nan_to_num(np.asarray(open_interest, dtype=np.float64)[order])
+    if oi.size == 0:
+        return []
+
+    padded = np.r_[-np.inf, oi, -np.inf]
+    is_peak = (oi >= padded[:-2]) & (oi > padded[2:]) & (oi > 0)
+    peak_idx = np.flatnonzero(is_peak)
+    if peak_idx.size > top_n:
+        top = np.argpartition(-oi[peak_idx], top_n - 1)[:top_n]
+        peak_idx = peak_idx[top]
+    peak_idx = peak_idx[np.argsort(-oi[peak_idx], kind='stable')]
+    return strikes[peak_idx].tolist()
+
+def support_resistance(strikes, call_oi, put_oi, top_n: int = 3) -> Dict[str, List[float]]:
+    """Support from put OI peaks and resistance from call OI peaks"""
+    return {
+        'support_levels': oi_peaks(strikes, put_oi, top_n),
+        'resistance_levels': oi_peaks(strikes, call_oi, top_n)
+    }
+
+def chain_statistics(chain: pd.DataFrame,
+                     spot_price: Optional[float] = None,
+                     expiry_col: str = 'expiry',
+                     strike_col: str = 'strike',
+                     call_oi_col: str = 'call_oi',
+                     put_oi_col: str = 'put_oi',
+                     call_iv_col: str = 'call_iv',
+                     put_iv_col: str = 'put_iv',
+                     top_n: int = 3) -> Dict[Hashable, Dict]:
+    """
+    Max pain, PCR, OI-weighted skew and support/resistance per expiry.
+    A chain without an expiry column is treated as a single expiry keyed None.
+    """
+    if expiry_col in chain.columns:
+        expiries = chain[expiry_col].to_numpy()
+    else:
+        expiries = np.zeros(len(chain), dtype=np.int64)
+    strikes = chain[strike_col].to_numpy(dtype=np.float64)
+    call_oi = chain[call_oi_col].to_numpy(dtype=np.float64)
+    put_oi = chain[put_oi_col].to_numpy(dtype=np.float64)
+    has_iv = call_iv_col in chain.columns and put_iv_col in chain.columns
+
+    if has_iv:
+        call_iv = chain[call_iv_col].to_numpy(dtype=np.float64)
+        put_iv = chain[put_iv_col].to_numpy(dtype=np.float64)
+
+    pains = max_pain_by_expiry(expiries, strikes, call_oi, put_oi)
+    labels, codes = np.unique(expiries, return_inverse=True)
+    rows_by_code = np.split(np.argsort(codes, kind='stable'), np.cumsum(np.bincount(codes))[:-1])
+
+    stats = {}
+    for label, idx in zip(labels, rows_by_code):
+        entry = {
+            'max_pain': pains[label],
+            'pcr': put_call_ratio(call_oi[idx], put_oi[idx]),
+            **support_resistance(strikes[idx], call_oi[idx], put_oi[idx], top_n)
+        }
+        if has_iv and spot_price is not None:
+            entry['iv_skew'] = oi_weighted_skew(
+                strikes[idx], call_iv[idx], put_iv[idx],
+                call_oi[idx], put_oi[idx], spot_price
+            )
+        stats[label if expiry_col in chain.columns else None] = entry
+    return stats
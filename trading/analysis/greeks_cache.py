@@ -0,0 +1,205 @@
+import numpy as np
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+from trading.analysis.greeks_calculator import GreeksCalculator
+
+class GreeksCache:
+    """
+    Opt-in LRU cache in front of GreeksCalculator.
+    Inputs are snapped to configurable spot/vol/time grids before pricing, so
+    repeated requests within the same buckets reuse the cached result. Batches
+    are cached per strike row: only rows whose quantized inputs changed since an
+    earlier chain are repriced, in one vectorized call. Exposes the same pricing
+    methods as GreeksCalculator and can be used in its place.
+    """
+
+    def __init__(self,
+                 calculator: Optional[GreeksCalculator] = None,
+                 spot_tick: float = 0.05,
+                 vol_step: float = 0.0005,
+                 time_step: float = 1 / (365 * 24 * 60),  # one minute, in years
+                 maxsize: int = 65536):
+        """
+        :param calculator: Calculator to delegate to (a new one by default)
+        :param spot_tick: Spot price resolution
+        :param vol_step: Volatility resolution (decimal)
+        :param time_step: Time to expiry resolution in years
+        :param maxsize: Maximum number of cached entries (one per scalar request or batch row)
+        """
+        self.calculator = calculator or GreeksCalculator()
+        self.spot_tick = spot_tick
+        self.vol_step = vol_step
+        self.time_step = time_step
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, object]" = OrderedDict()
+        # Output names of each batch kind, in the order row entries store them
+        self._row_fields: Dict[Hashable, Tuple[str, ...]] = {}
+
+    def calculate_greeks(self,
+                         spot_price: float,
+                         strike_price: float,
+                         time_to_expiry: float,
+                         volatility: float,
+                         risk_free_rate: float,
+                         option_type: str = "call") -> Dict[str, float]:
+        """Cached GreeksCalculator.calculate_greeks"""
+        spot_price, time_to_expiry, volatility = self._quantize_scalars(spot_price, time_to_expiry, volatility)
+        key = ("greeks", spot_price, strike_price, time_to_expiry, volatility,
+               risk_free_rate, option_type.lower())
+        result = self._lookup(key, lambda: self.calculator.calculate_greeks(
+            spot_price, strike_price, time_to_expiry, volatility, risk_free_rate, option_type
+        ))
+        return dict(result)
+
+    def calculate_option_price(self,
+                               spot_price: float,
+                               strike_price: float,
+                               time_to_expiry: float,
+                               volatility: float,
+                               risk_free_rate: float,
+                               option_type: str = "call") -> float:
+        """Cached GreeksCalculator.calculate_option_price"""
+        spot_price, time_to_expiry, volatility = self._quantize_scalars(spot_price, time_to_expiry, volatility)
+        key = ("price", spot_price, strike_price, time_to_expiry, volatility,
+               risk_free_rate, option_type.lower())
+        return self._lookup(key, lambda: self.calculator.calculate_option_price(
+            spot_price, strike_price, time_to_expiry, volatility, risk_free_rate, option_type
+        ))
+
+    def calculate_greeks_batch(self,
+                               spot_price,
+                               strike_price,
+                               time_to_expiry,
+                               volatility,
+                               risk_free_rate,
+                               is_call,
+                               include_price: bool = False) -> Dict[str, np.ndarray]:
+        """Cached GreeksCalculator.calculate_greeks_batch, keyed per quantized strike row"""
+        inputs = self._quantize_arrays(spot_price, strike_price, time_to_expiry,
+                                       volatility, risk_free_rate, is_call)
+        return self._lookup_rows(
+            ("greeks_batch", bool(include_price)), inputs,
+            lambda *rows: self.calculator.calculate_greeks_batch(*rows, include_price=include_price)
+        )
+
+    def calculate_option_price_batch(self,
+                                     spot_price,
+                                     strike_price,
+                                     time_to_expiry,
+                                     volatility,
+                                     risk_free_rate,
+                                     is_call) -> np.ndarray:
+        """Cached GreeksCalculator.calculate_option_price_batch"""
+        inputs = self._quantize_arrays(spot_price, strike_price, time_to_expiry,
+                                       volatility, risk_free_rate, is_call)
+        return self._lookup_rows(
+            ("price_batch",), inputs,
+            lambda *rows: {"price": self.calculator.calculate_option_price_batch(*rows)}
+        )["price"]
+
+    def calculate_implied_volatility(self, *args, **kwargs) -> Optional[float]:
+        """GreeksCalculator.calculate_implied_volatility, uncached: observed prices rarely repeat"""
+        return self.calculator.calculate_implied_volatility(*args, **kwargs)
+
+    def calculate_implied_volatility_batch(self, *args, **kwargs) -> Dict[str, np.ndarray]:
+        """GreeksCalculator.calculate_implied_volatility_batch, uncached: observed prices rarely repeat"""
+        return self.calculator.calculate_implied_volatility_batch(*args, **kwargs)
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def clear(self):
+        """Drop all entries and reset counters"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key: Hashable, compute: Callable[[], object]):
+        """Return the cached value for key, computing and inserting on a miss"""
+        try:
+            value = self._entries[key]
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+        except KeyError:
+            pass
+
+        self.misses += 1
+        value = compute()
+        self._insert(key, value)
+        return value
+
+    def _insert(self, key: Hashable, value):
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _lookup_rows(self, kind: Hashable, inputs, compute: Callable[..., Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        """
+        Per-row cached batch: each row of the broadcast inputs is its own entry and
+        the missing rows are computed together by compute(*input_columns).
+        :return: Read-only output arrays in the broadcast shape
+        """
+        arrays = np.broadcast_arrays(*inputs)
+        shape = arrays[0].shape
+        columns = [a.ravel() for a in arrays]
+        keys = [kind + row for row in zip(*(c.tolist() for c in columns))]
+        rows = [None] * len(keys)
+        missing = []
+        entries = self._entries
+        for i, key in enumerate(keys):
+            row = entries.get(key)
+            if row is None:
+                missing.append(i)
+            else:
+                entries.move_to_end(key)
+                rows[i] = row
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            index = np.asarray(missing)
+            computed = compute(*(c[index] for c in columns))
+            fields = self._row_fields.setdefault(kind, tuple(computed))
+            values = np.column_stack([np.asarray(computed[name], dtype=np.float64).ravel() for name in fields])
+            for i, row in zip(missing, map(tuple, values.tolist())):
+                rows[i] = row
+                self._insert(keys[i], row)
+        fields = self._row_fields[kind]
+        table = np.array(rows, dtype=np.float64).reshape(len(keys), len(fields))
+        return self._freeze({name: table[:, j].reshape(shape) for j, name in enumerate(fields)})
+
+    def _quantize_scalars(self, spot_price: float, time_to_expiry: float, volatility: float):
+        return (
+            round(round(spot_price / self.spot_tick) * self.spot_tick, 10),
+            round(round(time_to_expiry / self.time_step) * self.time_step, 12),
+            round(round(volatility / self.vol_step) * self.vol_step, 10)
+        )
+
+    def _quantize_arrays(self, spot_price, strike_price, time_to_expiry,
+                         volatility, risk_free_rate, is_call):
+        return (
+            np.round(np.asarray(spot_price, dtype=np.float64) / self.spot_tick) * self.spot_tick,
+            np.asarray(strike_price, dtype=np.float64),
+            np.round(np.asarray(time_to_expiry, dtype=np.float64) / self.time_step) * self.time_step,
+            np.round(np.asarray(volatility, dtype=np.float64) / self.vol_step) * self.vol_step,
+            np.asarray(risk_free_rate, dtype=np.float64),
+            np.asarray(is_call, dtype=bool)
+        )
+
+    @staticmethod
+    def _freeze(value):
+        """Make cached arrays read-only so callers cannot corrupt shared entries"""
+        arrays = value.values() if isinstance(value, dict) else [value]
+        for a in arrays:
+            a.setflags(write=False)
+        return value
@@ -1,9 +1,20 @@
 import numpy as np
 from scipy.stats import norm
+from scipy.special import ndtr
 from typing import Dict, Optional
 from datetime import datetime
 from core.logger import logger
 
+# Floors keep d1/d2 finite for expiring strikes and zero-vol quotes
+MIN_TIME_TO_EXPIRY = 1e-8
+MIN_VOLATILITY = 1e-8
+# Search bracket for the implied volatility solver
+IV_LOWER_BOUND = 1e-4
+IV_UPPER_BOUND = 5.0
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+# Input arrays of greeks_batch, in calculate_greeks_batch argument order
+GREEKS_INPUTS = ("spot_price", "strike_price", "time_to_expiry", "volatility", "risk_free_rate", "is_call")
+
 class GreeksCalculator:
     """Option Greeks calculator"""
     
@@ -58,7 +69,109 @@ class GreeksCalculator:
         except Exception as e:
             logger.error(f"Greeks calculation failed: {e}")
             return {}
+
+    def calculate_greeks_batch(self,
+                               spot_price,
+                               strike_price,
+                               time_to_expiry,
+                               volatility,
+                               risk_free_rate,
+                               is_call,
+                               include_price: bool = False) -> Dict[str, np.ndarray]:
+        """
+        Calculate Greeks for a whole chain in one vectorized pass.
+        :param spot_price: Underlying price(s), scalar or array
+        :param strike_price: Strike price array
+        :param time_to_expiry: Time to expiry in years, scalar or array
+        :param volatility: Volatility (decimal), scalar or array
+        :param risk_free_rate: Risk-free rate, scalar or array
+        :param is_call: Boolean mask, True for calls and False for puts
+        :param include_price: Also return the option price, reusing d1/d2
+        :return: Dict of delta/gamma/theta/vega/rho arrays (unrounded)
+        """
+        S, K, T, sigma, r, is_call = self._broadcast_inputs(
+            spot_price, strike_price, time_to_expiry, volatility, risk_free_rate, is_call
+        )
+        sqrt_t = np.sqrt(T)
+        d1, d2 = self._d1_d2(S, K, T, sigma, r, sqrt_t)
+
+        pdf_d1 = np.exp(-0.5 * d1 * d1) * _INV_SQRT_2PI
+        discount_k = K * np.exp(-r * T)
+        # N(-x) = 1 - N(x) lets puts reuse the call CDFs
+        cdf_d1 = ndtr(d1)
+        cdf_d2 = ndtr(d2)
+        cdf_d2_signed = np.where(is_call, cdf_d2, cdf_d2 - 1.0)
+
+        time_decay = -S * pdf_d1 * sigma / (2 * sqrt_t)
+
+        greeks = {
+            "delta": np.where(is_call, cdf_d1, cdf_d1 - 1.0),
+            "gamma": pdf_d1 / (S * sigma * sqrt_t),
+            "theta": time_decay - r * discount_k * cdf_d2_signed,
+            "vega": S * sqrt_t * pdf_d1,
+            "rho": discount_k * T * cdf_d2_signed
+        }
+        if include_price:
+            call = S * cdf_d1 - discount_k * cdf_d2
+            greeks["price"] = np.where(is_call, call, call - S + discount_k)
+        return greeks
+
+    def calculate_option_price_batch(self,
+                                     spot_price,
+                                     strike_price,
+                                     time_to_expiry,
+                                     volatility,
+                                     risk_free_rate,
+                                     is_call) -> np.ndarray:
+        """Black-Scholes prices for a whole chain in one vectorized pass"""
+        S, K, T, sigma, r, is_call = self._broadcast_inputs(
+            spot_price, strike_price, time_to_expiry, volatility, risk_free_rate, is_call
+        )
+        d1, d2 = self._d1_d2(S, K, T, sigma, r, np.sqrt(T))
+        discount_k = K * np.exp(-r * T)
+        call = S * ndtr(d1) - discount_k * ndtr(d2)
+        # Put-call parity avoids a second pair of CDF evaluations
+        return np.where(is_call, call, call - S + discount_k)
+
+    @staticmethod
+    def _broadcast_inputs(spot_price, strike_price, time_to_expiry,
+                          volatility, risk_free_rate, is_call, option_price=None):
+        """
+        Convert batch inputs to broadcast float64 arrays with safe floors
+        :param option_price: Observed prices, broadcast with the rest and returned last when given
+        """
+        arrays = [
+            np.asarray(spot_price, dtype=np.float64),
+            np.asarray(strike_price, dtype=np.float64),
+            np.maximum(np.asarray(time_to_expiry, dtype=np.float64), MIN_TIME_TO_EXPIRY),
+            np.maximum(np.asarray(volatility, dtype=np.float64), MIN_VOLATILITY),
+            np.asarray(risk_free_rate, dtype=np.float64),
+            np.asarray(is_call, dtype=bool)
+        ]
+        if option_price is not None:
+            arrays.append(np.asarray(option_price, dtype=np.float64))
+        return tuple(np.broadcast_arrays(*arrays))
+
+    @staticmethod
+    def _d1_d2(S, K, T, sigma, r, sqrt_t):
+        """Black-Scholes d1/d2 on arrays"""
+        sigma_sqrt_t = sigma * sqrt_t
+        d1 = (np.log(S / K) + (r + 0.5 * sigma * sigma) * T) / sigma_sqrt_t
+        return d1, d1 - sigma_sqrt_t
             
+    def calculate_option_price(self,
+                               spot_price: float,
+                               strike_price: float,
+                               time_to_expiry: float,
+                               volatility: float,
+                               risk_free_rate: float,
+                               option_type: str = "call") -> float:
+        """Calculate Black-Scholes price for a single option"""
+        return float(self.calculate_option_price_batch(
+            spot_price, strike_price, time_to_expiry,
+            volatility, risk_free_rate, option_type.lower() == "call"
+        ))
+
     def calculate_implied_volatility(self,
                                    option_price: float,
                                    spot_price: float,
@@ -66,40 +179,113 @@ class GreeksCalculator:
                                    time_to_expiry: float,
                                    risk_free_rate: float,
                                    option_type: str = "call") -> Optional[float]:
-        """Calculate implied volatility using Newton-Raphson method"""
+        """Calculate implied volatility for a single option"""
         try:
-            MAX_ITERATIONS = 100
-            PRECISION = 1.0e-5
-            sigma = 0.5  # Initial guess
-            
-            for i in range(MAX_ITERATIONS):
-                price = self.calculate_option_price(
-                    spot_price, strike_price, time_to_expiry,
-                    sigma, risk_free_rate, option_type
-                )
-                diff = option_price - price
-                
-                if abs(diff) < PRECISION:
-                    return sigma
-                    
-                vega = self.calculate_greeks(
-                    spot_price, strike_price, time_to_expiry,
-                    sigma, risk_free_rate, option_type
-                )["vega"]
-                
-                if vega == 0:
-                    return None
-                    
-                sigma = sigma + diff/vega
-                
-            return None
+            result = self.calculate_implied_volatility_batch(
+                option_price, spot_price, strike_price,
+                time_to_expiry, risk_free_rate, option_type.lower() == "call"
+            )
+            return float(result["iv"]) if result["converged"] else None
             
         except Exception as e:
             logger.error(f"Implied volatility calculation failed: {e}")
             return None
 
+    def calculate_implied_volatility_batch(self,
+                                           option_price,
+                                           spot_price,
+                                           strike_price,
+                                           time_to_expiry,
+                                           risk_free_rate,
+                                           is_call,
+                                           precision: float = 1.0e-5,
+                                           max_iterations: int = 50) -> Dict[str, np.ndarray]:
+        """
+        Solve implied volatility for a whole chain at once.
+        Starts from the Corrado-Miller approximation, takes Halley steps and
+        falls back to bisection inside a maintained bracket whenever a step
+        would leave it, so every strike with an arbitrage-free price converges.
+        :param option_price: Observed option prices
+        :param is_call: Boolean mask, True for calls and False for puts
+        :param precision: Absolute price tolerance
+        :param max_iterations: Iteration cap per strike
+        :return: Dict with "iv" (NaN where unsolved), "iterations" and "converged" arrays
+        """
+        S, K, T, _, r, is_call, price = self._broadcast_inputs(
+            spot_price, strike_price, time_to_expiry, MIN_VOLATILITY, risk_free_rate, is_call, option_price
+        )
+        S, K, T, r, is_call = (np.ravel(a) for a in (S, K, T, r, is_call))
+        discount_k = K * np.exp(-r * T)
+        # Solve puts as calls via put-call parity
+        call_price = np.where(is_call, price.ravel(), price.ravel() + S - discount_k)
+
+        n = call_price.size
+        iv = np.full(n, np.nan)
+        iterations = np.zeros(n, dtype=np.int64)
+        converged = np.zeros(n, dtype=bool)
+
+        # Prices outside the no-arbitrage bounds have no implied volatility
+        lower_bound = np.maximum(S - discount_k, 0.0)
+        active = np.flatnonzero(
+            np.isfinite(call_price) & (call_price >= lower_bound) & (call_price < S)
+        )
+
+        lo = np.full(active.size, IV_LOWER_BOUND)
+        hi = np.full(active.size, IV_UPPER_BOUND)
+        sigma = np.clip(
+            self._initial_vol_guess(call_price[active], S[active], discount_k[active], T[active]),
+            IV_LOWER_BOUND, IV_UPPER_BOUND
+        )
+
+        for _ in range(max_iterations):
+            if active.size == 0:
+                break
+            s, dk, t, target = S[active], discount_k[active], T[active], call_price[active]
+            sqrt_t = np.sqrt(t)
+            sigma_sqrt_t = sigma * sqrt_t
+            d1 = (np.log(s / dk) + 0.5 * sigma_sqrt_t * sigma_sqrt_t) / sigma_sqrt_t
+            d2 = d1 - sigma_sqrt_t
+            diff = s * ndtr(d1) - dk * ndtr(d2) - target
+            iterations[active] += 1
+
+            done = np.abs(diff) < precision
+            iv[active[done]] = sigma[done]
+            converged[active[done]] = True
+
+            # Shrink the bracket around the root before stepping
+            too_high = diff > 0
+            hi = np.where(too_high, sigma, hi)
+            lo = np.where(too_high, lo, sigma)
+
+            vega = s * sqrt_t * np.exp(-0.5 * d1 * d1) * _INV_SQRT_2PI
+            volga = vega * d1 * d2 / sigma
+            with np.errstate(divide='ignore', invalid='ignore'):
+                step = 2 * diff * vega / (2 * vega * vega - diff * volga)
+            candidate = sigma - step
+            safe = np.isfinite(candidate) & (candidate > lo) & (candidate < hi)
+            sigma = np.where(safe, candidate, 0.5 * (lo + hi))
+
+            keep = ~done
+            active, sigma, lo, hi = active[keep], sigma[keep], lo[keep], hi[keep]
+
+        shape = np.shape(price)
+        return {
+            "iv": iv.reshape(shape),
+            "iterations": iterations.reshape(shape),
+            "converged": converged.reshape(shape)
+        }
+
+    @staticmethod
+    def _initial_vol_guess(call_price, spot_price, discount_k, time_to_expiry):
+        """Corrado-Miller rational approximation of implied volatility"""
+        forward_gap = spot_price - discount_k
+        centred = call_price - 0.5 * forward_gap
+        radicand = np.maximum(centred * centred - forward_gap * forward_gap / np.pi, 0.0)
+        total_vol = np.sqrt(2 * np.pi) / (spot_price + discount_k) * (centred + np.sqrt(radicand))
+        return total_vol / np.sqrt(time_to_expiry)
+
     def calculate_iv(self, option_data):
-        """Calculate Implied Volatility using Newton-Raphson method"""
+        """Calculate Implied Volatility for a single option chain row"""
         try:
             S = option_data['Underlying']  # Current stock price
             K = option_data['Strike Price']
@@ -107,27 +293,31 @@ class GreeksCalculator:
             r = 0.05  # Assuming a default risk-free rate
             C = option_data['Last Price']
             
-            sigma = 0.3  # Initial volatility guess
-            
-            for i in range(100):
-                d1 = (np.log(S/K) + (r + sigma**2/2)*T) / (sigma*np.sqrt(T))
-                d2 = d1 - sigma*np.sqrt(T)
-                
-                if option_data['Option Type'] == 'CE':
-                    price = S*self.N(d1) - K*np.exp(-r*T)*self.N(d2)
-                else:
-                    price = K*np.exp(-r*T)*self.N(-d2) - S*self.N(-d1)
-                
-                diff = C - price
-                if abs(diff) < 0.0001:
-                    return sigma
-                    
-                vega = S*np.sqrt(T)*self.N_prime(d1)
-                sigma = sigma + diff/vega
-                
-            return sigma
+            result = self.calculate_implied_volatility_batch(
+                C, S, K, T, r, option_data['Option Type'] == 'CE'
+            )
+            return float(result["iv"])
         except Exception as e:
             logger.error(f"Error calculating IV: {e}")
             return np.nan
             
-    # Add other Greek calculations... 
\ No newline at end of file
+    # Add other Greek calculations... 
+
+def greeks_batch(arrays: Dict[str, np.ndarray], include_price: bool = False) -> Dict[str, np.ndarray]:
+    """calculate_greeks_batch over a dict of GREEKS_INPUTS arrays, as a ComputeExecutor task"""
+    return GreeksCalculator().calculate_greeks_batch(*(arrays[name] for name in GREEKS_INPUTS),
+                                                     include_price=include_price)
+
+def chain_greeks(arrays: Dict[str, np.ndarray], risk_free_rate: float) -> Dict[str, np.ndarray]:
+    """
+    Solve IV from option_price, then Greeks at that IV, as one ComputeExecutor task.
+    :return: "iv" plus the calculate_greeks_batch arrays
+    """
+    calculator = GreeksCalculator()
+    spot_price, strike_price = arrays["spot_price"], arrays["strike_price"]
+    time_to_expiry, is_call = arrays["time_to_expiry"], arrays["is_call"]
+    iv = calculator.calculate_implied_volatility_batch(
+        arrays["option_price"], spot_price, strike_price, time_to_expiry, risk_free_rate, is_call
+    )["iv"]
+    greeks = calculator.calculate_greeks_batch(spot_price, strike_price, time_to_expiry, iv, risk_free_rate, is_call)
+    return {"iv": iv, **greeks}
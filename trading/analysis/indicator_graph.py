@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, Union
+
+# Source columns every graph can read directly from the input data
+SOURCES = ("open", "high", "low", "close", "volume")
+
+class Node:
+    """A named indicator computed from the series of its input nodes"""
+
+    __slots__ = ("name", "inputs", "fn")
+
+    def __init__(self, name: str, inputs: Sequence[str], fn: Callable[..., pd.Series]):
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.fn = fn
+
+def wilder(series: pd.Series, period: int) -> pd.Series:
+    """Wilder smoothing seeded with the mean of the first period values"""
+    values = series.dropna()
+    result = pd.Series(np.nan, index=series.index)
+    if len(values) < period:
+        return result
+    seeded = values.iloc[period - 1:].copy()
+    seeded.iloc[0] = values.iloc[:period].mean()
+    result.loc[seeded.index] = seeded.ewm(alpha=1.0 / period, adjust=False).mean()
+    return result
+
+def _rsi(gain: pd.Series, loss: pd.Series) -> pd.Series:
+    rsi = 100 - 100 / (1 + gain / loss)
+    return rsi.where(loss != 0, 100.0).where(gain.notna())
+
+def _true_range(high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
+    previous = close.shift()
+    return pd.concat([high - low, (high - previous).abs(), (low - previous).abs()], axis=1).max(axis=1)
+
+# Parameterized node families: "<prefix>_<n>" -> (inputs, fn)
+FAMILIES: Dict[str, Callable[[int], Tuple[Sequence[str], Callable[..., pd.Series]]]] = {
+    "sma": lambda n: (["close"], lambda close: close.rolling(n).mean()),
+    "ema": lambda n: (["close"], lambda close: close.ewm(span=n, adjust=False).mean()),
+    "std": lambda n: (["close"], lambda close: close.rolling(n).std()),
+    "avg_gain": lambda n: (["gain"], lambda gain: wilder(gain, n)),
+    "avg_loss": lambda n: (["loss"], lambda loss: wilder(loss, n)),
+    "rsi": lambda n: ([f"avg_gain_{n}", f"avg_loss_{n}"], _rsi),
+    "atr": lambda n: (["true_range"], lambda true_range: wilder(true_range, n)),
+    "bb_upper": lambda n: ([f"sma_{n}", f"std_{n}"], lambda mean, std: mean + 2 * std),
+    "bb_lower": lambda n: ([f"sma_{n}", f"std_{n}"], lambda mean, std: mean - 2 * std),
+    "volatility": lambda n: (["returns"], lambda returns: returns.rolling(n).std()),
+}
+
+# Named feature sets consumers can request instead of listing nodes (never a node name)
+FEATURE_SETS: Dict[str, List[str]] = {
+    "macd_lines": ["macd", "macd_signal", "macd_hist"],
+    "bollinger": ["sma_20", "std_20", "bb_upper_20", "bb_lower_20"],
+    "rsi": ["rsi_14"],
+    "atr": ["atr_14"],
+    "moving_averages": ["sma_10", "ema_10"],
+    "momentum": ["returns", "volume_change"],
+}
+
+class IndicatorGraph:
+    """
+    Declarative DAG of indicator nodes. Each node names its inputs, so shared
+    subexpressions (e.g. EMA12/EMA26 under MACD, SMA20 under the bands) are
+    computed once per evaluation; a memo dict can be passed in to reuse nodes
+    across calls on the same data.
+    """
+
+    def __init__(self):
+        self.nodes: Dict[str, Node] = {}
+        self.evaluations = 0  # node computations, for profiling reuse
+
+    def add(self, name: str, inputs: Sequence[str], fn: Callable[..., pd.Series]) -> "IndicatorGraph":
+        self.nodes[name] = Node(name, inputs, fn)
+        return self
+
+    def node(self, name: str) -> Node:
+        """Registered node, or one instantiated from a parameterized family"""
+        node = self.nodes.get(name)
+        if node is None:
+            prefix, _, parameter = name.rpartition("_")
+            if prefix not in FAMILIES or not parameter.isdigit():
+                raise KeyError(f"Unknown indicator: {name}")
+            inputs, fn = FAMILIES[prefix](int(parameter))
+            node = self.nodes[name] = Node(name, inputs, fn)
+        return node
+
+    def expand(self, features: Union[str, Iterable[str]]) -> List[str]:
+        """Node names of feature sets and/or nodes"""
+        names = []
+        for feature in [features] if isinstance(features, str) else features:
+            names.extend(FEATURE_SETS.get(feature, [feature]))
+        return names
+
+    def compute(self,
+                data: Union[pd.DataFrame, pd.Series],
+                features: Union[str, Iterable[str]],
+                memo: Optional[Dict[str, pd.Series]] = None) -> Dict[str, pd.Series]:
+        """
+        Evaluate features (node or feature set names) over data.
+        :param data: Bars with SOURCES columns, or a close price Series
+        :param memo: Node results reused and filled in; must only be shared for the same data
+        :return: Dict of node name -> Series
+        """
+        if isinstance(data, pd.Series):
+            data = data.to_frame("close")
+        memo = {} if memo is None else memo
+        return {name: self._evaluate(name, data, memo, ()) for name in self.expand(features)}
+
+    def _evaluate(self, name: str, data: pd.DataFrame, memo: Dict[str, pd.Series], path: Tuple[str, ...]):
+        result = memo.get(name)
+        if result is not None:
+            return result
+        if name in SOURCES and name not in self.nodes:
+            result = data[name].astype(float)
+        else:
+            if name in path:
+                raise ValueError(f"Indicator cycle: {' -> '.join(path + (name,))}")
+            node = self.node(name)
+            inputs = [self._evaluate(dependency, data, memo, path + (name,)) for dependency in node.inputs]
+            result = node.fn(*inputs)
+            self.evaluations += 1
+        memo[name] = result
+        return result
+
+def default_graph() -> IndicatorGraph:
+    graph = IndicatorGraph()
+    graph.add("returns", ["close"], lambda close: close.pct_change())
+    graph.add("volume_change", ["volume"], lambda volume: volume.pct_change())
+    graph.add("delta", ["close"], lambda close: close.diff())
+    graph.add("gain", ["delta"], lambda delta: delta.clip(lower=0))
+    graph.add("loss", ["delta"], lambda delta: (-delta).clip(lower=0))
+    graph.add("true_range", ["high", "low", "close"], _true_range)
+    graph.add("macd", ["ema_12", "ema_26"], lambda fast, slow: fast - slow)
+    graph.add("macd_signal", ["macd"], lambda macd: macd.ewm(span=9, adjust=False).mean())
+    graph.add("macd_hist", ["macd", "macd_signal"], lambda macd, signal: macd - signal)
+    return graph
+
+class IndicatorCache:
+    """
+    Per-symbol memo over a graph: nodes are computed once per bar and symbol, so
+    consumers requesting overlapping feature sets for the same bar share work.
+    A symbol's memo is dropped as soon as its data changes length, last index or
+    last close, i.e. moves to a new bar or updates the current one.
+    """
+
+    def __init__(self, graph: Optional[IndicatorGraph] = None):
+        self.graph = graph if graph is not None else default_graph()
+        self._memos: Dict[Hashable, Tuple[Hashable, Dict[str, pd.Series]]] = {}
+
+    def compute(self,
+                symbol: Hashable,
+                data: Union[pd.DataFrame, pd.Series],
+                features: Union[str, Iterable[str]]) -> Dict[str, pd.Series]:
+        close = data if isinstance(data, pd.Series) else data["close"]
+        bar = (len(data), data.index[-1], close.iloc[-1]) if len(data) else (0, None, None)
+        cached = self._memos.get(symbol)
+        if cached is None or cached[0] != bar:
+            cached = self._memos[symbol] = (bar, {})
+        return self.graph.compute(data, features, cached[1])
+
+    def clear(self, symbol: Optional[Hashable] = None):
+        if symbol is None:
+            self._memos.clear()
+        else:
+            self._memos.pop(symbol, None)
+
+# Shared graph and cache; every indicator call site evaluates through these definitions
+indicator_graph = default_graph()
+indicator_cache = IndicatorCache(indicator_graph)
@@ -1,7 +1,9 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Optional
 import logging
+from trading.analysis import chain_stats
+from trading.analysis.indicator_graph import indicator_cache, indicator_graph
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +15,7 @@ class OptionChainAnalyzer:
     def analyze_chain(self, market_data: Dict, spot_price: float) -> Dict:
         """Analyze option chain for trading opportunities"""
         try:
+            self.current_chain = pd.DataFrame(market_data)
             self.spot_price = spot_price
             
             # Skip max_pain calculation if no strike data
@@ -36,28 +39,34 @@ class OptionChainAnalyzer:
     def _calculate_pcr(self) -> float:
         """Calculate Put-Call Ratio"""
         try:
-            total_put_oi = self.current_chain['put_oi'].sum()
-            total_call_oi = self.current_chain['call_oi'].sum()
-            return total_put_oi / total_call_oi if total_call_oi > 0 else 1.0
-        except (KeyError, ZeroDivisionError):
+            return chain_stats.put_call_ratio(self.current_chain['call_oi'], self.current_chain['put_oi'])
+        except KeyError:
             logger.warning("Unable to calculate PCR, using default value")
             return 1.0  # Neutral PCR as default
         
     def _calculate_max_pain(self) -> float:
         """Calculate Max Pain Point"""
-        strikes = self.current_chain['strike'].unique()
+        chain = self.current_chain
+        return chain_stats.max_pain(chain['strike'], chain['call_oi'], chain['put_oi'])
         
-        pain_values = []
-        for strike in strikes:
-            # Calculate total pain at each strike
-            call_pain = self._calculate_option_pain('call', strike)
-            put_pain = self._calculate_option_pain('put', strike)
-            total_pain = call_pain + put_pain
-            pain_values.append((strike, total_pain))
-            
-        # Strike price with minimum pain
-        max_pain = min(pain_values, key=lambda x: x[1])[0]
-        return max_pain
+    def _calculate_iv_skew(self) -> float:
+        """Calculate IV Skew as OI-weighted put minus call IV"""
+        chain = self.current_chain
+        if chain is None or not {'call_iv', 'put_iv'}.issubset(chain.columns):
+            return 0.0
+        return chain_stats.oi_weighted_skew(
+            chain['strike'], chain['call_iv'], chain['put_iv'],
+            chain['call_oi'], chain['put_oi'], self.spot_price
+        )
+        
+    def _find_support_resistance(self) -> Dict[str, List[float]]:
+        """Support and resistance from put/call OI peaks"""
+        chain = self.current_chain
+        return chain_stats.support_resistance(chain['strike'], chain['call_oi'], chain['put_oi'])
+        
+    def analyze_expiries(self, chain: pd.DataFrame, spot_price: float) -> Dict:
+        """Chain statistics for every expiry in a multi-expiry chain"""
+        return chain_stats.chain_statistics(chain, spot_price)
         
     def _generate_signals(self) -> List[Dict]:
         """Generate trading signals"""
@@ -89,27 +98,23 @@ class OptionChainAnalyzer:
             
         return signals 
 
-    def calculate_technical_indicators(self, prices: pd.Series) -> Dict:
-        """Calculate technical indicators"""
+    def calculate_technical_indicators(self, prices: pd.Series, symbol: Optional[str] = None) -> Dict:
+        """
+        Calculate technical indicators
+        :param symbol: Shares the indicator_cache memo with other consumers of this symbol's bars
+        """
         try:
-            # Calculate RSI
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-
-            # Calculate MACD
-            exp1 = prices.ewm(span=12, adjust=False).mean()
-            exp2 = prices.ewm(span=26, adjust=False).mean()
-            macd = exp1 - exp2
-            signal = macd.ewm(span=9, adjust=False).mean()
+            features = ['rsi_14', 'macd', 'macd_signal', 'macd_hist']
+            if symbol is None:
+                results = indicator_graph.compute(prices, features)
+            else:
+                results = indicator_cache.compute(symbol, prices, features)
             
             return {
-                'rsi': rsi.iloc[-1],
-                'macd': macd.iloc[-1],
-                'signal': signal.iloc[-1],
-                'macd_hist': (macd - signal).iloc[-1]
+                'rsi': results['rsi_14'].iloc[-1],
+                'macd': results['macd'].iloc[-1],
+                'signal': results['macd_signal'].iloc[-1],
+                'macd_hist': results['macd_hist'].iloc[-1]
             }
         except Exception as e:
             logger.error(f"Technical indicator calculation failed: {e}")
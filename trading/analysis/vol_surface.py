@@ -0,0 +1,196 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional
+from scipy.optimize import least_squares
+from core.logger import logger
+
+# SVI needs at least as many quotes as parameters
+MIN_SVI_QUOTES = 5
+
+@dataclass
+class SmileSlice:
+    """Fitted smile for a single expiry"""
+    expiry: Hashable
+    forward: float
+    time_to_expiry: float  # in years
+    strikes: np.ndarray
+    ivs: np.ndarray
+    params: Optional[np.ndarray] = None  # raw SVI (a, b, rho, m, sigma)
+    rmse: float = np.nan
+
+    def total_variance(self, log_moneyness: np.ndarray) -> np.ndarray:
+        """Total implied variance w(k) for log-moneyness k = ln(K/F)"""
+        if self.params is None:
+            # Too few quotes for SVI: interpolate the quoted smile directly
+            quoted_k = np.log(self.strikes / self.forward)
+            return np.interp(log_moneyness, quoted_k, self.ivs) ** 2 * self.time_to_expiry
+        return VolSurface.svi_total_variance(self.params, log_moneyness)
+
+    def vol(self, strikes) -> np.ndarray:
+        """Implied volatility at the given strikes"""
+        k = np.log(np.asarray(strikes, dtype=np.float64) / self.forward)
+        return np.sqrt(np.maximum(self.total_variance(k), 0.0) / self.time_to_expiry)
+
+class VolSurface:
+    """Implied volatility surface for one underlying, fitted per expiry"""
+
+    def __init__(self, underlying: str, iv_tolerance: float = 1e-4):
+        """
+        :param underlying: Underlying symbol, e.g. NIFTY
+        :param iv_tolerance: Quote changes below this (in vol) do not trigger a refit
+        """
+        self.underlying = underlying
+        self.iv_tolerance = iv_tolerance
+        self.slices: Dict[Hashable, SmileSlice] = {}
+        self.fit_count = 0
+
+    @property
+    def expiries(self) -> List[Hashable]:
+        """Fitted expiries, nearest first"""
+        return sorted(self.slices, key=lambda e: self.slices[e].time_to_expiry)
+
+    def update_quotes(self,
+                      expiry: Hashable,
+                      strikes,
+                      ivs,
+                      forward: float,
+                      time_to_expiry: float) -> bool:
+        """
+        Update one expiry's quotes, refitting only if they changed.
+        :return: True if the smile was refitted
+        """
+        strikes = np.asarray(strikes, dtype=np.float64)
+        ivs = np.asarray(ivs, dtype=np.float64)
+        valid = np.isfinite(strikes) & np.isfinite(ivs) & (ivs > 0)
+        strikes, ivs = strikes[valid], ivs[valid]
+        if strikes.size == 0 or time_to_expiry <= 0:
+            return False
+
+        order = np.argsort(strikes)
+        strikes, ivs = strikes[order], ivs[order]
+
+        current = self.slices.get(expiry)
+        if current is not None and not self._quotes_changed(current, strikes, ivs, forward):
+            if time_to_expiry != current.time_to_expiry:
+                self._roll(current, float(time_to_expiry))
+            return False
+
+        smile = SmileSlice(expiry, float(forward), float(time_to_expiry), strikes, ivs)
+        if strikes.size >= MIN_SVI_QUOTES:
+            warm_start = current.params if current is not None else None
+            smile.params, smile.rmse = self._fit_svi(smile, warm_start)
+        self.slices[expiry] = smile
+        self.fit_count += 1
+        return True
+
+    def update_chain(self, chain: pd.DataFrame, spot_price: float,
+                     risk_free_rate: float = 0.05) -> List[Hashable]:
+        """
+        Update every expiry in a chain DataFrame.
+        Expects 'expiry', 'strike', 'iv' (decimal) and 'time_to_expiry' columns.
+        :return: Expiries that were refitted
+        """
+        refitted = []
+        for expiry, group in chain.groupby('expiry', sort=False):
+            t = float(group['time_to_expiry'].iloc[0])
+            forward = spot_price * np.exp(risk_free_rate * t)
+            if self.update_quotes(expiry, group['strike'].to_numpy(), group['iv'].to_numpy(), forward, t):
+                refitted.append(expiry)
+        return refitted
+
+    def get_vol(self, strikes, expiries) -> np.ndarray:
+        """
+        Vectorized implied volatility lookup by (strike, expiry).
+        :param strikes: Strike array
+        :param expiries: A single expiry key or an array of keys matching strikes
+        :return: Volatility array, NaN for unknown expiries
+        """
+        strikes = np.asarray(strikes, dtype=np.float64)
+        if np.ndim(expiries) == 0:
+            smile = self.slices.get(expiries)
+            return smile.vol(strikes) if smile is not None else np.full(strikes.shape, np.nan)
+
+        expiries = np.asarray(expiries)
+        vols = np.full(strikes.shape, np.nan)
+        for expiry in pd.unique(expiries.ravel()):
+            smile = self.slices.get(expiry)
+            if smile is not None:
+                mask = expiries == expiry
+                vols[mask] = smile.vol(strikes[mask])
+        return vols
+
+    def time_to_expiry(self, expiry: Hashable) -> float:
+        """Time to expiry in years used for the fitted slice"""
+        return self.slices[expiry].time_to_expiry
+
+    def atm_vol(self, expiry: Optional[Hashable] = None) -> float:
+        """At-the-forward volatility, nearest expiry by default"""
+        smile = self._slice(expiry)
+        return float(smile.vol(smile.forward)) if smile is not None else np.nan
+
+    def skew(self, expiry: Optional[Hashable] = None, width: float = 0.05) -> float:
+        """
+        Put-minus-call wing volatility at forward * (1 -/+ width).
+        Positive values mean downside strikes are richer.
+        """
+        smile = self._slice(expiry)
+        if smile is None:
+            return 0.0
+        put_vol, call_vol = smile.vol([smile.forward * (1 - width), smile.forward * (1 + width)])
+        return float(put_vol - call_vol)
+
+    def _slice(self, expiry: Optional[Hashable]) -> Optional[SmileSlice]:
+        if expiry is None:
+            expiries = self.expiries
+            return self.slices[expiries[0]] if expiries else None
+        return self.slices.get(expiry)
+
+    @staticmethod
+    def _roll(smile: SmileSlice, time_to_expiry: float):
+        """Move a slice to a new time to expiry keeping its vols; SVI total variance scales with a and b"""
+        if smile.params is not None:
+            scale = time_to_expiry / smile.time_to_expiry
+            smile.params = smile.params * np.array([scale, scale, 1.0, 1.0, 1.0])
+        smile.time_to_expiry = time_to_expiry
+
+    def _quotes_changed(self, current: SmileSlice, strikes: np.ndarray,
+                        ivs: np.ndarray, forward: float) -> bool:
+        """Check whether new quotes differ from the fitted ones"""
+        if current.strikes.shape != strikes.shape or not np.array_equal(current.strikes, strikes):
+            return True
+        if abs(forward / current.forward - 1) > self.iv_tolerance:
+            return True
+        return bool(np.max(np.abs(current.ivs - ivs)) > self.iv_tolerance)
+
+    @staticmethod
+    def svi_total_variance(params: np.ndarray, log_moneyness: np.ndarray) -> np.ndarray:
+        """Raw SVI: w(k) = a + b * (rho * (k - m) + sqrt((k - m)^2 + sigma^2))"""
+        a, b, rho, m, sigma = params
+        shifted = log_moneyness - m
+        return a + b * (rho * shifted + np.sqrt(shifted * shifted + sigma * sigma))
+
+    def _fit_svi(self, smile: SmileSlice, warm_start: Optional[np.ndarray]):
+        """Least-squares SVI fit in total variance, warm-started when possible"""
+        k = np.log(smile.strikes / smile.forward)
+        w = smile.ivs ** 2 * smile.time_to_expiry
+        w_max = float(w.max())
+
+        lower = [-w_max, 0.0, -0.999, k.min() - 1.0, 1e-4]
+        upper = [w_max, 10.0, 0.999, k.max() + 1.0, 5.0]
+        if warm_start is None:
+            x0 = np.array([float(w.min()) * 0.5, 0.1, -0.3, 0.0, 0.1])
+        else:
+            x0 = warm_start.copy()
+        x0 = np.clip(x0, np.array(lower) + 1e-9, np.array(upper) - 1e-9)
+
+        try:
+            result = least_squares(
+                lambda p: self.svi_total_variance(p, k) - w,
+                x0, bounds=(lower, upper), method='trf'
+            )
+            fitted_vol = np.sqrt(np.maximum(self.svi_total_variance(result.x, k), 0.0) / smile.time_to_expiry)
+            return result.x, float(np.sqrt(np.mean((fitted_vol - smile.ivs) ** 2)))
+        except Exception as e:
+            logger.error(f"SVI fit failed for {self.underlying} {smile.expiry}: {e}")
+            return None, np.nan
@@ -1,52 +1,172 @@
+import asyncio
+import multiprocessing
+import sys
+import numpy as np
 import pandas as pd
-from typing import Dict
-import matplotlib.pyplot as plt
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
 from io import BytesIO
 
+from trading.market_data.ring_buffer import ColumnRing, PriceHistoryStore, price_history
+from trading.market_data.streaming_indicators import IndicatorSet
+
+CHART_COLUMNS = {
+    "timestamp": np.int64,
+    "Close": np.float64,
+    "MA10": np.float64,
+    "EMA10": np.float64,
+    "RSI": np.float64
+}
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+    :return: Indices of the threshold points that best preserve the shape of y(x);
+        all indices when there are no more than threshold points
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Bucket edges over the interior points; first and last points are always kept
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # The next bucket's average is the third triangle vertex
+        next_start, next_end = end, edges[i + 2] if i + 2 < threshold - 1 else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        px, py = x[previous], y[previous]
+        areas = np.abs((px - avg_x) * (y[start:end] - py) - (px - x[start:end]) * (avg_y - py))
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+    return selected
+
+def render_chart(title: str, timestamp: np.ndarray, series: Dict[str, np.ndarray]) -> bytes:
+    """Render series against epoch-millisecond timestamps to PNG bytes (runs in a worker process)"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    index = pd.to_datetime(timestamp, unit='ms')
+    plt.figure(figsize=(12, 6))
+    for label, values in series.items():
+        plt.plot(index, values, label=label)
+    plt.title(title)
+    plt.xlabel('Time')
+    plt.ylabel('Price')
+    plt.legend()
+
+    buf = BytesIO()
+    plt.savefig(buf, format='png')
+    plt.close()
+    return buf.getvalue()
+
+class ChartSeries:
+    """
+    Chart columns for one symbol: close plus incrementally updated indicators,
+    kept in a ColumnRing aligned with the symbol's price history. EMA10 is the
+    recursive (ewm adjust=False) EMA and RSI uses Wilder smoothing, as in
+    streaming_indicators, rather than ewm's default adjust=True and SMA-based RSI.
+    """
+
+    def __init__(self, capacity: int):
+        self.ring = ColumnRing(capacity, CHART_COLUMNS)
+        self.indicators = IndicatorSet()
+        self.synced = 0  # price history appends already consumed
+
+    def sync(self, history) -> int:
+        """Consume prices appended to history (a PriceRing) since the last sync; O(new prices)"""
+        new = history.appended - self.synced
+        if new < 0:  # history was cleared
+            self.ring.clear()
+            self.indicators = IndicatorSet()
+            new = history.appended
+        if new == 0:
+            return 0
+        window = history.last(new)
+        indicators = self.indicators
+        append = self.ring.append_row
+        for timestamp, price in zip(window.timestamp.tolist(), window.price.tolist()):
+            values = indicators.update(price)
+            append(timestamp, price, values["MA10"], values["EMA10"], values["RSI"])
+        self.synced = history.appended
+        return new
+
 class ChartManager:
-    def __init__(self):
-        self.data = pd.DataFrame()
-        self.indicators = {}
+    def __init__(self,
+                 history: Optional[PriceHistoryStore] = None,
+                 symbol: str = "NIFTY",
+                 window: int = 20000,
+                 points: int = 1000):
+        """
+        :param history: Per-symbol price history (the shared store by default)
+        :param window: Number of latest prices to chart
+        :param points: Target number of plotted points after LTTB downsampling
+        """
+        self.history = history if history is not None else price_history
+        self.symbol = symbol
+        self.window = window
+        self.points = points
+        self.series: Dict[str, ChartSeries] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
         
     def update_data(self, market_data: Dict):
         """Update chart data with new market data"""
-        new_data = pd.DataFrame([market_data])
-        self.data = pd.concat([self.data, new_data])
-        self._calculate_indicators()
-        
-    def _calculate_indicators(self):
-        """Calculate technical indicators"""
-        if len(self.data) > 0:
-            # Calculate MA
-            self.data['MA10'] = self.data['Close'].rolling(10).mean()
-            self.data['EMA10'] = self.data['Close'].ewm(span=10).mean()
-            
-            # Calculate RSI
-            delta = self.data['Close'].diff()
-            gain = delta.where(delta > 0, 0).rolling(14).mean()
-            loss = -delta.where(delta < 0, 0).rolling(14).mean()
-            rs = gain / loss
-            self.data['RSI'] = 100 - (100 / (1 + rs))
+        self.history.append(
+            market_data.get('symbol', self.symbol),
+            float(market_data.get('Close', market_data.get('price'))),
+            volume=int(market_data.get('Volume', market_data.get('volume')) or 0)
+        )
+
+    def get_series(self, symbol: Optional[str] = None) -> ChartSeries:
+        """Chart series of symbol, brought up to date with its price history"""
+        symbol = symbol or self.symbol
+        series = self.series.get(symbol)
+        if series is None:
+            series = self.series[symbol] = ChartSeries(self.history.capacity)
+        series.sync(self.history.ring(symbol))
+        return series
+
+    def chart_data(self, symbol: Optional[str] = None, points: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Charted window as arrays, LTTB-downsampled on Close to at most points rows"""
+        columns = dict(zip(CHART_COLUMNS, self.get_series(symbol).ring.views(self.window)))
+        selected = lttb(columns["timestamp"], columns["Close"], points or self.points)
+        return {name: values[selected] for name, values in columns.items()}
+
+    @property
+    def data(self) -> pd.DataFrame:
+        """Charted window of the symbol's history with indicators, at full resolution"""
+        columns = dict(zip(CHART_COLUMNS, self.get_series().ring.views(self.window)))
+        timestamp = columns.pop("timestamp")
+        return pd.DataFrame(columns, index=pd.to_datetime(timestamp, unit='ms'))
+
+    def _render_args(self, symbol: Optional[str]):
+        data = self.chart_data(symbol)
+        timestamp = data.pop("timestamp")
+        data.pop("RSI")
+        data["Price"] = data.pop("Close")
+        return ('Market Data', timestamp, {key: data[key] for key in ("Price", "MA10", "EMA10")})
             
-    def create_chart(self) -> BytesIO:
-        """Create chart using matplotlib"""
-        plt.figure(figsize=(12, 6))
-        
-        # Plot price
-        plt.plot(self.data.index, self.data['Close'], label='Price')
-        plt.plot(self.data.index, self.data['MA10'], label='MA10')
-        plt.plot(self.data.index, self.data['EMA10'], label='EMA10')
-        
-        plt.title('Market Data')
-        plt.xlabel('Time')
-        plt.ylabel('Price')
-        plt.legend()
-        
-        # Save to buffer
-        buf = BytesIO()
-        plt.savefig(buf, format='png')
-        buf.seek(0)
-        plt.close()
-        
-        return buf 
\ No newline at end of file
+    def create_chart(self, symbol: Optional[str] = None) -> BytesIO:
+        """Create chart using matplotlib in the calling thread"""
+        return BytesIO(render_chart(*self._render_args(symbol)))
+
+    async def create_chart_async(self, symbol: Optional[str] = None) -> BytesIO:
+        """Create chart in a worker process so rendering never blocks the event loop"""
+        if self._executor is None:
+            # Forking a process that runs an event loop and feed threads is unsafe
+            start_method = "forkserver" if sys.platform != "win32" else "spawn"
+            self._executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context(start_method))
+        loop = asyncio.get_running_loop()
+        png = await loop.run_in_executor(self._executor, render_chart, *self._render_args(symbol))
+        return BytesIO(png)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,235 @@
+import asyncio
+import time as _time
+import numpy as np
+import pandas as pd
+from datetime import time
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from core.logger import logger
+from trading.market_data.ring_buffer import ColumnRing
+from ws.tick_bus import TickBus
+
+TIMEFRAMES = {
+    "1s": 1_000,
+    "1m": 60_000,
+    "5m": 300_000,
+    "15m": 900_000
+}
+
+BAR_COLUMNS = {
+    "start": np.int64,   # epoch milliseconds
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "volume": np.int64,
+    "oi": np.int64,
+    "ticks": np.int64
+}
+
+_IST_OFFSET_MS = 330 * 60 * 1000
+_DAY_MS = 86_400_000
+
+# Index of each field in a partial bar list
+_START, _END, _OPEN, _HIGH, _LOW, _CLOSE, _VOLUME, _OI, _TICKS = range(9)
+
+def _ms_of_day(value: time) -> int:
+    return ((value.hour * 60 + value.minute) * 60 + value.second) * 1000
+
+class BarAggregator:
+    """
+    Builds OHLCV bars for every token and timeframe from one tick stream.
+    Bars are aligned to the session open in exchange (IST) time and never span a
+    session boundary; the last bar of a session ends at the close. Closed bars
+    go into a ColumnRing per (token, timeframe) and every bar event is published
+    on self.bus under the topic (token, timeframe) with "closed" set accordingly,
+    so strategies subscribe to bars instead of recomputing them from ticks.
+    """
+
+    def __init__(self,
+                 timeframes: Iterable[str] = ("1s", "1m", "5m", "15m"),
+                 capacity: int = 4096,
+                 session_open: time = time(9, 15),
+                 session_close: time = time(15, 30),
+                 bus: Optional[TickBus] = None,
+                 emit_partial: bool = False,
+                 price_divisor: float = 100.0):
+        """
+        :param capacity: Closed bars kept per token and timeframe
+        :param emit_partial: Also publish the updated partial bar on every tick
+        :param price_divisor: SmartAPI prices are in paise; 100 gives rupees
+        """
+        self.timeframes: List[Tuple[str, int]] = [(name, TIMEFRAMES[name]) for name in timeframes]
+        self.capacity = capacity
+        self.session_open = _ms_of_day(session_open)
+        self.session_close = _ms_of_day(session_close)
+        self.bus = bus if bus is not None else TickBus()
+        self.emit_partial = emit_partial
+        self.price_divisor = price_divisor
+
+        self.bars: Dict[Tuple[Hashable, str], ColumnRing] = {}
+        self.partial: Dict[Tuple[Hashable, str], list] = {}
+        self._closed: Dict[Tuple[Hashable, str], int] = {}  # start of the last closed bar
+        self._volume: Dict[Hashable, Tuple[int, int]] = {}  # token -> (session day, cumulative volume)
+        self.ticks = 0
+        self.out_of_session = 0
+        self.late = 0
+
+    def update(self, tick: Dict) -> List[Dict]:
+        """
+        Apply one decoded tick (SmartWebSocketV2 dict).
+        :return: Bars closed by this tick
+        """
+        timestamp = tick.get("exchange_timestamp")
+        price = tick.get("last_traded_price")
+        if not timestamp or price is None:
+            return []
+        return self.add(
+            tick.get("token"),
+            int(timestamp),
+            price / self.price_divisor,
+            cumulative_volume=tick.get("volume_trade_for_the_day"),
+            quantity=tick.get("last_traded_quantity") or 0,
+            oi=tick.get("open_interest") or 0
+        )
+
+    def add(self,
+            token: Hashable,
+            timestamp: int,
+            price: float,
+            cumulative_volume: Optional[int] = None,
+            quantity: int = 0,
+            oi: int = 0) -> List[Dict]:
+        """
+        Apply one trade.
+        :param timestamp: Exchange time in epoch milliseconds
+        :param cumulative_volume: Day volume so far; bar volume is its increase. Without it
+            the traded quantity is summed instead.
+        :return: Bars closed by this trade
+        """
+        local = timestamp + _IST_OFFSET_MS
+        day, offset = divmod(local, _DAY_MS)
+        if offset < self.session_open or offset > self.session_close:
+            self.out_of_session += 1
+            return []
+        offset = min(offset, self.session_close - 1)  # a tick stamped at the close joins the last bar
+        self.ticks += 1
+
+        volume = quantity
+        if cumulative_volume is not None:
+            last_day, last_cumulative = self._volume.get(token, (None, 0))
+            if last_day != day:
+                # First tick of the session (or since joining mid-session): no baseline yet
+                last_cumulative = 0
+                volume = quantity
+            else:
+                volume = max(int(cumulative_volume) - last_cumulative, 0)
+            self._volume[token] = (day, max(int(cumulative_volume), last_cumulative))
+
+        session_start = day * _DAY_MS + self.session_open - _IST_OFFSET_MS
+        session_end = day * _DAY_MS + self.session_close - _IST_OFFSET_MS
+        since_open = offset - self.session_open
+        closed = []
+        for name, length in self.timeframes:
+            key = (token, name)
+            start = session_start + since_open // length * length
+            bar = self.partial.get(key)
+            if bar is not None and start != bar[_START]:
+                if start < bar[_START]:
+                    self.late += 1
+                    continue
+                closed.append(self._close(key, bar))
+                bar = None
+            elif bar is None and start <= self._closed.get(key, -1):
+                # The bar was already closed (e.g. by flush); reopening it would duplicate it
+                self.late += 1
+                continue
+            if bar is None:
+                bar = self.partial[key] = [start, min(start + length, session_end), price, price, price,
+                                           price, volume, oi, 1]
+            else:
+                if price > bar[_HIGH]:
+                    bar[_HIGH] = price
+                if price < bar[_LOW]:
+                    bar[_LOW] = price
+                bar[_CLOSE] = price
+                bar[_VOLUME] += volume
+                bar[_OI] = oi
+                bar[_TICKS] += 1
+            if self.emit_partial:
+                self.bus.publish_nowait(key, self._event(key, bar, False))
+        return closed
+
+    def flush(self, now: Optional[int] = None) -> List[Dict]:
+        """
+        Close partial bars whose end has passed, so quiet tokens still get their bars.
+        :param now: Epoch milliseconds (now by default); compare against exchange time
+        """
+        now = int(_time.time() * 1000) if now is None else now
+        return [self._close(key, bar) for key, bar in list(self.partial.items()) if bar[_END] <= now]
+
+    def close_all(self) -> List[Dict]:
+        """Close every partial bar, e.g. at the end of the session"""
+        return [self._close(key, bar) for key, bar in list(self.partial.items())]
+
+    def ring(self, token: Hashable, timeframe: str) -> Optional[ColumnRing]:
+        return self.bars.get((token, timeframe))
+
+    def last(self, token: Hashable, timeframe: str, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Latest n closed bars as zero-copy column views"""
+        ring = self.bars.get((token, timeframe))
+        if ring is None:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in BAR_COLUMNS.items()}
+        return dict(zip(BAR_COLUMNS, ring.views(n)))
+
+    def frame(self, token: Hashable, timeframe: str, n: Optional[int] = None) -> pd.DataFrame:
+        """Closed bars as an OHLCV DataFrame indexed by bar start, for batch consumers"""
+        columns = self.last(token, timeframe, n)
+        start = columns.pop("start")
+        return pd.DataFrame(columns, index=pd.to_datetime(start, unit="ms"))
+
+    async def consume(self, subscription):
+        """Aggregate every tick of a TickBus subscription"""
+        async for message in subscription:
+            try:
+                self.update(message.data)
+            except Exception as e:
+                logger.error(f"Error aggregating tick for {message.topic}: {e}")
+
+    async def run_clock(self, interval: float = 1.0, delay: int = 2000):
+        """
+        Periodically close bars that received no tick after their end.
+        :param delay: Milliseconds to wait past a bar's end for late ticks
+        """
+        while True:
+            await asyncio.sleep(interval)
+            self.flush(int(_time.time() * 1000) - delay)
+
+    def _close(self, key: Tuple[Hashable, str], bar: list) -> Dict:
+        del self.partial[key]
+        self._closed[key] = bar[_START]
+        ring = self.bars.get(key)
+        if ring is None:
+            ring = self.bars[key] = ColumnRing(self.capacity, BAR_COLUMNS)
+        ring.append_row(bar[_START], bar[_OPEN], bar[_HIGH], bar[_LOW], bar[_CLOSE],
+                        bar[_VOLUME], bar[_OI], bar[_TICKS])
+        event = self._event(key, bar, True)
+        self.bus.publish_nowait(key, event)
+        return event
+
+    @staticmethod
+    def _event(key: Tuple[Hashable, str], bar: list, closed: bool) -> Dict:
+        return {
+            "token": key[0],
+            "timeframe": key[1],
+            "start": bar[_START],
+            "end": bar[_END],
+            "open": bar[_OPEN],
+            "high": bar[_HIGH],
+            "low": bar[_LOW],
+            "close": bar[_CLOSE],
+            "volume": bar[_VOLUME],
+            "oi": bar[_OI],
+            "ticks": bar[_TICKS],
+            "closed": closed
+        }
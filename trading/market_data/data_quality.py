@@ -0,0 +1,340 @@
+import time
+import weakref
+import numpy as np
+from bisect import bisect_left, insort
+from collections import deque
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, Hashable, Optional
+
+# Validation result codes; REASONS[code] names each one in counters
+OK, INVALID, OUT_OF_ORDER, STALE, CIRCUIT, SPIKE = range(6)
+REASONS = ("ok", "invalid", "out_of_order", "stale", "circuit", "spike")
+
+# MAD -> standard deviation for normally distributed prices
+MAD_SCALE = 1.4826
+
+# Every live filter, so one endpoint can export all of their counters
+_filters: "weakref.WeakSet[DataQualityFilter]" = weakref.WeakSet()
+
+def _median_abs_deviation(values: list, median: float) -> float:
+    """MAD of a sorted list, merging the deviations below and above the median outwards"""
+    n = len(values)
+    middle = (n - 1) // 2
+    low = bisect_left(values, median) - 1
+    high = low + 1
+    previous = deviation = 0.0
+    for _ in range(middle + 1 + (n % 2 == 0)):
+        previous = deviation
+        if high < n and (low < 0 or values[high] - median <= median - values[low]):
+            deviation = values[high] - median
+            high += 1
+        else:
+            deviation = median - values[low]
+            low -= 1
+    return deviation if n % 2 else (previous + deviation) / 2
+
+class _TokenState:
+    __slots__ = ("window", "ordered", "sequence", "timestamp", "upper", "lower", "pending")
+
+    def __init__(self, window: int):
+        self.window: deque = deque(maxlen=window)
+        self.ordered: list = []
+        self.sequence = 0
+        self.timestamp = 0
+        self.upper = 0.0
+        self.lower = 0.0
+        self.pending: list = []  # consecutive spike rejections, latest last
+
+    def push(self, price: float):
+        if len(self.window) == self.window.maxlen:
+            del self.ordered[bisect_left(self.ordered, self.window[0])]
+        self.window.append(price)
+        insort(self.ordered, price)
+
+    def shift(self, offset: float):
+        """Move the window to a new level, keeping its length and dispersion"""
+        prices = [price + offset for price in self.window]
+        self.window.clear()
+        self.window.extend(prices)
+        self.ordered = sorted(prices)
+
+class DataQualityFilter:
+    """
+    Streaming per-token tick validation, run before ticks reach the bus, the
+    order books or the indicators. A tick is rejected when its price is missing
+    or non-positive, its sequence number or exchange time goes backwards, it is
+    older than max_age_ms, it breaches the token's circuit limits (from SNAP_QUOTE
+    packets), or it deviates from the rolling median of recently accepted prices
+    by more than threshold robust sigmas (MAD-scaled). Each check is O(window)
+    with a small fixed window, i.e. constant per tick. When the last confirm
+    spikes agree (same side of the median, within the spike limit of each other)
+    the level is accepted as real (a gap): the window is moved to the new level,
+    so spike checks stay on with the same dispersion estimate. Disagreeing bad
+    prints keep being rejected.
+    """
+
+    def __init__(self,
+                 window: int = 31,
+                 threshold: float = 10.0,
+                 min_window: int = 10,
+                 min_deviation: float = 0.002,
+                 confirm: int = 3,
+                 max_age_ms: Optional[int] = None,
+                 price_divisor: float = 100.0,
+                 name: str = "ticks"):
+        """
+        :param window: Accepted prices per token in the rolling median/MAD
+        :param threshold: Spike limit in robust sigmas (MAD_SCALE * MAD)
+        :param min_window: Prices needed before spikes are checked
+        :param min_deviation: Deviation always allowed, as a fraction of the median,
+            so flat prices (MAD 0) do not reject the first tick that moves
+        :param confirm: Consecutive agreeing spikes after which the new level is accepted
+        :param max_age_ms: Reject ticks whose exchange time lags now by more (off by default)
+        :param price_divisor: SmartAPI prices and circuit limits are in paise; 100 gives rupees
+        :param name: Stage name in quality_snapshot (filters sharing a name are summed)
+        """
+        self.name = name
+        self.window = window
+        self.threshold = threshold
+        self.min_window = min_window
+        self.min_deviation = min_deviation
+        self.confirm = confirm
+        self.max_age_ms = max_age_ms
+        self.price_divisor = price_divisor
+        self.tokens: Dict[Hashable, _TokenState] = {}
+        self.accepted = 0
+        self.rejected = np.zeros(len(REASONS), dtype=np.int64)
+        self.rejected_by_token: Dict[Hashable, int] = {}
+        self.level_shifts = 0
+        _filters.add(self)
+
+    def check(self,
+              token: Hashable,
+              price: Optional[float],
+              timestamp: Optional[int] = None,
+              sequence: Optional[int] = None,
+              upper: Optional[float] = None,
+              lower: Optional[float] = None,
+              now: Optional[int] = None) -> int:
+        """
+        Validate one tick; accepted ticks update the token's state.
+        :param timestamp: Exchange time in epoch milliseconds
+        :param upper: Upper circuit limit, remembered for later ticks (0/None: unchanged)
+        :param now: Epoch milliseconds for the age check (now by default)
+        :return: OK or the rejection code
+        """
+        state = self.tokens.get(token)
+        if state is None:
+            state = self.tokens[token] = _TokenState(self.window)
+        if upper:
+            state.upper = upper
+        if lower:
+            state.lower = lower
+        code = self._check(state, price, timestamp, sequence, now)
+        if code:
+            return self.reject(token, code)
+        self.accepted += 1
+        if sequence:
+            state.sequence = sequence
+        if timestamp:
+            state.timestamp = timestamp
+        return OK
+
+    def reject(self, token: Hashable, code: int = INVALID) -> int:
+        """Count a rejection decided outside check, e.g. a tick that failed to parse"""
+        self.rejected[code] += 1
+        self.rejected_by_token[token] = self.rejected_by_token.get(token, 0) + 1
+        return code
+
+    def check_tick(self, tick: Dict, now: Optional[int] = None) -> int:
+        """check for a decoded SmartAPI tick dict"""
+        price = tick.get("last_traded_price")
+        return self.check(
+            tick.get("token"),
+            None if price is None else price / self.price_divisor,
+            tick.get("exchange_timestamp"),
+            tick.get("sequence_number"),
+            (tick.get("upper_circuit_limit") or 0) / self.price_divisor,
+            (tick.get("lower_circuit_limit") or 0) / self.price_divisor,
+            now
+        )
+
+    def _check(self, state: _TokenState, price, timestamp, sequence, now) -> int:
+        if price is None or not price > 0 or price == float("inf"):
+            return INVALID
+        if (sequence and sequence <= state.sequence) or (timestamp and timestamp < state.timestamp):
+            return OUT_OF_ORDER
+        if timestamp and self.max_age_ms is not None:
+            now = int(time.time() * 1000) if now is None else now
+            if now - timestamp > self.max_age_ms:
+                return STALE
+        if (state.upper and price > state.upper) or (state.lower and price < state.lower):
+            return CIRCUIT
+
+        ordered = state.ordered
+        if len(ordered) >= self.min_window:
+            n = len(ordered)
+            median = ordered[n // 2] if n % 2 else (ordered[n // 2 - 1] + ordered[n // 2]) / 2
+            limit = max(self.threshold * MAD_SCALE * _median_abs_deviation(ordered, median),
+                        self.min_deviation * median)
+            if abs(price - median) > limit:
+                pending = state.pending
+                pending.append(price)
+                del pending[:-self.confirm]
+                if len(pending) < self.confirm:
+                    return SPIKE
+                level = float(np.median(pending))
+                if not (all(p > median for p in pending) or all(p < median for p in pending)) \
+                        or any(abs(p - level) > limit for p in pending):
+                    return SPIKE
+                # The price held for confirm ticks: a real level change, not a bad print
+                self.level_shifts += 1
+                state.shift(level - median)
+                for pending_price in pending[:-1]:
+                    state.push(pending_price)
+        # Any accepted tick ends a run of spikes
+        state.pending.clear()
+        state.push(price)
+        return OK
+
+    def check_batch(self, columns: Dict[str, np.ndarray], now: Optional[int] = None) -> np.ndarray:
+        """
+        Vectorized validation of a columnar batch (ws.tick_batch.decode_frames output),
+        independent of the streaming state. Counters are not updated.
+        :return: Result code per tick
+        """
+        def column(name):
+            values = columns.get(name)
+            if values is None:
+                return None
+            values = np.asarray(values, dtype=np.float64)
+            return np.where(values == -1, np.nan, values)
+
+        prices = column("last_traded_price")
+        upper, lower = column("upper_circuit_limit"), column("lower_circuit_limit")
+        return validate_batch(
+            prices / self.price_divisor,
+            token=columns.get("token"),
+            timestamp=column("exchange_timestamp"),
+            sequence=column("sequence_number"),
+            upper=None if upper is None else upper / self.price_divisor,
+            lower=None if lower is None else lower / self.price_divisor,
+            now=now,
+            max_age_ms=self.max_age_ms,
+            window=self.window,
+            threshold=self.threshold,
+            min_window=self.min_window,
+            min_deviation=self.min_deviation
+        )
+
+    def clear(self, token: Optional[Hashable] = None):
+        """Drop per-token state, e.g. at the start of a session"""
+        if token is None:
+            self.tokens.clear()
+        else:
+            self.tokens.pop(token, None)
+
+    def snapshot(self) -> Dict:
+        """Counters for the metrics endpoint"""
+        return {
+            "accepted": self.accepted,
+            "rejected": {reason: int(count) for reason, count in zip(REASONS[1:], self.rejected[1:])},
+            "rejected_by_token": {str(token): count for token, count in self.rejected_by_token.items()},
+            "level_shifts": self.level_shifts
+        }
+
+def quality_snapshot() -> Dict[str, Dict]:
+    """Counters of every live DataQualityFilter by stage name, for the metrics endpoint"""
+    stages: Dict[str, Dict] = {}
+    for quality in list(_filters):
+        snapshot = quality.snapshot()
+        stage = stages.get(quality.name)
+        if stage is None:
+            stages[quality.name] = snapshot
+            continue
+        stage["accepted"] += snapshot["accepted"]
+        stage["level_shifts"] += snapshot["level_shifts"]
+        for key in ("rejected", "rejected_by_token"):
+            for reason, count in snapshot[key].items():
+                stage[key][reason] = stage[key].get(reason, 0) + count
+    return stages
+
+def validate_batch(price: np.ndarray,
+                   token: Optional[np.ndarray] = None,
+                   timestamp: Optional[np.ndarray] = None,
+                   sequence: Optional[np.ndarray] = None,
+                   upper: Optional[np.ndarray] = None,
+                   lower: Optional[np.ndarray] = None,
+                   now: Optional[int] = None,
+                   max_age_ms: Optional[int] = None,
+                   window: int = 31,
+                   threshold: float = 10.0,
+                   min_window: int = 10,
+                   min_deviation: float = 0.002) -> np.ndarray:
+    """
+    DataQualityFilter's checks over whole arrays in arrival order, grouped by token.
+    Missing values are NaN (or 0 for sequence/limits). Unlike the streaming filter,
+    spike windows hold every valid earlier price, spikes included, and confirmed
+    level shifts are not tracked, so results can differ after repeated spikes.
+    :return: Result code per tick (OK or a rejection code)
+    """
+    price = np.asarray(price, dtype=np.float64)
+    codes = np.zeros(price.shape, dtype=np.int8)
+    if token is None:
+        groups = [np.arange(price.size)]
+    else:
+        token = np.asarray(token)
+        order = np.argsort(token, kind="stable")
+        bounds = np.flatnonzero(token[order][1:] != token[order][:-1]) + 1
+        groups = np.split(order, bounds)
+
+    for rows in groups:
+        p = price[rows]
+        result = np.zeros(rows.size, dtype=np.int8)
+        invalid = ~(np.isfinite(p) & (p > 0))
+        result[invalid] = INVALID
+
+        # Sequence numbers must increase; exchange time must not decrease
+        for values, behind in ((sequence, np.less_equal), (timestamp, np.less)):
+            if values is None:
+                continue
+            values = np.nan_to_num(np.asarray(values, dtype=np.float64)[rows], nan=0.0)
+            seen = np.maximum.accumulate(np.where(result == OK, values, 0.0))
+            previous = np.concatenate(([0.0], seen[:-1]))
+            result[(result == OK) & (values > 0) & behind(values, previous)] = OUT_OF_ORDER
+
+        if timestamp is not None and max_age_ms is not None:
+            now = int(time.time() * 1000) if now is None else now
+            stamps = np.asarray(timestamp, dtype=np.float64)[rows]
+            result[(result == OK) & (now - stamps > max_age_ms)] = STALE
+
+        for limits, breach in ((upper, np.greater), (lower, np.less)):
+            if limits is None:
+                continue
+            limits = np.nan_to_num(np.asarray(limits, dtype=np.float64)[rows], nan=0.0)
+            # Limits carry forward from the last packet that had them
+            carried = np.maximum.accumulate(np.where(limits > 0, np.arange(rows.size), -1))
+            current = np.where(carried >= 0, limits[np.maximum(carried, 0)], 0.0)
+            result[(result == OK) & (current > 0) & breach(p, current)] = CIRCUIT
+
+        valid = np.flatnonzero(result == OK)
+        if valid.size > min_window:
+            values = p[valid]
+            windows = sliding_window_view(values, min(window, values.size - 1))[:-1]
+            start = max(min_window, windows.shape[1])
+            # Earlier ticks than a full window: use the growing prefix
+            medians = np.full(values.size, np.nan)
+            mads = np.full(values.size, np.nan)
+            for i in range(min_window, start):
+                prefix = values[:i]
+                medians[i] = np.median(prefix)
+                mads[i] = np.median(np.abs(prefix - medians[i]))
+            if start < values.size:
+                tail = windows[start - windows.shape[1]:]
+                medians[start:] = np.median(tail, axis=1)
+                mads[start:] = np.median(np.abs(tail - medians[start:, np.newaxis]), axis=1)
+            limit = np.maximum(threshold * MAD_SCALE * mads, min_deviation * medians)
+            spikes = np.abs(values - medians) > limit
+            result[valid[spikes]] = SPIKE
+        codes[rows] = result
+    return codes
@@ -0,0 +1,181 @@
+import numpy as np
+from typing import Dict, Iterable, Optional, Union
+
+from ws.tick_decoder import DEPTH_OFFSET, DEPTH_SIZE, SNAP_QUOTE, parse_token
+from ws.tick_batch import DEPTH_LEVEL_DTYPE
+
+DEPTH_LEVELS = 5
+
+# Columns of each side's (DEPTH_LEVELS x 4) array
+PRICE = 0
+QUANTITY = 1
+ORDERS = 2
+CUM_QUANTITY = 3  # quantity at this level and all better levels
+
+BID = 0
+ASK = 1
+
+class DepthBook:
+    """
+    Best-5 market depth for one token, held in two fixed 5x4 float arrays that are
+    overwritten in place on every SNAP_QUOTE. Levels are ordered best first; empty
+    levels have zero price and quantity. Queries read the arrays directly and
+    return plain floats, so nothing is allocated at tick rate.
+    """
+
+    __slots__ = ("token", "bids", "asks", "sides", "updates", "price_divisor")
+
+    def __init__(self, token: str = "", price_divisor: float = 100.0):
+        """
+        :param price_divisor: SmartAPI prices are in paise; 100 stores rupees
+        """
+        self.token = token
+        self.bids = np.zeros((DEPTH_LEVELS, 4))
+        self.asks = np.zeros((DEPTH_LEVELS, 4))
+        self.sides = (self.bids, self.asks)
+        self.updates = 0
+        self.price_divisor = price_divisor
+
+    def update_levels(self, levels: np.ndarray):
+        """
+        Update from the 10 packed depth levels of a SNAP_QUOTE (DEPTH_LEVEL_DTYPE);
+        SmartAPI sends the 5 buy levels first, then the 5 sell levels.
+        """
+        for side, start in ((self.bids, 0), (self.asks, DEPTH_LEVELS)):
+            part = levels[start:start + DEPTH_LEVELS]
+            np.divide(part["price"], self.price_divisor, out=side[:, PRICE])
+            side[:, QUANTITY] = part["quantity"]
+            side[:, ORDERS] = part["no of orders"]
+            np.cumsum(side[:, QUANTITY], out=side[:, CUM_QUANTITY])
+        self.updates += 1
+
+    def update_from_dicts(self, buy_levels: Iterable[Dict], sell_levels: Iterable[Dict]):
+        """Update from the level dicts of TickDecoder / SmartWebSocketV2"""
+        for side, levels in ((self.bids, buy_levels), (self.asks, sell_levels)):
+            side[:, :] = 0.0
+            for i, level in enumerate(list(levels)[:DEPTH_LEVELS]):
+                side[i, PRICE] = level["price"] / self.price_divisor
+                side[i, QUANTITY] = level["quantity"]
+                side[i, ORDERS] = level["no of orders"]
+            np.cumsum(side[:, QUANTITY], out=side[:, CUM_QUANTITY])
+        self.updates += 1
+
+    @property
+    def best_bid(self) -> float:
+        return float(self.bids[0, PRICE])
+
+    @property
+    def best_ask(self) -> float:
+        return float(self.asks[0, PRICE])
+
+    def is_valid(self) -> bool:
+        """Both sides have a best level and the book is not crossed"""
+        bid, ask = self.bids[0, PRICE], self.asks[0, PRICE]
+        return bool(bid > 0 and ask > 0 and ask >= bid)
+
+    def spread(self) -> float:
+        return float(self.asks[0, PRICE] - self.bids[0, PRICE]) if self.is_valid() else float("nan")
+
+    def mid(self) -> float:
+        return float((self.asks[0, PRICE] + self.bids[0, PRICE]) * 0.5) if self.is_valid() else float("nan")
+
+    def microprice(self) -> float:
+        """Top-of-book price weighted by the opposite side's size"""
+        if not self.is_valid():
+            return float("nan")
+        bid_qty, ask_qty = self.bids[0, QUANTITY], self.asks[0, QUANTITY]
+        total = bid_qty + ask_qty
+        if total <= 0:
+            return self.mid()
+        return float((self.bids[0, PRICE] * ask_qty + self.asks[0, PRICE] * bid_qty) / total)
+
+    def imbalance(self, levels: int = DEPTH_LEVELS) -> float:
+        """(bid qty - ask qty) / (bid qty + ask qty) over the top levels, in [-1, 1]"""
+        bid_qty = self.bids[levels - 1, CUM_QUANTITY]
+        ask_qty = self.asks[levels - 1, CUM_QUANTITY]
+        total = bid_qty + ask_qty
+        return float((bid_qty - ask_qty) / total) if total > 0 else 0.0
+
+    def depth_to_price(self, side: int, price: float) -> float:
+        """Cumulative quantity on side (BID/ASK) at prices at least as good as price"""
+        book = self.sides[side]
+        depth = 0.0
+        for i in range(DEPTH_LEVELS):
+            level_price = book[i, PRICE]
+            if book[i, QUANTITY] <= 0 or (level_price < price if side == BID else level_price > price):
+                break
+            depth = book[i, CUM_QUANTITY]
+        return float(depth)
+
+    def fill_price(self, side: int, quantity: float) -> float:
+        """
+        Average price for taking quantity from side (ASK for a buy, BID for a sell),
+        NaN when the visible depth is insufficient.
+        """
+        book = self.sides[side]
+        remaining = quantity
+        notional = 0.0
+        for i in range(DEPTH_LEVELS):
+            available = book[i, QUANTITY]
+            if available <= 0:
+                break
+            take = available if available < remaining else remaining
+            notional += take * book[i, PRICE]
+            remaining -= take
+            if remaining <= 0:
+                return float(notional / quantity)
+        return float("nan")
+
+    def to_dict(self) -> Dict:
+        return {
+            "token": self.token,
+            "bids": self.bids[:, :3].tolist(),
+            "asks": self.asks[:, :3].tolist(),
+            "mid": self.mid(),
+            "spread": self.spread(),
+            "imbalance": self.imbalance()
+        }
+
+class OrderBookStore:
+    """Per-token DepthBooks kept up to date from SNAP_QUOTE ticks or raw packets"""
+
+    def __init__(self, price_divisor: float = 100.0):
+        self.price_divisor = price_divisor
+        self.books: Dict[str, DepthBook] = {}
+
+    def __len__(self) -> int:
+        return len(self.books)
+
+    def __contains__(self, token: str) -> bool:
+        return token in self.books
+
+    def get(self, token: str) -> Optional[DepthBook]:
+        return self.books.get(str(token))
+
+    def book(self, token: str) -> DepthBook:
+        token = str(token)
+        book = self.books.get(token)
+        if book is None:
+            book = self.books[token] = DepthBook(token, self.price_divisor)
+        return book
+
+    def update(self, tick: Union[Dict, object]) -> Optional[DepthBook]:
+        """Apply a decoded tick (dict or Tick); ticks without depth are ignored"""
+        if isinstance(tick, dict):
+            buy, sell, token = tick.get("best_5_buy_data"), tick.get("best_5_sell_data"), tick.get("token")
+        else:
+            buy, sell, token = tick.best_5_buy_data, tick.best_5_sell_data, tick.token
+        if buy is None and sell is None:
+            return None
+        book = self.book(token)
+        book.update_from_dicts(buy or (), sell or ())
+        return book
+
+    def update_packet(self, packet: Union[bytes, bytearray, memoryview]) -> Optional[DepthBook]:
+        """Apply a raw binary packet directly, skipping the per-level dicts"""
+        view = memoryview(packet)
+        if view[0] != SNAP_QUOTE:
+            return None
+        book = self.book(parse_token(bytes(view[2:27])))
+        book.update_levels(np.frombuffer(view[DEPTH_OFFSET:DEPTH_OFFSET + DEPTH_SIZE], dtype=DEPTH_LEVEL_DTYPE))
+        return book
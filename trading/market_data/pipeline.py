@@ -3,132 +3,76 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from core.logger import logger
+from trading.market_data.streaming_indicators import IndicatorStore
+from trading.market_data.data_quality import INVALID, DataQualityFilter
+from trading.analysis.indicator_graph import indicator_cache, indicator_graph
+
+# Pipeline column -> indicator graph node
+PIPELINE_COLUMNS = {
+    'RSI': 'rsi_14',
+    'MACD': 'macd',
+    'Signal_Line': 'macd_signal',
+    'MA20': 'sma_20',
+    '20dSTD': 'std_20',
+    'Upper_Band': 'bb_upper_20',
+    'Lower_Band': 'bb_lower_20',
+    'ATR': 'atr_14',
+    'Price_Momentum': 'returns',
+    'Volatility': 'std_20',
+    'Volume_Momentum': 'volume_change'
+}
 
 class MarketDataPipeline:
     """Market data preprocessing and feature engineering pipeline"""
     
     def __init__(self):
-        self.technical_indicators = {
-            "RSI": self._calculate_rsi,
-            "MACD": self._calculate_macd,
-            "Bollinger": self._calculate_bollinger,
-            "ATR": self._calculate_atr
-        }
+        # Per-symbol streaming state; each tick updates the indicators in O(1)
+        self.indicators = IndicatorStore()
+        # Rejects bad prices before they update the streaming indicators
+        self.quality = DataQualityFilter(name="pipeline")
         
-    async def process_market_data(self, data: Dict) -> Dict:
-        """Process incoming market data"""
+    async def process_market_data(self, data: Dict) -> Optional[Dict]:
+        """Process incoming market data; None when the tick is rejected or cannot be parsed"""
         try:
-            # Convert to DataFrame for easier processing
-            df = pd.DataFrame([data])
-            
-            # Add technical indicators
-            for indicator, func in self.technical_indicators.items():
-                df = func(df)
-                
-            # Add derived features
-            df = self._add_derived_features(df)
-            
-            # Clean and validate
-            df = self._clean_data(df)
-            
-            return df.iloc[0].to_dict()
+            close = float(data['close'])
+            if self.quality.check(data.get('symbol'), close):
+                return None
+            values = self.indicators.update(
+                data.get('symbol'),
+                close,
+                float(data.get('high', close)),
+                float(data.get('low', close)),
+                float(data['volume']) if data.get('volume') is not None else None
+            )
+            return {**data, **values}
             
         except Exception as e:
+            # Unparseable ticks are dropped like rejected ones, never passed on raw
             logger.error(f"Market data processing failed: {e}")
-            return data
-
-    def _calculate_rsi(self, df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
-        """Calculate Relative Strength Index"""
-        try:
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            
-            rs = gain / loss
-            df['RSI'] = 100 - (100 / (1 + rs))
-            return df
-        except Exception as e:
-            logger.error(f"RSI calculation failed: {e}")
-            df['RSI'] = np.nan
-            return df
-
-    def _calculate_macd(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate MACD"""
-        try:
-            exp1 = df['close'].ewm(span=12, adjust=False).mean()
-            exp2 = df['close'].ewm(span=26, adjust=False).mean()
-            df['MACD'] = exp1 - exp2
-            df['Signal_Line'] = df['MACD'].ewm(span=9, adjust=False).mean()
-            return df
-        except Exception as e:
-            logger.error(f"MACD calculation failed: {e}")
-            df['MACD'] = np.nan
-            df['Signal_Line'] = np.nan
-            return df
-
-    def _calculate_bollinger(self, df: pd.DataFrame, period: int = 20) -> pd.DataFrame:
-        """Calculate Bollinger Bands"""
-        try:
-            df['MA20'] = df['close'].rolling(window=period).mean()
-            df['20dSTD'] = df['close'].rolling(window=period).std()
-            df['Upper_Band'] = df['MA20'] + (df['20dSTD'] * 2)
-            df['Lower_Band'] = df['MA20'] - (df['20dSTD'] * 2)
-            return df
-        except Exception as e:
-            logger.error(f"Bollinger Bands calculation failed: {e}")
-            return df
+            self.quality.reject(data.get('symbol'), INVALID)
+            return None
 
-    def _calculate_atr(self, df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
-        """Calculate Average True Range"""
-        try:
-            high_low = df['high'] - df['low']
-            high_close = np.abs(df['high'] - df['close'].shift())
-            low_close = np.abs(df['low'] - df['close'].shift())
-            
-            ranges = pd.concat([high_low, high_close, low_close], axis=1)
-            true_range = np.max(ranges, axis=1)
-            
-            df['ATR'] = true_range.rolling(period).mean()
-            return df
-        except Exception as e:
-            logger.error(f"ATR calculation failed: {e}")
-            df['ATR'] = np.nan
-            return df
-
-    def _add_derived_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Add derived features"""
-        try:
-            # Price momentum
-            df['Price_Momentum'] = df['close'].pct_change()
-            
-            # Volatility
-            df['Volatility'] = df['close'].rolling(window=20).std()
-            
-            # Volume momentum
-            df['Volume_Momentum'] = df['volume'].pct_change()
-            
-            return df
-        except Exception as e:
-            logger.error(f"Derived features calculation failed: {e}")
-            return df
+    def initialize(self, symbol: str, history: pd.DataFrame) -> Dict:
+        """Warm up a symbol's streaming indicators from historical bars (close, optional high/low/volume)"""
+        self.indicators.sets.pop(symbol, None)
+        return self.indicators.get(symbol).initialize(
+            history['close'].to_numpy(dtype=float),
+            history['high'].to_numpy(dtype=float) if 'high' in history else None,
+            history['low'].to_numpy(dtype=float) if 'low' in history else None,
+            history['volume'].to_numpy(dtype=float) if 'volume' in history else None
+        )
 
-    def _clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Clean and validate data"""
-        try:
-            # Remove duplicates
-            df = df.drop_duplicates()
-            
-            # Handle missing values
-            df = df.fillna(method='ffill')
-            
-            # Remove outliers
-            for col in ['close', 'volume']:
-                if col in df.columns:
-                    mean = df[col].mean()
-                    std = df[col].std()
-                    df[col] = df[col].clip(mean - 3*std, mean + 3*std)
-                    
-            return df
-        except Exception as e:
-            logger.error(f"Data cleaning failed: {e}")
-            return df 
\ No newline at end of file
+    def calculate_indicators(self, df: pd.DataFrame, symbol: Optional[str] = None) -> pd.DataFrame:
+        """
+        Batch version of process_market_data over a history DataFrame, one graph evaluation
+        :param symbol: Shares the indicator_cache memo with other consumers of this symbol's bars
+        """
+        df = df.copy()
+        features = set(PIPELINE_COLUMNS.values())
+        if symbol is None:
+            results = indicator_graph.compute(df, features)
+        else:
+            results = indicator_cache.compute(symbol, df, features)
+        for column, node in PIPELINE_COLUMNS.items():
+            df[column] = results[node]
+        return df
@@ -0,0 +1,181 @@
+import time
+import numpy as np
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+DEFAULT_CAPACITY = 65536
+
+class Window(NamedTuple):
+    """Read-only views over a contiguous run of a PriceRing, oldest first"""
+    timestamp: np.ndarray  # epoch milliseconds
+    price: np.ndarray
+    volume: np.ndarray
+    oi: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+class ColumnRing:
+    """
+    Fixed-capacity set of equally long typed columns.
+    Every column is preallocated at twice the capacity and each value is written
+    at both i and i + capacity, so the latest n rows are always one contiguous
+    slice: reads are zero-copy views and memory never grows.
+    """
+
+    def __init__(self, capacity: int, dtypes: Dict[str, np.dtype]):
+        self.capacity = capacity
+        self.columns: Dict[str, np.ndarray] = {name: np.zeros(2 * capacity, dtype=dtype)
+                                               for name, dtype in dtypes.items()}
+        self._arrays = tuple(self.columns.values())
+        self.head = 0       # next write position in [0, capacity)
+        self.count = 0      # rows retained
+        self.appended = 0   # rows ever appended, lets readers find what is new
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self._arrays)
+
+    def append_row(self, *values):
+        """Append one row, values in column order"""
+        head, mirror = self.head, self.head + self.capacity
+        for column, value in zip(self._arrays, values):
+            column[head] = column[mirror] = value
+        self.head = (head + 1) % self.capacity
+        self.appended += 1
+        if self.count < self.capacity:
+            self.count += 1
+
+    def extend_rows(self, *columns: Sequence):
+        """Vectorized append of many rows, one sequence per column in column order"""
+        columns = [np.asarray(values) for values in columns]
+        n = columns[0].size
+        if n == 0:
+            return
+        self.appended += n
+        if n > self.capacity:  # only the newest capacity rows survive
+            columns = [values[-self.capacity:] for values in columns]
+            self.head = (self.head + n - self.capacity) % self.capacity
+            n = self.capacity
+        positions = (self.head + np.arange(n)) % self.capacity
+        for target, values in zip(self._arrays, columns):
+            target[positions] = values
+            target[positions + self.capacity] = values
+        self.head = (self.head + n) % self.capacity
+        self.count = min(self.count + n, self.capacity)
+
+    def clear(self):
+        self.head = self.count = self.appended = 0
+
+    def bounds(self, n: Optional[int] = None) -> Tuple[int, int]:
+        """Slice bounds of the latest n rows (all retained rows by default)"""
+        n = self.count if n is None else max(min(n, self.count), 0)
+        end = self.head + self.capacity if self.count == self.capacity else self.head
+        return end - n, end
+
+    def views(self, n: Optional[int] = None) -> Tuple[np.ndarray, ...]:
+        """Read-only views of the latest n rows, one per column"""
+        start, end = self.bounds(n)
+        views = []
+        for column in self._arrays:
+            view = column[start:end]
+            view.flags.writeable = False
+            views.append(view)
+        return tuple(views)
+
+class PriceRing(ColumnRing):
+    """
+    Fixed-capacity history of (timestamp, price, volume, oi) for one symbol.
+    Timestamps are expected in non-decreasing order for time-based queries.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        super().__init__(capacity, {
+            "timestamp": np.int64,
+            "price": np.float64,
+            "volume": np.int64,
+            "oi": np.int64
+        })
+        self.timestamp, self.price, self.volume, self.oi = self._arrays
+
+    def append(self, price: float, timestamp: Optional[int] = None, volume: int = 0, oi: int = 0):
+        """
+        :param timestamp: Epoch milliseconds (now by default)
+        """
+        self.append_row(int(time.time() * 1000) if timestamp is None else timestamp, price, volume, oi)
+
+    def extend(self,
+               price: Sequence[float],
+               timestamp: Sequence[int],
+               volume: Optional[Sequence[int]] = None,
+               oi: Optional[Sequence[int]] = None):
+        """Vectorized append of many values in time order"""
+        price = np.asarray(price, dtype=np.float64)
+        n = price.size
+        self.extend_rows(
+            np.asarray(timestamp, dtype=np.int64),
+            price,
+            np.zeros(n, np.int64) if volume is None else np.asarray(volume, dtype=np.int64),
+            np.zeros(n, np.int64) if oi is None else np.asarray(oi, dtype=np.int64)
+        )
+
+    def last(self, n: Optional[int] = None) -> Window:
+        """The latest n values (all retained values by default) as views"""
+        return Window(*self.views(n))
+
+    def since(self, start: int) -> Window:
+        """Values with timestamp >= start (epoch milliseconds)"""
+        window = self.last()
+        offset = int(np.searchsorted(window.timestamp, start, side="left"))
+        return Window(*(column[offset:] for column in window))
+
+    def between(self, start: int, end: int) -> Window:
+        """Values with start <= timestamp < end (epoch milliseconds)"""
+        window = self.last()
+        low, high = np.searchsorted(window.timestamp, (start, end), side="left")
+        return Window(*(column[low:high] for column in window))
+
+    def latest_price(self) -> Optional[float]:
+        return float(self.price[self.head - 1]) if self.count else None
+
+class PriceHistoryStore:
+    """PriceRing per symbol, all with the same capacity"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.rings: Dict[str, PriceRing] = {}
+
+    def __len__(self) -> int:
+        return len(self.rings)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.rings
+
+    def symbols(self) -> List[str]:
+        return list(self.rings)
+
+    def get(self, symbol: str) -> Optional[PriceRing]:
+        return self.rings.get(symbol)
+
+    def ring(self, symbol: str) -> PriceRing:
+        ring = self.rings.get(symbol)
+        if ring is None:
+            ring = self.rings[symbol] = PriceRing(self.capacity)
+        return ring
+
+    def append(self, symbol: str, price: float, timestamp: Optional[int] = None, volume: int = 0, oi: int = 0):
+        self.ring(symbol).append(price, timestamp, volume, oi)
+
+    def last(self, symbol: str, n: Optional[int] = None) -> Window:
+        return self.ring(symbol).last(n)
+
+    def since(self, symbol: str, start: int) -> Window:
+        return self.ring(symbol).since(start)
+
+    def nbytes(self) -> int:
+        return sum(ring.nbytes for ring in self.rings.values())
+
+# Shared per-symbol history for the trading engine, charts and analyzers
+price_history = PriceHistoryStore()
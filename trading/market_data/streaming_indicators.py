@@ -0,0 +1,283 @@
+import math
+from collections import deque
+from typing import Dict, Iterable, Optional
+
+NAN = float("nan")
+
+class StreamingIndicator:
+    """
+    Base class for incremental indicators.
+    update() consumes one observation in O(1) and returns the current value
+    (NaN until enough observations have been seen); initialize() replays history.
+    """
+
+    value: float = NAN
+
+    @property
+    def ready(self) -> bool:
+        return not math.isnan(self.value)
+
+    def update(self, x: float) -> float:
+        raise NotImplementedError
+
+    def initialize(self, history: Iterable[float]) -> float:
+        """Warm up from historical observations; returns the latest value"""
+        for x in history:
+            self.update(x)
+        return self.value
+
+class SMA(StreamingIndicator):
+    """Simple moving average, same as pandas rolling(period).mean()"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window = deque(maxlen=period)
+        self.total = 0.0
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        if len(self.window) == self.period:
+            self.total -= self.window[0]
+        self.window.append(x)
+        self.total += x
+        self.value = self.total / self.period if len(self.window) == self.period else NAN
+        return self.value
+
+class EMA(StreamingIndicator):
+    """Exponential moving average, same as pandas ewm(span=period, adjust=False).mean()"""
+
+    def __init__(self, period: Optional[int] = None, alpha: Optional[float] = None):
+        self.alpha = alpha if alpha is not None else 2.0 / (period + 1)
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        self.value = x if math.isnan(self.value) else self.value + self.alpha * (x - self.value)
+        return self.value
+
+class WilderAverage(StreamingIndicator):
+    """Wilder smoothing: SMA seed over the first period values, then alpha = 1/period"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.count = 0
+        self.total = 0.0
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        self.count += 1
+        if self.count < self.period:
+            self.total += x
+        elif self.count == self.period:
+            self.value = (self.total + x) / self.period
+        else:
+            self.value += (x - self.value) / self.period
+        return self.value
+
+class RSI(StreamingIndicator):
+    """Wilder RSI over price changes"""
+
+    def __init__(self, period: int = 14):
+        self.gain = WilderAverage(period)
+        self.loss = WilderAverage(period)
+        self.previous = NAN
+        self.value = NAN
+
+    def update(self, price: float) -> float:
+        if not math.isnan(self.previous):
+            change = price - self.previous
+            gain = self.gain.update(change if change > 0 else 0.0)
+            loss = self.loss.update(-change if change < 0 else 0.0)
+            if not math.isnan(gain):
+                self.value = 100.0 if loss == 0 else 100.0 - 100.0 / (1.0 + gain / loss)
+        self.previous = price
+        return self.value
+
+class MACD(StreamingIndicator):
+    """MACD line, signal line and histogram from adjust=False EMAs"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal_ema = EMA(signal)
+        self.value = NAN
+        self.signal = NAN
+        self.histogram = NAN
+
+    def update(self, price: float) -> float:
+        self.value = self.fast.update(price) - self.slow.update(price)
+        self.signal = self.signal_ema.update(self.value)
+        self.histogram = self.value - self.signal
+        return self.value
+
+class RollingStats(StreamingIndicator):
+    """
+    Windowed mean and sample standard deviation via Welford's update with
+    removal; std matches pandas rolling(period).std() (ddof=1).
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.value = NAN
+        self.std = NAN
+
+    def update(self, x: float) -> float:
+        window = self.window
+        if len(window) == self.period:
+            old = window.popleft()
+            window.append(x)
+            old_mean = self.mean
+            self.mean += (x - old) / self.period
+            self.m2 += (x - old) * (x - self.mean + old - old_mean)
+        else:
+            window.append(x)
+            delta = x - self.mean
+            self.mean += delta / len(window)
+            self.m2 += delta * (x - self.mean)
+
+        if len(window) == self.period:
+            self.value = self.mean
+            self.std = math.sqrt(max(self.m2, 0.0) / (self.period - 1)) if self.period > 1 else 0.0
+        return self.value
+
+class Bollinger(RollingStats):
+    """Bollinger bands around the rolling mean"""
+
+    def __init__(self, period: int = 20, width: float = 2.0):
+        super().__init__(period)
+        self.width = width
+
+    @property
+    def upper(self) -> float:
+        return self.value + self.width * self.std
+
+    @property
+    def lower(self) -> float:
+        return self.value - self.width * self.std
+
+class ATR(StreamingIndicator):
+    """Average True Range with Wilder smoothing; update takes (high, low, close)"""
+
+    def __init__(self, period: int = 14):
+        self.average = WilderAverage(period)
+        self.previous_close = NAN
+        self.value = NAN
+
+    def update(self, high: float, low: float = None, close: float = None) -> float:
+        low = high if low is None else low
+        close = high if close is None else close
+        true_range = high - low
+        if not math.isnan(self.previous_close):
+            true_range = max(true_range, abs(high - self.previous_close), abs(low - self.previous_close))
+        self.previous_close = close
+        self.value = self.average.update(true_range)
+        return self.value
+
+    def initialize(self, history: Iterable) -> float:
+        """history: iterable of (high, low, close)"""
+        for high, low, close in history:
+            self.update(high, low, close)
+        return self.value
+
+class RollingExtreme(StreamingIndicator):
+    """Rolling max (or min) over the last period observations using a monotonic deque"""
+
+    def __init__(self, period: int, mode: str = "max"):
+        self.period = period
+        self.is_max = mode == "max"
+        self.candidates = deque()  # (index, value), values monotonic from the front
+        self.count = 0
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        candidates = self.candidates
+        if self.is_max:
+            while candidates and candidates[-1][1] <= x:
+                candidates.pop()
+        else:
+            while candidates and candidates[-1][1] >= x:
+                candidates.pop()
+        candidates.append((self.count, x))
+        if candidates[0][0] <= self.count - self.period:
+            candidates.popleft()
+        self.count += 1
+        self.value = candidates[0][1] if self.count >= self.period else NAN
+        return self.value
+
+class IndicatorSet:
+    """
+    The pipeline's standard indicators for one symbol, all updated in O(1) per tick.
+    Output keys follow MarketDataPipeline's column names.
+    """
+
+    def __init__(self):
+        self.rsi = RSI(14)
+        self.macd = MACD(12, 26, 9)
+        self.bollinger = Bollinger(20, 2.0)
+        self.atr = ATR(14)
+        self.sma10 = SMA(10)
+        self.ema10 = EMA(10)
+        self.high = RollingExtreme(20, "max")
+        self.low = RollingExtreme(20, "min")
+        self.last_close = NAN
+        self.last_volume = NAN
+        self.values: Dict[str, float] = {}
+
+    def update(self, close: float, high: Optional[float] = None, low: Optional[float] = None,
+               volume: Optional[float] = None) -> Dict[str, float]:
+        high = close if high is None else high
+        low = close if low is None else low
+        self.bollinger.update(close)
+        values = {
+            "RSI": self.rsi.update(close),
+            "MACD": self.macd.update(close),
+            "Signal_Line": self.macd.signal,
+            "MA20": self.bollinger.value,
+            "20dSTD": self.bollinger.std,
+            "Upper_Band": self.bollinger.upper,
+            "Lower_Band": self.bollinger.lower,
+            "ATR": self.atr.update(high, low, close),
+            "MA10": self.sma10.update(close),
+            "EMA10": self.ema10.update(close),
+            "High20": self.high.update(high),
+            "Low20": self.low.update(low),
+            "Price_Momentum": close / self.last_close - 1.0 if self.last_close else NAN,
+            "Volatility": self.bollinger.std,
+            "Volume_Momentum": (volume / self.last_volume - 1.0
+                                if volume is not None and self.last_volume else NAN),
+        }
+        self.last_close = close
+        if volume is not None:
+            self.last_volume = volume
+        self.values = values
+        return values
+
+    def initialize(self, closes: Iterable[float], highs: Optional[Iterable[float]] = None,
+                   lows: Optional[Iterable[float]] = None,
+                   volumes: Optional[Iterable[float]] = None) -> Dict[str, float]:
+        """Warm up from history bars; returns the latest values"""
+        closes = list(closes)
+        highs = list(highs) if highs is not None else closes
+        lows = list(lows) if lows is not None else closes
+        volumes = list(volumes) if volumes is not None else [None] * len(closes)
+        for close, high, low, volume in zip(closes, highs, lows, volumes):
+            self.update(close, high, low, volume)
+        return self.values
+
+class IndicatorStore:
+    """IndicatorSet per symbol"""
+
+    def __init__(self):
+        self.sets: Dict[str, IndicatorSet] = {}
+
+    def get(self, symbol: str) -> IndicatorSet:
+        indicators = self.sets.get(symbol)
+        if indicators is None:
+            indicators = self.sets[symbol] = IndicatorSet()
+        return indicators
+
+    def update(self, symbol: str, close: float, high: Optional[float] = None,
+               low: Optional[float] = None, volume: Optional[float] = None) -> Dict[str, float]:
+        return self.get(symbol).update(close, high, low, volume)
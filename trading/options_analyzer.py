@@ -1,15 +1,17 @@
 from typing import Dict, Optional
 import pandas as pd
-import numpy as np
-from scipy.stats import norm
 from datetime import datetime, timedelta
 from core.logger import logger
+from trading.analysis.greeks_calculator import GreeksCalculator
+from trading.analysis.greeks_cache import GreeksCache
 
 class OptionsAnalyzer:
-    def __init__(self):
+    def __init__(self, greeks_cache: Optional[GreeksCache] = None):
         self.current_chain = None
         self.spot_price = None
         self.risk_free_rate = 0.05
+        # Pass a GreeksCache to reuse prices across repeated chain requests
+        self.greeks_calculator = greeks_cache or GreeksCalculator()
 
     def analyze_chain(self, chain_data: pd.DataFrame, spot_price: float) -> Dict:
         """Analyze full options chain"""
@@ -40,24 +42,16 @@ class OptionsAnalyzer:
             days_to_expiry = (expiry - datetime.now()).days
             t = days_to_expiry / 365
             
-            for idx, row in chain.iterrows():
-                S = self.spot_price  # Current spot price
-                K = row['strike']    # Strike price
-                r = self.risk_free_rate
-                σ = row['iv'] / 100  # Implied volatility
-                
-                d1 = (np.log(S/K) + (r + σ**2/2)*t) / (σ*np.sqrt(t))
-                d2 = d1 - σ*np.sqrt(t)
-                
-                if row['type'] == 'CE':
-                    chain.loc[idx, 'delta'] = norm.cdf(d1)
-                    chain.loc[idx, 'theta'] = (-S*σ*norm.pdf(d1))/(2*np.sqrt(t))
-                else:  # PE
-                    chain.loc[idx, 'delta'] = -norm.cdf(-d1)
-                    chain.loc[idx, 'theta'] = (-S*σ*norm.pdf(d1))/(2*np.sqrt(t))
-                    
-                chain.loc[idx, 'gamma'] = norm.pdf(d1)/(S*σ*np.sqrt(t))
-                chain.loc[idx, 'vega'] = S*np.sqrt(t)*norm.pdf(d1)
+            greeks = self.greeks_calculator.calculate_greeks_batch(
+                spot_price=self.spot_price,
+                strike_price=chain['strike'].to_numpy(),
+                time_to_expiry=t,
+                volatility=chain['iv'].to_numpy() / 100,  # Implied volatility
+                risk_free_rate=self.risk_free_rate,
+                is_call=(chain['type'] == 'CE').to_numpy()
+            )
+            for name in ('delta', 'gamma', 'theta', 'vega'):
+                chain[name] = greeks[name]
             
             return chain.to_dict('records')
             
@@ -0,0 +1,224 @@
+import numpy as np
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, Optional, Sequence, Tuple
+from trading.analysis.greeks_calculator import GreeksCalculator
+from core.logger import logger
+
+# Per-leg fields accepted by ScenarioEngine
+LEG_FIELDS = ("spot", "strike", "time_to_expiry", "volatility", "is_call", "quantity")
+# Aggregated per-scenario outputs
+CUBE_FIELDS = ("pnl", "delta", "gamma", "vega")
+
+def trade_leg(trade, spot: Optional[float] = None) -> Optional[Dict]:
+    """
+    Scenario leg of an option order, or None for orders without option fields.
+    Reads strike, option_type (CE/PE), time_to_expiry (years) or expiry (datetime),
+    volatility or iv (decimal, or percent when above 1) and spot from the trade;
+    quantity is negative for sells.
+    :param spot: Underlying price when the trade does not carry one
+    """
+    strike = getattr(trade, "strike", None)
+    option_type = str(getattr(trade, "option_type", "") or "").upper()
+    volatility = getattr(trade, "volatility", None) or getattr(trade, "iv", None)
+    time_to_expiry = getattr(trade, "time_to_expiry", None)
+    if time_to_expiry is None and getattr(trade, "expiry", None) is not None:
+        time_to_expiry = (trade.expiry - datetime.now()).total_seconds() / (365 * 86400)
+    spot = getattr(trade, "spot", None) or spot
+    if None in (strike, volatility, time_to_expiry, spot) or option_type not in ("CE", "PE", "CALL", "PUT"):
+        return None
+    quantity = abs(float(trade.quantity))
+    return {
+        "spot": float(spot),
+        "strike": float(strike),
+        "time_to_expiry": max(float(time_to_expiry), 0.0),
+        "volatility": float(volatility) / 100 if float(volatility) > 1 else float(volatility),
+        "is_call": option_type in ("CE", "CALL"),
+        "quantity": -quantity if str(trade.side).upper() == "SELL" else quantity
+    }
+
+def trade_underlying(trade) -> Optional[str]:
+    """Underlying of an order: its underlying field, else its symbol"""
+    return getattr(trade, "underlying", None) or getattr(trade, "symbol", None)
+
+def contract_key(trade, leg: Dict) -> Tuple:
+    """(underlying, strike, is_call, expiry date) identifying the contract of an option order"""
+    expiry = getattr(trade, "expiry", None)
+    if expiry is None:
+        expiry = datetime.now() + timedelta(days=leg["time_to_expiry"] * 365)
+    return (trade_underlying(trade), leg["strike"], leg["is_call"], expiry.date())
+
+class ScenarioEngine:
+    """
+    Portfolio stress grid: spot shocks x vol shocks x time decay.
+    Every leg is repriced under every scenario in one broadcast NumPy call and
+    the per-leg results are kept, so changing one position only reprices that
+    leg and adjusts the aggregate cubes by the difference.
+    """
+
+    def __init__(self,
+                 spot_shocks: Optional[Sequence[float]] = None,
+                 vol_shocks: Optional[Sequence[float]] = None,
+                 days_forward: Sequence[float] = (0.0,),
+                 risk_free_rate: float = 0.065,
+                 calculator: Optional[GreeksCalculator] = None):
+        """
+        :param spot_shocks: Relative spot moves, default -10%..+10% in 0.5% steps
+        :param vol_shocks: Absolute vol shifts, default -5..+5 vol points in 1 point steps
+        :param days_forward: Calendar days of time decay per scenario slice
+        :param risk_free_rate: Rate used for repricing
+        """
+        self.spot_shocks = np.asarray(
+            spot_shocks if spot_shocks is not None else np.round(np.arange(-0.10, 0.1001, 0.005), 4),
+            dtype=np.float64
+        )
+        self.vol_shocks = np.asarray(
+            vol_shocks if vol_shocks is not None else np.linspace(-0.05, 0.05, 11),
+            dtype=np.float64
+        )
+        self.days_forward = np.asarray(days_forward, dtype=np.float64)
+        self.risk_free_rate = risk_free_rate
+        self.calculator = calculator or GreeksCalculator()
+
+        self.legs: Dict[str, np.ndarray] = {name: np.empty(0) for name in LEG_FIELDS}
+        self._leg_cubes: Dict[str, np.ndarray] = {
+            name: np.empty((0,) + self.grid_shape) for name in CUBE_FIELDS
+        }
+        self._totals: Dict[str, np.ndarray] = {name: np.zeros(self.grid_shape) for name in CUBE_FIELDS}
+        # Contract key -> leg index of positions booked through book()
+        self.contracts: Dict[Hashable, int] = {}
+
+    @property
+    def grid_shape(self):
+        return (self.spot_shocks.size, self.vol_shocks.size, self.days_forward.size)
+
+    @property
+    def leg_count(self) -> int:
+        return self.legs["quantity"].size
+
+    def set_positions(self, spot, strike, time_to_expiry, volatility, is_call, quantity):
+        """Replace the whole book and revalue it under every scenario"""
+        legs = dict(zip(LEG_FIELDS, (spot, strike, time_to_expiry, volatility, is_call, quantity)))
+        self.legs = self._as_leg_arrays(legs, np.broadcast(*legs.values()).shape)
+        self.contracts = {}
+        self._leg_cubes = self._value_legs(self.legs)
+        self._totals = {name: cube.sum(axis=0) for name, cube in self._leg_cubes.items()}
+
+    def add_position(self, **leg) -> int:
+        """Append one leg and fold it into the aggregate cubes; returns its index"""
+        new_leg = self._as_leg_arrays(leg, (1,))
+        cubes = self._value_legs(new_leg)
+        for name in LEG_FIELDS:
+            self.legs[name] = np.concatenate([self.legs[name], new_leg[name]])
+        for name in CUBE_FIELDS:
+            self._leg_cubes[name] = np.concatenate([self._leg_cubes[name], cubes[name]])
+            self._totals[name] += cubes[name][0]
+        return self.leg_count - 1
+
+    def update_position(self, index: int, **changes):
+        """Change fields of one leg (e.g. quantity or volatility) and reprice only that leg"""
+        leg = {name: self.legs[name][index:index + 1].copy() for name in LEG_FIELDS}
+        for name, value in changes.items():
+            if name not in LEG_FIELDS:
+                raise ValueError(f"Unknown position field: {name}")
+            leg[name][0] = value
+        cubes = self._value_legs(leg)
+        for name in LEG_FIELDS:
+            self.legs[name][index] = leg[name][0]
+        for name in CUBE_FIELDS:
+            self._totals[name] += cubes[name][0] - self._leg_cubes[name][index]
+            self._leg_cubes[name][index] = cubes[name][0]
+
+    def book(self, key: Hashable, **leg) -> Optional[int]:
+        """
+        Book a filled leg, netting it against the open position in the same contract:
+        the position is repriced at the fill's spot/vol/time and removed once flat.
+        :param key: Contract identity, e.g. contract_key(trade, leg)
+        :return: Index of the position, None when the fill closed it
+        """
+        index = self.contracts.get(key)
+        if index is None:
+            self.contracts[key] = index = self.add_position(**leg)
+            return index
+        quantity = float(self.legs["quantity"][index]) + float(leg["quantity"])
+        if abs(quantity) < 1e-9:
+            self.remove_position(index)
+            return None
+        self.update_position(index, **dict(leg, quantity=quantity))
+        return index
+
+    def remove_position(self, index: int):
+        """Drop one leg and subtract its contribution"""
+        self.contracts = {key: i - (i > index) for key, i in self.contracts.items() if i != index}
+        for name in CUBE_FIELDS:
+            self._totals[name] -= self._leg_cubes[name][index]
+            self._leg_cubes[name] = np.delete(self._leg_cubes[name], index, axis=0)
+        for name in LEG_FIELDS:
+            self.legs[name] = np.delete(self.legs[name], index)
+
+    def cube(self, name: str = "pnl") -> np.ndarray:
+        """Aggregated (spot x vol x time) cube for pnl, delta, gamma or vega"""
+        return self._totals[name]
+
+    def what_if(self, **leg) -> np.ndarray:
+        """P&L cube of the book plus a hypothetical leg, without changing the book"""
+        return self._totals["pnl"] + self._value_legs(self._as_leg_arrays(leg, (1,)))["pnl"][0]
+
+    def allows(self, leg: Dict, max_loss: float) -> bool:
+        """
+        Whether adding leg keeps the book's worst loss within max_loss, or at least
+        does not make it worse (so hedges pass while the book is over the limit)
+        """
+        with_leg = self.worst_loss(self.what_if(**leg))
+        return with_leg <= max_loss or with_leg <= self.worst_loss()
+
+    def worst_loss(self, pnl_cube: Optional[np.ndarray] = None) -> float:
+        """Largest loss across all scenarios (positive number, 0 if none lose)"""
+        pnl_cube = self._totals["pnl"] if pnl_cube is None else pnl_cube
+        return float(max(-pnl_cube.min(), 0.0)) if pnl_cube.size else 0.0
+
+    def worst_scenario(self) -> Dict[str, float]:
+        """Shock combination producing the worst P&L"""
+        i, j, k = np.unravel_index(np.argmin(self._totals["pnl"]), self.grid_shape)
+        return {
+            "spot_shock": float(self.spot_shocks[i]),
+            "vol_shock": float(self.vol_shocks[j]),
+            "days_forward": float(self.days_forward[k]),
+            "pnl": float(self._totals["pnl"][i, j, k])
+        }
+
+    def _as_leg_arrays(self, legs: Dict, shape) -> Dict[str, np.ndarray]:
+        missing = set(LEG_FIELDS) - set(legs)
+        if missing:
+            raise ValueError(f"Missing position fields: {sorted(missing)}")
+        return {
+            name: np.broadcast_to(
+                np.asarray(legs[name], dtype=bool if name == "is_call" else np.float64), shape
+            ).copy()
+            for name in LEG_FIELDS
+        }
+
+    def _value_legs(self, legs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Per-leg cubes of shape (legs, spot, vol, time) in a single broadcast pass"""
+        as_cube = lambda a: a[:, None, None, None]
+        spot = as_cube(legs["spot"]) * (1.0 + self.spot_shocks[None, :, None, None])
+        vol = as_cube(legs["volatility"]) + self.vol_shocks[None, None, :, None]
+        tte = np.maximum(as_cube(legs["time_to_expiry"]) - self.days_forward[None, None, None, :] / 365.0, 0.0)
+        strike, is_call, quantity = (as_cube(legs[name]) for name in ("strike", "is_call", "quantity"))
+
+        base = self.calculator.calculate_option_price_batch(
+            legs["spot"], legs["strike"], legs["time_to_expiry"],
+            legs["volatility"], self.risk_free_rate, legs["is_call"]
+        )
+        greeks = self.calculator.calculate_greeks_batch(
+            spot, strike, tte, vol, self.risk_free_rate, is_call, include_price=True
+        )
+        prices = greeks["price"]
+        if not np.isfinite(prices).all():
+            logger.warning("Scenario repricing produced non-finite values")
+
+        return {
+            "pnl": quantity * (prices - as_cube(base)),
+            "delta": quantity * greeks["delta"],
+            "gamma": quantity * greeks["gamma"],
+            "vega": quantity * greeks["vega"]
+        }
@@ -8,6 +8,8 @@ import json
 
 import websocket
 
+from ws.tick_decoder import TickDecoder, parse_token, parse_best_5
+
 
 class SmartWebSocketV2(object):
     """
@@ -51,6 +53,10 @@ class SmartWebSocketV2(object):
     wsapp = None
     input_request_dict = {}
     current_retry_attempt = 0
+    # Set TickDecoder(as_object=True) to receive Tick objects instead of dicts
+    tick_decoder = TickDecoder()
+    # Set a ws.tick_batch.TickBatcher to decode binary frames in bulk instead of per packet
+    tick_batcher = None
 
     def __init__(self, auth_token, api_key, client_code, feed_token):
         """
@@ -91,6 +97,9 @@ class SmartWebSocketV2(object):
     def _on_data(self, wsapp, data, data_type, continue_flag):
 
         if data_type == 2:
+            if self.tick_batcher is not None:
+                self.tick_batcher.add(data)
+                return
             parsed_message = self._parse_binary_data(data)
             self.on_data(wsapp, parsed_message)
         else:
@@ -296,42 +305,7 @@ class SmartWebSocketV2(object):
 
     def _parse_binary_data(self, binary_data):
         try:
-            parsed_data = {
-                "subscription_mode": self._unpack_data(binary_data, 0, 1, byte_format="B")[0],
-                "exchange_type": self._unpack_data(binary_data, 1, 2, byte_format="B")[0],
-                "token": SmartWebSocketV2._parse_token_value(binary_data[2:27]),
-                "sequence_number": self._unpack_data(binary_data, 27, 35, byte_format="q")[0],
-                "exchange_timestamp": self._unpack_data(binary_data, 35, 43, byte_format="q")[0],
-                "last_traded_price": self._unpack_data(binary_data, 43, 51, byte_format="q")[0]
-            }
-
-            parsed_data["subscription_mode_val"] = self.SUBSCRIPTION_MODE_MAP.get(parsed_data["subscription_mode"])
-
-            if parsed_data["subscription_mode"] in [self.QUOTE, self.SNAP_QUOTE]:
-                parsed_data["last_traded_quantity"] = self._unpack_data(binary_data, 51, 59, byte_format="q")[0]
-                parsed_data["average_traded_price"] = self._unpack_data(binary_data, 59, 67, byte_format="q")[0]
-                parsed_data["volume_trade_for_the_day"] = self._unpack_data(binary_data, 67, 75, byte_format="q")[0]
-                parsed_data["total_buy_quantity"] = self._unpack_data(binary_data, 75, 83, byte_format="d")[0]
-                parsed_data["total_sell_quantity"] = self._unpack_data(binary_data, 83, 91, byte_format="d")[0]
-                parsed_data["open_price_of_the_day"] = self._unpack_data(binary_data, 91, 99, byte_format="q")[0]
-                parsed_data["high_price_of_the_day"] = self._unpack_data(binary_data, 99, 107, byte_format="q")[0]
-                parsed_data["low_price_of_the_day"] = self._unpack_data(binary_data, 107, 115, byte_format="q")[0]
-                parsed_data["closed_price"] = self._unpack_data(binary_data, 115, 123, byte_format="q")[0]
-
-            if parsed_data["subscription_mode"] == self.SNAP_QUOTE:
-                parsed_data["last_traded_timestamp"] = self._unpack_data(binary_data, 123, 131, byte_format="q")[0]
-                parsed_data["open_interest"] = self._unpack_data(binary_data, 131, 139, byte_format="q")[0]
-                parsed_data["open_interest_change_percentage"] = \
-                    self._unpack_data(binary_data, 139, 147, byte_format="q")[0]
-                parsed_data["upper_circuit_limit"] = self._unpack_data(binary_data, 347, 355, byte_format="q")[0]
-                parsed_data["lower_circuit_limit"] = self._unpack_data(binary_data, 355, 363, byte_format="q")[0]
-                parsed_data["52_week_high_price"] = self._unpack_data(binary_data, 363, 371, byte_format="q")[0]
-                parsed_data["52_week_low_price"] = self._unpack_data(binary_data, 371, 379, byte_format="q")[0]
-                best_5_buy_and_sell_data = self._parse_best_5_buy_and_sell_data(binary_data[147:347])
-                parsed_data["best_5_buy_data"] = best_5_buy_and_sell_data["best_5_buy_data"]
-                parsed_data["best_5_sell_data"] = best_5_buy_and_sell_data["best_5_sell_data"]
-
-            return parsed_data
+            return self.tick_decoder.decode(binary_data)
         except Exception as e:
             raise e
 
@@ -340,58 +314,14 @@ class SmartWebSocketV2(object):
             Unpack Binary Data to the integer according to the specified byte_format.
             This function returns the tuple
         """
-        return struct.unpack(self.LITTLE_ENDIAN_BYTE_ORDER + byte_format, binary_data[start:end])
-
-   
-
-    """@staticmethod
-    def _parse_token_value(binary_packet):
-        token = ""
-        for i in range(len(binary_packet)):
-            if binary_packet[i] == b'\x00':
-                return token
-            token += binary_packet[i].encode("UTF-8")
-        return token"""
+        return struct.unpack_from(self.LITTLE_ENDIAN_BYTE_ORDER + byte_format, binary_data, start)
 
     @staticmethod
     def _parse_token_value(binary_packet):
-        token = ""
-        for i in range(len(binary_packet)):
-            if chr(binary_packet[i]) == '\x00':
-                return token
-            token += chr(binary_packet[i])
-        return token
-   
+        return parse_token(bytes(binary_packet))
 
     def _parse_best_5_buy_and_sell_data(self, binary_data):
-
-        def split_packets(binary_packets):
-            packets = []
-
-            i = 0
-            while i < len(binary_packets):
-                packets.append(binary_packets[i: i+20])
-                i += 20
-            return packets
-
-        best_5_buy_sell_packets = split_packets(binary_data)
-
-        best_5_buy_data = []
-        best_5_sell_data = []
-
-        for packet in best_5_buy_sell_packets:
-            each_data = {
-                "flag": self._unpack_data(packet, 0, 2, byte_format="H")[0],
-                "quantity": self._unpack_data(packet, 2, 10, byte_format="q")[0],
-                "price": self._unpack_data(packet, 10, 18, byte_format="q")[0],
-                "no of orders": self._unpack_data(packet, 18, 20, byte_format="H")[0]
-            }
-
-            if each_data["flag"] == 0:
-                best_5_buy_data.append(each_data)
-            else:
-                best_5_sell_data.append(each_data)
-
+        best_5_buy_data, best_5_sell_data = parse_best_5(binary_data)
         return {
             "best_5_buy_data": best_5_buy_data,
             "best_5_sell_data": best_5_sell_data
@@ -0,0 +1,235 @@
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Dict, List, Optional, Union
+
+import websockets
+
+from core.logger import logger
+from ws.tick_decoder import TickDecoder, Tick
+from ws.subscription_manager import SubscriptionRegistry
+from ws.feed_metrics import FeedMetrics
+
+def log_task_errors(task: asyncio.Task, name: str) -> asyncio.Task:
+    """Log the exception that ends a background task, which would otherwise pass silently"""
+    def done(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"{name} task failed: {task.exception()!r}")
+    task.add_done_callback(done)
+    return task
+
+class AsyncSmartWebSocket:
+    """
+    asyncio-native SmartAPI WebSocket V2 client.
+    Speaks the same subscribe/heartbeat/binary protocol as SmartWebSocketV2 but
+    reads frames in a coroutine on the caller's event loop, so decoded ticks are
+    handed over through an asyncio.Queue without a thread hop. Reconnects with
+    exponential backoff and replays all subscriptions, in the fewest frames,
+    before anything else after every reconnect.
+    """
+
+    ROOT_URI = "wss://smartapisocket.angelone.in/smart-stream"
+    HEART_BEAT_MESSAGE = "ping"
+    HEART_BEAT_INTERVAL = 30
+    RECONNECT_DELAY = 1
+    MAX_RECONNECT_DELAY = 60
+
+    # Available Actions
+    SUBSCRIBE_ACTION = 1
+    UNSUBSCRIBE_ACTION = 0
+
+    # Subscription Modes
+    LTP_MODE = 1
+    QUOTE = 2
+    SNAP_QUOTE = 3
+
+    # Exchange Types
+    NSE_CM = 1
+    NSE_FO = 2
+    BSE_CM = 3
+    BSE_FO = 4
+    MCX_FO = 5
+    NCX_FO = 7
+    CDE_FO = 13
+
+    def __init__(self,
+                 auth_token: str,
+                 api_key: str,
+                 client_code: str,
+                 feed_token: str,
+                 uri: Optional[str] = None,
+                 queue_size: int = 10000,
+                 max_retries: Optional[int] = None,
+                 decoder: Optional[TickDecoder] = None):
+        """
+        :param uri: Override ROOT_URI (e.g. a local feed simulator)
+        :param queue_size: Bound of the tick queue; the oldest tick is dropped when full
+        :param max_retries: Consecutive failed connects before giving up (None retries forever)
+        :param decoder: TickDecoder used for binary frames
+        """
+        self.auth_token = auth_token
+        self.api_key = api_key
+        self.client_code = client_code
+        self.feed_token = feed_token
+        self.uri = uri or self.ROOT_URI
+        self.max_retries = max_retries
+        self.decoder = decoder or TickDecoder()
+
+        # (perf_counter_ns at receive, tick) pairs; consume with get() or async for
+        self.ticks: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.connected = asyncio.Event()
+        self.metrics = FeedMetrics()
+        self.reconnect_count = 0
+        # Replayed on every reconnect
+        self.subscriptions = SubscriptionRegistry()
+
+        self._ws = None
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": self.auth_token,
+            "x-api-key": self.api_key,
+            "x-client-code": self.client_code,
+            "x-feed-token": self.feed_token
+        }
+
+    def start(self) -> asyncio.Task:
+        """Run the connection loop as a background task on the current loop"""
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._task = log_task_errors(asyncio.create_task(self.run()), "Websocket connection")
+        return self._task
+
+    async def run(self):
+        """Connect, resubscribe and read until close() is called"""
+        delay = self.RECONNECT_DELAY
+        failures = 0
+        while not self._closing:
+            try:
+                async with websockets.connect(self.uri, additional_headers=self.headers,
+                                              ping_interval=None) as ws:
+                    self._ws = ws
+                    delay = self.RECONNECT_DELAY
+                    failures = 0
+                    await self._resubscribe()
+                    self.connected.set()
+                    logger.info("Async SmartAPI websocket connected")
+                    heartbeat = log_task_errors(asyncio.create_task(self._heartbeat()), "Websocket heartbeat")
+                    try:
+                        await self._read(ws)
+                    finally:
+                        heartbeat.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                failures += 1
+                logger.error(f"Async websocket connection error: {e}")
+            finally:
+                self._ws = None
+                self.connected.clear()
+
+            if self._closing:
+                break
+            if self.max_retries is not None and failures >= self.max_retries:
+                logger.error(f"Giving up after {failures} failed connection attempts")
+                break
+            self.reconnect_count += 1
+            logger.info(f"Reconnecting in {delay}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.MAX_RECONNECT_DELAY)
+
+    async def close(self):
+        """Stop reconnecting and close the socket"""
+        self._closing = True
+        if self._ws is not None:
+            await self._ws.close()
+        if self._task is not None:
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def subscribe(self, correlation_id: str, mode: int, token_list: List[Dict]):
+        """
+        Subscribe tokens; only tokens not already subscribed are sent, and they
+        are remembered and replayed after reconnects.
+        :param token_list: [{"exchangeType": 2, "tokens": ["43650", ...]}, ...]
+        """
+        added = self.subscriptions.add(mode, token_list)
+        await self._send_request(self.SUBSCRIBE_ACTION, mode, added, correlation_id)
+
+    async def unsubscribe(self, correlation_id: str, mode: int, token_list: List[Dict]):
+        """Unsubscribe tokens and forget them for future reconnects"""
+        removed = self.subscriptions.remove(mode, token_list)
+        await self._send_request(self.UNSUBSCRIBE_ACTION, mode, removed, correlation_id)
+
+    async def set_subscriptions(self, correlation_id: str, mode: int, exchange_type: int, tokens: List[str]):
+        """Make tokens the full set for (mode, exchange_type), sending only the diff"""
+        added, removed = self.subscriptions.update(mode, exchange_type, tokens)
+        await self._send_request(self.UNSUBSCRIBE_ACTION, mode, removed, correlation_id)
+        await self._send_request(self.SUBSCRIBE_ACTION, mode, added, correlation_id)
+
+    @property
+    def dropped_ticks(self) -> int:
+        return self.metrics.dropped
+
+    async def get(self) -> Union[Dict, Tick]:
+        """Next decoded tick; records its receive->dispatch latency"""
+        received_ns, tick = await self.ticks.get()
+        self.metrics.record_dispatch(received_ns)
+        return tick
+
+    async def __aiter__(self) -> AsyncIterator[Union[Dict, Tick]]:
+        while True:
+            yield await self.get()
+
+    async def _send_request(self, action: int, mode: int, token_list: List[Dict],
+                            correlation_id: Optional[str] = None):
+        """Send now if connected, in request-sized chunks; otherwise the subscription goes out on connect"""
+        if self._ws is None or not token_list:
+            return
+        for chunk in self.subscriptions.chunk(token_list):
+            await self._ws.send(self._request(action, mode, chunk, correlation_id))
+
+    async def _resubscribe(self):
+        frames = [self._request(self.SUBSCRIBE_ACTION, mode, chunk) for mode, chunk in self.subscriptions.snapshot()]
+        for frame in frames:
+            await self._ws.send(frame)
+
+    @staticmethod
+    def _request(action: int, mode: int, token_list: List[Dict], correlation_id: Optional[str] = None) -> str:
+        request_data = {
+            "action": action,
+            "params": {"mode": mode, "tokenList": token_list}
+        }
+        if correlation_id is not None:
+            request_data["correlationID"] = correlation_id
+        return json.dumps(request_data)
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.HEART_BEAT_INTERVAL)
+            await self._ws.send(self.HEART_BEAT_MESSAGE)
+
+    async def _read(self, ws):
+        async for message in ws:
+            if isinstance(message, bytes):
+                try:
+                    received_ns = time.perf_counter_ns()
+                    tick = self.decoder.decode(message)
+                    self.metrics.record_tick(tick)
+                    self._put(tick, received_ns)
+                except Exception as e:
+                    logger.error(f"Error decoding tick: {e}")
+            elif message != "pong":
+                logger.debug(f"Websocket text message: {message}")
+
+    def _put(self, tick: Union[Dict, Tick], received_ns: Optional[int] = None):
+        """Enqueue without blocking the reader, dropping the oldest tick when full"""
+        if self.ticks.full():
+            self.ticks.get_nowait()
+            self.metrics.dropped += 1
+        self.ticks.put_nowait((received_ns or time.perf_counter_ns(), tick))
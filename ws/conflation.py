@@ -0,0 +1,120 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Set
+
+from core.logger import logger
+from ws.tick_bus import Subscription
+
+Snapshot = Dict[Hashable, Dict[str, Any]]
+
+class ConflatedConsumer:
+    """A consumer that receives coalesced snapshots of the tokens changed since its last delivery"""
+
+    def __init__(self,
+                 conflator: "Conflator",
+                 name: str,
+                 callback: Callable[[Snapshot], Awaitable[None]],
+                 interval: float):
+        self.conflator = conflator
+        self.name = name
+        self.callback = callback
+        self.interval = interval
+        self.deliveries = 0
+        # Bounded by the number of tokens, not by the tick rate
+        self._dirty: Set[Hashable] = set()
+
+    def mark(self, token: Hashable):
+        self._dirty.add(token)
+
+    def snapshot(self) -> Snapshot:
+        """Latest state of every token updated since the previous snapshot"""
+        dirty, self._dirty = self._dirty, set()
+        return {token: self.conflator.get(token) for token in dirty}
+
+    async def run(self):
+        """Deliver a snapshot every interval seconds while there is something new"""
+        while True:
+            await asyncio.sleep(self.interval)
+            if not self._dirty:
+                continue
+            try:
+                await self.callback(self.snapshot())
+                self.deliveries += 1
+            except Exception as e:
+                logger.error(f"Error delivering conflated snapshot to {self.name}: {e}")
+
+class Conflator:
+    """
+    Latest-value store for market data.
+    Field-level updates are merged into one state dict per token; consumers
+    pull coalesced snapshots at their own cadence (e.g. 4 Hz UI, 1 Hz bots),
+    so memory stays proportional to the number of tokens however fast ticks arrive.
+    """
+
+    def __init__(self, fields: Optional[Iterable[str]] = None):
+        """
+        :param fields: Only keep these tick fields (all fields by default)
+        """
+        self.fields = None if fields is None else frozenset(fields)
+        self.updates = 0
+        self._state: Dict[Hashable, Dict[str, Any]] = {}
+        self._consumers: Dict[str, ConflatedConsumer] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def update(self, token: Hashable, fields: Dict[str, Any]):
+        """Merge a (possibly partial) update into the token's state"""
+        if self.fields is not None:
+            fields = {k: v for k, v in fields.items() if k in self.fields}
+        state = self._state.get(token)
+        if state is None:
+            self._state[token] = dict(fields)
+        else:
+            state.update(fields)
+        self.updates += 1
+        for consumer in self._consumers.values():
+            consumer.mark(token)
+
+    def get(self, token: Hashable) -> Optional[Dict[str, Any]]:
+        """Copy of the token's latest state"""
+        state = self._state.get(token)
+        return dict(state) if state is not None else None
+
+    def tokens(self):
+        return list(self._state)
+
+    def add_consumer(self,
+                     name: str,
+                     callback: Callable[[Snapshot], Awaitable[None]],
+                     hz: float = 1.0) -> ConflatedConsumer:
+        """
+        Register a consumer delivered at hz snapshots per second.
+        Starts immediately when called from a running event loop.
+        """
+        consumer = ConflatedConsumer(self, name, callback, 1.0 / hz)
+        self._consumers[name] = consumer
+        try:
+            self._tasks[name] = asyncio.get_running_loop().create_task(consumer.run())
+        except RuntimeError:
+            pass  # no running loop; call start() later
+        return consumer
+
+    def remove_consumer(self, name: str):
+        self._consumers.pop(name, None)
+        task = self._tasks.pop(name, None)
+        if task is not None:
+            task.cancel()
+
+    def start(self):
+        """Start delivery tasks for consumers registered outside the event loop"""
+        for name, consumer in self._consumers.items():
+            if name not in self._tasks:
+                self._tasks[name] = asyncio.create_task(consumer.run())
+
+    def stop(self):
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+    async def consume(self, subscription: Subscription):
+        """Merge every dict message of a TickBus subscription into the store, keyed by topic"""
+        async for message in subscription:
+            self.update(message.topic, message.data)
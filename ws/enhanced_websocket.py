@@ -4,6 +4,8 @@ import json
 from typing import Optional, Dict, Any
 from websocket import WebSocketApp
 from core.logger import logger
+from ws.feed_metrics import FeedMetrics
+from ws.async_smart_websocket import log_task_errors
 import os
 from backend.database.websocket_service import WebSocketDBService
 
@@ -18,6 +20,7 @@ class EnhancedSmartWebSocket(SmartWebSocketV2):
             "data_coherence": 1.0,
             "latency": 0
         }
+        self.feed_metrics = FeedMetrics()
         # Create DB service but don't initialize yet
         self.db = WebSocketDBService(
             f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}"
@@ -27,6 +30,9 @@ class EnhancedSmartWebSocket(SmartWebSocketV2):
     async def initialize(self):
         """Async initialization method"""
         await self.db.init_pool()
+        self._persist_task = log_task_errors(
+            asyncio.create_task(self.feed_metrics.persist(self.db, self.client_code)), "Feed metrics persistence"
+        )
         return self
 
     @classmethod
@@ -56,6 +62,7 @@ class EnhancedSmartWebSocket(SmartWebSocketV2):
             
             if data_type == 2:  # Binary data
                 parsed_data = self._parse_binary_data(data)
+                self.feed_metrics.record_tick(parsed_data)
                 self._analyze_data_coherence(parsed_data)
                 self.on_data(wsapp, parsed_data)
             else:
@@ -86,5 +93,5 @@ class EnhancedSmartWebSocket(SmartWebSocketV2):
         return {
             "connection_health": self.health_metrics["connection_stability"],
             "data_quality": self.health_metrics["data_coherence"],
-            "system_latency": self.health_metrics["latency"]
+            "system_latency": self.feed_metrics.health_metrics()["latency"]
         } 
\ No newline at end of file
@@ -0,0 +1,264 @@
+import asyncio
+import time
+import numpy as np
+from datetime import datetime, timezone
+from typing import Dict, Hashable, List, Optional, Sequence
+
+from core.logger import logger
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of non-negative integer values (microseconds).
+    Values below 2 * SUB_BUCKETS are exact; above that every power of two is split
+    into SUB_BUCKETS linear buckets (~6% relative error). Memory is fixed at
+    BUCKET_COUNT counters regardless of how many values are recorded.
+    """
+
+    SUB_BUCKETS = 16
+    MAX_BIT_LENGTH = 40  # ~12.7 days in microseconds; larger values are clamped
+    BUCKET_COUNT = 2 * SUB_BUCKETS + (MAX_BIT_LENGTH - 5) * SUB_BUCKETS
+
+    def __init__(self):
+        self.counts = np.zeros(self.BUCKET_COUNT, dtype=np.int64)
+        self.total = 0
+        self.sum = 0
+        self.min = None
+        self.max = None
+
+    def record(self, value: int):
+        """Scalar fast path for per-tick recording; same buckets as record_many"""
+        value = min(max(int(value), 0), (1 << self.MAX_BIT_LENGTH) - 1)
+        self.counts[self._scalar_bucket(value)] += 1
+        self.total += 1
+        self.sum += value
+        self.min = value if self.min is None or value < self.min else self.min
+        self.max = value if self.max is None or value > self.max else self.max
+
+    def record_many(self, values: np.ndarray):
+        values = np.clip(np.asarray(values, dtype=np.int64), 0, (1 << self.MAX_BIT_LENGTH) - 1)
+        if values.size == 0:
+            return
+        np.add.at(self.counts, self._bucket(values), 1)
+        self.total += values.size
+        self.sum += int(values.sum())
+        low, high = int(values.min()), int(values.max())
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (0..100)"""
+        if self.total == 0:
+            return 0.0
+        rank = max(int(np.ceil(q / 100.0 * self.total)), 1)
+        bucket = int(np.searchsorted(np.cumsum(self.counts), rank))
+        return float(min(self._upper_bound(bucket), self.max))
+
+    def merge(self, other: "LatencyHistogram"):
+        self.counts += other.counts
+        self.total += other.total
+        self.sum += other.sum
+        for name, pick in (("min", min), ("max", max)):
+            mine, theirs = getattr(self, name), getattr(other, name)
+            setattr(self, name, theirs if mine is None else mine if theirs is None else pick(mine, theirs))
+
+    def reset(self):
+        self.counts[:] = 0
+        self.total = self.sum = 0
+        self.min = self.max = None
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.total,
+            "mean": self.sum / self.total if self.total else 0.0,
+            "min": float(self.min or 0),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+            "max": float(self.max or 0)
+        }
+
+    @classmethod
+    def _bucket(cls, values: np.ndarray) -> np.ndarray:
+        bit_length = np.frexp(values.astype(np.float64))[1]
+        shift = np.maximum(bit_length - 5, 0)
+        buckets = cls.SUB_BUCKETS * shift + (values >> shift)
+        return np.where(values < 2 * cls.SUB_BUCKETS, values, buckets)
+
+    @classmethod
+    def _scalar_bucket(cls, value: int) -> int:
+        if value < 2 * cls.SUB_BUCKETS:
+            return value
+        shift = value.bit_length() - 5
+        return cls.SUB_BUCKETS * shift + (value >> shift)
+
+    @classmethod
+    def _upper_bound(cls, bucket: int) -> int:
+        if bucket < 2 * cls.SUB_BUCKETS:
+            return bucket
+        shift, mantissa = divmod(bucket - 2 * cls.SUB_BUCKETS, cls.SUB_BUCKETS)
+        return ((mantissa + cls.SUB_BUCKETS + 1) << (shift + 1)) - 1
+
+class FeedMetrics:
+    """
+    Tick feed instrumentation: per-token sequence gaps and duplicates, plus
+    exchange->receive and receive->dispatch latency histograms.
+    """
+
+    def __init__(self):
+        self.exchange_to_receive = LatencyHistogram()
+        self.receive_to_dispatch = LatencyHistogram()
+        self.last_sequence: Dict[Hashable, int] = {}
+        self.packets = 0
+        self.gaps = 0            # gap events
+        self.missing = 0         # packets skipped over by gaps
+        self.duplicates = 0
+        self.out_of_order = 0
+        self.clock_skew = 0      # exchange timestamps ahead of the local clock
+        self.dropped = 0         # packets discarded locally (e.g. full queues)
+        self.started_at = time.time()
+
+    def record_tick(self, tick, received_at: Optional[float] = None):
+        """
+        Record one decoded tick (dict or Tick).
+        :param received_at: Wall-clock receive time in seconds (now by default)
+        """
+        get = tick.get if isinstance(tick, dict) else lambda name: getattr(tick, name, None)
+        token = int(get("token"))
+        sequence = get("sequence_number") or 0
+        received_us = int((time.time() if received_at is None else received_at) * 1e6)
+        latency = received_us - (get("exchange_timestamp") or 0) * 1000
+        if latency < 0:
+            self.clock_skew += 1
+        else:
+            self.exchange_to_receive.record(latency)
+        self.packets += 1
+
+        previous = self.last_sequence.get(token)
+        if previous is None or sequence > previous:
+            self.last_sequence[token] = sequence
+        if previous is None:
+            return
+        step = sequence - previous
+        if step > 1:
+            self.gaps += 1
+            self.missing += step - 1
+        elif step == 0:
+            self.duplicates += 1
+        elif step < 0:
+            self.out_of_order += 1
+
+    def record_batch(self,
+                     tokens: Sequence,
+                     sequence_numbers: Sequence,
+                     exchange_timestamps: Sequence,
+                     received_at: Optional[float] = None):
+        """
+        Record a batch in arrival order, e.g. the columns from ws.tick_batch.decode_frames.
+        :param exchange_timestamps: Epoch milliseconds
+        """
+        tokens = np.asarray(tokens, dtype=np.int64)
+        sequences = np.asarray(sequence_numbers, dtype=np.int64)
+        if tokens.size == 0:
+            return
+        received_us = int((time.time() if received_at is None else received_at) * 1e6)
+        latency = received_us - np.asarray(exchange_timestamps, dtype=np.int64) * 1000
+        self.clock_skew += int((latency < 0).sum())
+        self.exchange_to_receive.record_many(latency[latency >= 0])
+        self.packets += tokens.size
+        self._check_sequences(tokens, sequences)
+
+    def record_dispatch(self, received_ns: int, dispatched_ns: Optional[int] = None):
+        """Record receive->dispatch latency from time.perf_counter_ns() stamps"""
+        dispatched_ns = time.perf_counter_ns() if dispatched_ns is None else dispatched_ns
+        self.receive_to_dispatch.record((dispatched_ns - received_ns) // 1000)
+
+    def snapshot(self) -> Dict:
+        """Counters and latency percentiles (microseconds)"""
+        return {
+            "packets": self.packets,
+            "tokens": len(self.last_sequence),
+            "gaps": self.gaps,
+            "missing": self.missing,
+            "duplicates": self.duplicates,
+            "out_of_order": self.out_of_order,
+            "dropped": self.dropped,
+            "clock_skew": self.clock_skew,
+            "uptime": time.time() - self.started_at,
+            "exchange_to_receive_us": self.exchange_to_receive.summary(),
+            "receive_to_dispatch_us": self.receive_to_dispatch.summary()
+        }
+
+    def health_metrics(self) -> Dict[str, float]:
+        """Row for WebSocketDBService.update_health_metrics"""
+        expected = self.packets + self.missing
+        return {
+            "connection_stability": 1.0 - self.missing / expected if expected else 1.0,
+            "data_coherence": 1.0 - (self.duplicates + self.out_of_order) / self.packets if self.packets else 1.0,
+            "latency": int(self.exchange_to_receive.percentile(99) // 1000),  # p99 in ms
+            "error_count": self.gaps + self.duplicates + self.out_of_order + self.dropped
+        }
+
+    def reset(self):
+        """Clear counters and histograms; sequence state is kept"""
+        self.exchange_to_receive.reset()
+        self.receive_to_dispatch.reset()
+        self.packets = self.gaps = self.missing = self.duplicates = 0
+        self.out_of_order = self.clock_skew = self.dropped = 0
+        self.started_at = time.time()
+
+    async def persist(self,
+                      db,
+                      connection_id: str,
+                      sample_interval: float = 5.0,
+                      batch_size: int = 12):
+        """
+        Sample health_metrics every sample_interval seconds and write them to
+        WebSocketDBService in batches of batch_size rows, each with its sample time.
+        """
+        pending: List[Dict] = []
+        while True:
+            await asyncio.sleep(sample_interval)
+            pending.append(dict(self.health_metrics(), timestamp=datetime.now(timezone.utc)))
+            if len(pending) < batch_size:
+                continue
+            try:
+                await db.update_health_metrics_batch(connection_id, pending)
+                pending = []
+            except Exception as e:
+                logger.error(f"Error persisting feed metrics: {e}")
+                pending = pending[-batch_size:]
+
+    def _check_sequences(self, tokens: np.ndarray, sequences: np.ndarray):
+        """
+        Vectorized per-token check of each packet against the highest sequence
+        number seen so far for its token.
+        """
+        order = np.argsort(tokens, kind="stable")
+        tokens, sequences = tokens[order], sequences[order]
+        first = np.r_[True, tokens[1:] != tokens[:-1]]
+        group = np.cumsum(first) - 1
+        starts = np.flatnonzero(first)
+
+        prior = np.array([self.last_sequence.get(t, np.iinfo(np.int64).min)
+                          for t in tokens[starts].tolist()], dtype=np.int64)
+        # Segmented running maximum: offset every group above the previous one
+        base = sequences.min()
+        span = int(sequences.max() - base) + 1
+        high_water = np.maximum.accumulate((sequences - base) + group * span) - group * span + base
+        previous = np.empty_like(sequences)
+        previous[1:] = high_water[:-1]
+        previous[starts] = prior
+        previous[~first] = np.maximum(previous[~first], prior[group[~first]])
+
+        known = previous != np.iinfo(np.int64).min
+        step = sequences[known] - previous[known]
+        gaps = step > 1
+        self.gaps += int(gaps.sum())
+        self.missing += int((step[gaps] - 1).sum())
+        self.duplicates += int((step == 0).sum())
+        self.out_of_order += int((step < 0).sum())
+
+        ends = np.r_[starts[1:], tokens.size] - 1
+        latest = np.maximum(high_water[ends], prior)
+        self.last_sequence.update(zip(tokens[starts].tolist(), latest.tolist()))
@@ -0,0 +1,311 @@
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import websockets
+
+from core.logger import logger
+from ws.tick_decoder import QUOTE, SNAP_QUOTE, encode_tick
+
+class FeedSimulator:
+    """
+    Local stand-in for the SmartAPI smart-stream endpoint.
+    Speaks the SmartWebSocketV2 protocol (JSON subscribe/unsubscribe, "ping" ->
+    "pong") and streams valid LTP/QUOTE/SNAP_QUOTE binary frames for the
+    subscribed tokens, either synthetic random-walk ticks or a replay of
+    recorded ticks. Rate bursts, sequence gaps and disconnects can be injected.
+    """
+
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 tick_rate: float = 1000.0,
+                 burst_profile: Sequence[Tuple[float, float]] = ((1.0, 1.0),),
+                 gap_probability: float = 0.0,
+                 disconnect_every: Optional[float] = None,
+                 replay: Optional[np.ndarray] = None,
+                 replay_speed: Optional[float] = None,
+                 seed: int = 0):
+        """
+        :param tick_rate: Ticks per second per connection (synthetic mode)
+        :param burst_profile: Repeating (seconds, rate multiplier) phases
+        :param gap_probability: Chance that a tick skips 1-5 sequence numbers
+        :param disconnect_every: Close each connection after this many seconds
+        :param replay: Recorded ticks (database.tick_journal TICK_RECORD_DTYPE) to send instead
+        :param replay_speed: Replay speed vs recorded timestamps (None sends as fast as possible)
+        """
+        self.host = host
+        self.port = port
+        self.tick_rate = tick_rate
+        self.burst_profile = list(burst_profile)
+        self.gap_probability = gap_probability
+        self.disconnect_every = disconnect_every
+        self.replay = replay
+        self.replay_speed = replay_speed
+        self.random = random.Random(seed)
+
+        self.sent = 0
+        self.connections = 0
+        self.disconnect_times: List[float] = []
+        self.requests: List[Dict] = []
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._prices: Dict[str, float] = {}
+        self._sequences: Dict[str, int] = {}
+
+    @property
+    def uri(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def start(self):
+        self._server = await websockets.serve(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Feed simulator listening on {self.uri}")
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def start_in_thread(self) -> "FeedSimulator":
+        """Serve from a background thread with its own event loop, so the simulator
+        does not compete with the client under test for the caller's loop"""
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        def serve():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start())
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=serve, name="feed-simulator", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop_thread(self):
+        if self._thread is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._thread = self._loop = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    def rate_multiplier(self, elapsed: float) -> float:
+        """Burst profile multiplier at elapsed seconds into a connection"""
+        cycle = sum(duration for duration, _ in self.burst_profile)
+        position = elapsed % cycle if cycle > 0 else 0.0
+        for duration, multiplier in self.burst_profile:
+            if position < duration:
+                return multiplier
+            position -= duration
+        return self.burst_profile[-1][1]
+
+    def next_tick(self, token: str, mode: int, exchange_type: int = 2) -> bytes:
+        """Encode the next synthetic tick of token in mode"""
+        sequence = self._sequences.get(token, 0) + 1
+        if self.gap_probability and self.random.random() < self.gap_probability:
+            sequence += self.random.randint(1, 5)
+        self._sequences[token] = sequence
+
+        price = self._prices.get(token) or self.random.uniform(100.0, 50000.0)
+        price = max(price * (1.0 + self.random.gauss(0.0, 0.0005)), 0.05)
+        self._prices[token] = price
+        paise = int(round(price * 100))
+        tick = {
+            "subscription_mode": mode,
+            "exchange_type": exchange_type,
+            "token": token,
+            "sequence_number": sequence,
+            "exchange_timestamp": int(time.time() * 1000),
+            "last_traded_price": paise,
+        }
+        if mode >= QUOTE:
+            tick.update({
+                "last_traded_quantity": 25,
+                "average_traded_price": paise,
+                "volume_trade_for_the_day": sequence * 100,
+                "total_buy_quantity": float(sequence * 250),
+                "total_sell_quantity": float(sequence * 240),
+                "open_price_of_the_day": paise,
+                "high_price_of_the_day": paise,
+                "low_price_of_the_day": paise,
+                "closed_price": paise,
+            })
+        if mode == SNAP_QUOTE:
+            size = 25 * (1 + int(self.random.random() * 100))
+            tick.update({
+                "last_traded_timestamp": tick["exchange_timestamp"] // 1000,
+                "open_interest": sequence * 75,
+                "best_5_buy_data": [
+                    {"flag": 0, "quantity": size * (i + 1), "price": paise - 5 * (i + 1), "no of orders": i + 1}
+                    for i in range(5)
+                ],
+                "best_5_sell_data": [
+                    {"flag": 1, "quantity": size * (5 - i), "price": paise + 5 * (i + 1), "no of orders": 5 - i}
+                    for i in range(5)
+                ],
+            })
+        return encode_tick(tick)
+
+    async def _handle(self, ws):
+        self.connections += 1
+        subscriptions: Dict[str, Tuple[int, int]] = {}  # token -> (mode, exchange type)
+        sender = asyncio.create_task(
+            self._replay(ws, subscriptions) if self.replay is not None else self._stream(ws, subscriptions)
+        )
+        try:
+            async for message in ws:
+                if message == "ping":
+                    await ws.send("pong")
+                    continue
+                request = json.loads(message)
+                self.requests.append(request)
+                params = request.get("params", {})
+                for entry in params.get("tokenList", []):
+                    for token in entry["tokens"]:
+                        if request.get("action") == 1:
+                            subscriptions[str(token)] = (params["mode"], entry["exchangeType"])
+                        else:
+                            subscriptions.pop(str(token), None)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            sender.cancel()
+
+    async def _stream(self, ws, subscriptions: Dict[str, Tuple[int, int]]):
+        """Send synthetic ticks round-robin over subscribed tokens at the profiled rate"""
+        started = last = time.monotonic()
+        slice_seconds = 0.005
+        owed = 0.0
+        index = 0
+        try:
+            while True:
+                await asyncio.sleep(slice_seconds)
+                now = time.monotonic()
+                elapsed = now - started
+                if self.disconnect_every is not None and elapsed >= self.disconnect_every:
+                    self.disconnect_times.append(time.perf_counter())
+                    await ws.close()
+                    return
+                if not subscriptions:
+                    continue
+                # Accrue by actual elapsed time so slow iterations do not lower the rate
+                owed += self.tick_rate * self.rate_multiplier(elapsed) * (now - last)
+                last = now
+                tokens = list(subscriptions)
+                frames = []
+                while owed >= 1.0:
+                    token = tokens[index % len(tokens)]
+                    mode, exchange_type = subscriptions[token]
+                    frames.append(self.next_tick(token, mode, exchange_type))
+                    index += 1
+                    owed -= 1.0
+                for frame in frames:
+                    await ws.send(frame)
+                self.sent += len(frames)
+        except websockets.ConnectionClosed:
+            pass
+
+    async def _replay(self, ws, subscriptions: Dict[str, Tuple[int, int]]):
+        """Send recorded ticks in timestamp order for subscribed tokens"""
+        records = self.replay
+        try:
+            while not subscriptions:
+                await asyncio.sleep(0.001)
+            started = time.monotonic()
+            first_timestamp = int(records["exchange_timestamp"][0]) if records.size else 0
+            for record in records:
+                token = str(int(record["token"]))
+                if token not in subscriptions:
+                    continue
+                if self.replay_speed:
+                    due = (int(record["exchange_timestamp"]) - first_timestamp) / 1000.0 / self.replay_speed
+                    delay = due - (time.monotonic() - started)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                mode = int(record["subscription_mode"]) or subscriptions[token][0]
+                await ws.send(encode_tick({
+                    "subscription_mode": mode,
+                    "exchange_type": int(record["exchange_type"]) or subscriptions[token][1],
+                    "token": token,
+                    "sequence_number": int(record["sequence_number"]),
+                    "exchange_timestamp": int(record["exchange_timestamp"]),
+                    "last_traded_price": int(record["last_traded_price"]),
+                    "last_traded_quantity": int(record["last_traded_quantity"]),
+                    "volume_trade_for_the_day": int(record["volume"]),
+                    "total_buy_quantity": float(record["total_buy_quantity"]),
+                    "total_sell_quantity": float(record["total_sell_quantity"]),
+                    "open_interest": int(record["open_interest"]),
+                }))
+                self.sent += 1
+        except websockets.ConnectionClosed:
+            pass
+
+async def run_benchmark(token_count: int = 200,
+                        tick_rate: float = 20000.0,
+                        duration: float = 5.0,
+                        mode: int = SNAP_QUOTE,
+                        disconnect_every: Optional[float] = None,
+                        gap_probability: float = 0.0) -> Dict:
+    """
+    Stream from a local FeedSimulator into AsyncSmartWebSocket and report
+    throughput, feed metrics and reconnect-to-first-tick times.
+    """
+    from ws.async_smart_websocket import AsyncSmartWebSocket
+
+    simulator = FeedSimulator(tick_rate=tick_rate, disconnect_every=disconnect_every,
+                              gap_probability=gap_probability).start_in_thread()
+    try:
+        client = AsyncSmartWebSocket("bench", "bench", "bench", "bench", uri=simulator.uri,
+                                     queue_size=100000)
+        client.RECONNECT_DELAY = 0.05
+        tokens = [str(40000 + i) for i in range(token_count)]
+        await client.subscribe("bench", mode, [{"exchangeType": 2, "tokens": tokens}])
+        client.start()
+
+        arrivals: List[float] = []
+
+        async def consume():
+            async for _ in client:
+                arrivals.append(time.perf_counter())
+
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(duration)
+        consumer.cancel()
+        await client.close()
+    finally:
+        simulator.stop_thread()
+
+    arrivals_array = np.asarray(arrivals)
+    reconnect_ms = []
+    for disconnected_at in simulator.disconnect_times:
+        later = arrivals_array[arrivals_array > disconnected_at]
+        if later.size:
+            reconnect_ms.append((later[0] - disconnected_at) * 1000.0)
+    return {
+        "sent": simulator.sent,
+        "received": len(arrivals),
+        "ticks_per_second": len(arrivals) / duration,
+        "reconnects": client.reconnect_count,
+        "reconnect_to_first_tick_ms": reconnect_ms,
+        "metrics": client.metrics.snapshot()
+    }
+
+if __name__ == "__main__":
+    print(json.dumps(asyncio.run(run_benchmark()), indent=2, default=str))
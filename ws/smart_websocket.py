@@ -4,6 +4,8 @@ import ssl
 import json
 from websocket_client import WebSocket  # Import from websocket-client package
 from core.logger import logger
+from ws.tick_decoder import TickDecoder, parse_token
+from ws.subscription_manager import SubscriptionRegistry
 import asyncio
 from typing import Optional, Callable, Dict, Any
 
@@ -50,10 +52,11 @@ class SmartWebSocket:
         self.client_code = client_code
         self.feed_token = feed_token
         self.wsapp = None
-        self.input_request_dict = {}
+        self.subscriptions = SubscriptionRegistry()
         self.current_retry_attempt = 0
         self.connected = False
         self.reconnect_delay = 1
+        self.tick_decoder = TickDecoder()
 
     def _on_data(self, wsapp, data, data_type, continue_flag):
         """Handle incoming data"""
@@ -87,27 +90,19 @@ class SmartWebSocket:
     def subscribe(self, correlation_id, mode, token_list):
         """Subscribe to market data"""
         try:
-            request_data = {
-                "correlationID": correlation_id,
-                "action": self.SUBSCRIBE_ACTION,
-                "params": {
-                    "mode": mode,
-                    "tokenList": token_list
+            # Stored deduplicated for reconnection; only new tokens are sent
+            added = self.subscriptions.add(mode, token_list)
+            for chunk in self.subscriptions.chunk(added):
+                request_data = {
+                    "correlationID": correlation_id,
+                    "action": self.SUBSCRIBE_ACTION,
+                    "params": {
+                        "mode": mode,
+                        "tokenList": chunk
+                    }
                 }
-            }
-
-            # Store subscription for reconnection
-            if mode not in self.input_request_dict:
-                self.input_request_dict[mode] = {}
-
-            for token in token_list:
-                if token['exchangeType'] in self.input_request_dict[mode]:
-                    self.input_request_dict[mode][token['exchangeType']].extend(token["tokens"])
-                else:
-                    self.input_request_dict[mode][token['exchangeType']] = token["tokens"]
-
-            self.wsapp.send(json.dumps(request_data))
-            logger.info(f"Subscribed to {len(token_list)} symbols")
+                self.wsapp.send(json.dumps(request_data))
+            logger.info(f"Subscribed to {sum(len(t['tokens']) for t in added)} new tokens")
             
         except Exception as e:
             logger.error(f"Error subscribing to market data: {e}")
@@ -116,16 +111,18 @@ class SmartWebSocket:
     def unsubscribe(self, correlation_id, mode, token_list):
         """Unsubscribe from market data"""
         try:
-            request_data = {
-                "correlationID": correlation_id,
-                "action": self.UNSUBSCRIBE_ACTION,
-                "params": {
-                    "mode": mode,
-                    "tokenList": token_list
+            removed = self.subscriptions.remove(mode, token_list)
+            for chunk in self.subscriptions.chunk(removed):
+                request_data = {
+                    "correlationID": correlation_id,
+                    "action": self.UNSUBSCRIBE_ACTION,
+                    "params": {
+                        "mode": mode,
+                        "tokenList": chunk
+                    }
                 }
-            }
-            self.wsapp.send(json.dumps(request_data))
-            logger.info(f"Unsubscribed from {len(token_list)} symbols")
+                self.wsapp.send(json.dumps(request_data))
+            logger.info(f"Unsubscribed from {sum(len(t['tokens']) for t in removed)} tokens")
         except Exception as e:
             logger.error(f"Error unsubscribing from market data: {e}")
             raise
@@ -189,35 +186,19 @@ class SmartWebSocket:
     def _parse_binary_data(self, binary_data):
         """Parse binary market data"""
         try:
-            parsed_data = {
-                "subscription_mode": self._unpack_data(binary_data, 0, 1, byte_format="B")[0],
-                "exchange_type": self._unpack_data(binary_data, 1, 2, byte_format="B")[0],
-                "token": self._parse_token_value(binary_data[2:27]),
-                "sequence_number": self._unpack_data(binary_data, 27, 35, byte_format="q")[0],
-                "exchange_timestamp": self._unpack_data(binary_data, 35, 43, byte_format="q")[0],
-                "last_traded_price": self._unpack_data(binary_data, 43, 51, byte_format="q")[0]
-            }
-
-            parsed_data["subscription_mode_val"] = self.SUBSCRIPTION_MODE_MAP.get(parsed_data["subscription_mode"])
-            return parsed_data
-            
+            return self.tick_decoder.decode(binary_data)
         except Exception as e:
             logger.error(f"Error parsing binary data: {e}")
             raise
 
     def _unpack_data(self, binary_data, start, end, byte_format="I"):
         """Unpack binary data using struct"""
-        return struct.unpack(self.LITTLE_ENDIAN_BYTE_ORDER + byte_format, binary_data[start:end])
+        return struct.unpack_from(self.LITTLE_ENDIAN_BYTE_ORDER + byte_format, binary_data, start)
 
     @staticmethod
     def _parse_token_value(binary_packet):
         """Parse token value from binary packet"""
-        token = ""
-        for i in range(len(binary_packet)):
-            if chr(binary_packet[i]) == '\x00':
-                return token
-            token += chr(binary_packet[i])
-        return token
+        return parse_token(bytes(binary_packet))
 
     # Callback methods to be overridden by user
     def on_data(self, wsapp, data):
@@ -235,13 +216,8 @@ class SmartWebSocket:
     def resubscribe(self):
         """Resubscribe to previous subscriptions after reconnect"""
         try:
-            for mode, exchanges in self.input_request_dict.items():
-                token_list = []
-                for exchange_type, tokens in exchanges.items():
-                    token_list.append({
-                        'exchangeType': exchange_type,
-                        'tokens': tokens
-                    })
+            frames = self.subscriptions.snapshot()
+            for mode, token_list in frames:
                 request_data = {
                     "action": self.SUBSCRIBE_ACTION,
                     "params": {
@@ -250,7 +226,7 @@ class SmartWebSocket:
                     }
                 }
                 self.wsapp.send(json.dumps(request_data))
-                logger.info(f"Resubscribed to {len(token_list)} symbols")
+            logger.info(f"Resubscribed to {len(self.subscriptions)} tokens in {len(frames)} frames")
         except Exception as e:
             logger.error(f"Error resubscribing: {e}")
             raise
\ No newline at end of file
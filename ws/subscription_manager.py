@@ -0,0 +1,112 @@
+from typing import Dict, Iterable, List, Tuple
+
+# SmartAPI accepts at most this many tokens in one subscribe/unsubscribe request
+MAX_TOKENS_PER_REQUEST = 1000
+
+TokenList = List[Dict]  # [{"exchangeType": 2, "tokens": ["43650", ...]}, ...]
+
+class SubscriptionRegistry:
+    """
+    Deduplicated subscription state per (mode, exchange type).
+    Updates return only the tokens that actually changed, and every change is
+    turned into the fewest request frames allowed by the per-request token
+    limit, so resubscribing after a reconnect sends ceil(tokens / limit) frames
+    per mode.
+    """
+
+    def __init__(self, max_tokens_per_request: int = MAX_TOKENS_PER_REQUEST):
+        self.max_tokens_per_request = max_tokens_per_request
+        # (mode, exchange_type) -> tokens; dicts keep insertion order for stable frames
+        self._tokens: Dict[Tuple[int, int], Dict[str, None]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(tokens) for tokens in self._tokens.values())
+
+    def __contains__(self, key: Tuple[int, int, str]) -> bool:
+        mode, exchange_type, token = key
+        return str(token) in self._tokens.get((mode, exchange_type), ())
+
+    def tokens(self, mode: int, exchange_type: int) -> List[str]:
+        return list(self._tokens.get((mode, exchange_type), ()))
+
+    def modes(self) -> List[int]:
+        return sorted({mode for mode, _ in self._tokens})
+
+    def add(self, mode: int, token_list: TokenList) -> TokenList:
+        """Register tokens; returns the token list of those not already subscribed"""
+        added = {}
+        for entry in token_list:
+            current = self._tokens.setdefault((mode, entry["exchangeType"]), {})
+            for token in map(str, entry["tokens"]):
+                if token not in current:
+                    current[token] = None
+                    added.setdefault(entry["exchangeType"], {})[token] = None
+        return _as_token_list(added)
+
+    def remove(self, mode: int, token_list: TokenList) -> TokenList:
+        """Forget tokens; returns the token list of those that were subscribed"""
+        removed = {}
+        for entry in token_list:
+            key = (mode, entry["exchangeType"])
+            current = self._tokens.get(key)
+            if not current:
+                continue
+            for token in map(str, entry["tokens"]):
+                if current.pop(token, False) is None:
+                    removed.setdefault(entry["exchangeType"], {})[token] = None
+            if not current:
+                del self._tokens[key]
+        return _as_token_list(removed)
+
+    def update(self, mode: int, exchange_type: int, tokens: Iterable) -> Tuple[TokenList, TokenList]:
+        """
+        Replace the token set of (mode, exchange_type).
+        :return: (token list to subscribe, token list to unsubscribe)
+        """
+        target = dict.fromkeys(map(str, tokens))
+        current = self._tokens.get((mode, exchange_type), {})
+        removed = [t for t in current if t not in target]
+        added = [t for t in target if t not in current]
+        if target:
+            self._tokens[(mode, exchange_type)] = target
+        else:
+            self._tokens.pop((mode, exchange_type), None)
+        return (
+            [{"exchangeType": exchange_type, "tokens": added}] if added else [],
+            [{"exchangeType": exchange_type, "tokens": removed}] if removed else []
+        )
+
+    def clear(self):
+        self._tokens.clear()
+
+    def chunk(self, token_list: TokenList) -> List[TokenList]:
+        """Split a token list into request-sized token lists, packing exchanges together"""
+        chunks: List[TokenList] = []
+        current: TokenList = []
+        room = self.max_tokens_per_request
+        for entry in token_list:
+            tokens = list(entry["tokens"])
+            while tokens:
+                if room == 0:
+                    chunks.append(current)
+                    current, room = [], self.max_tokens_per_request
+                part, tokens = tokens[:room], tokens[room:]
+                current.append({"exchangeType": entry["exchangeType"], "tokens": part})
+                room -= len(part)
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def snapshot(self) -> List[Tuple[int, TokenList]]:
+        """All subscriptions as (mode, token list) frames, the minimum number per mode"""
+        frames = []
+        for mode in self.modes():
+            token_list = [
+                {"exchangeType": exchange_type, "tokens": list(tokens)}
+                for (m, exchange_type), tokens in self._tokens.items() if m == mode
+            ]
+            frames.extend((mode, chunk) for chunk in self.chunk(token_list))
+        return frames
+
+def _as_token_list(by_exchange: Dict[int, Dict[str, None]]) -> TokenList:
+    return [{"exchangeType": exchange_type, "tokens": list(tokens)} for exchange_type, tokens in by_exchange.items()]
@@ -0,0 +1,247 @@
+import asyncio
+import threading
+import time
+import numpy as np
+from typing import Callable, Dict, List, Optional, Sequence
+from ws.tick_decoder import LTP_MODE, QUOTE, SNAP_QUOTE
+
+# Structured dtypes mirroring the SmartAPI packet layouts in ws/tick_decoder.py
+HEADER_DTYPE = [
+    ("subscription_mode", "u1"),
+    ("exchange_type", "u1"),
+    ("token", "S25"),
+    ("sequence_number", "<i8"),
+    ("exchange_timestamp", "<i8"),
+    ("last_traded_price", "<i8"),
+]
+QUOTE_DTYPE_FIELDS = [
+    ("last_traded_quantity", "<i8"),
+    ("average_traded_price", "<i8"),
+    ("volume_trade_for_the_day", "<i8"),
+    ("total_buy_quantity", "<f8"),
+    ("total_sell_quantity", "<f8"),
+    ("open_price_of_the_day", "<i8"),
+    ("high_price_of_the_day", "<i8"),
+    ("low_price_of_the_day", "<i8"),
+    ("closed_price", "<i8"),
+]
+DEPTH_LEVEL_DTYPE = np.dtype([
+    ("flag", "<u2"),
+    ("quantity", "<i8"),
+    ("price", "<i8"),
+    ("no of orders", "<u2"),
+])
+SNAP_QUOTE_DTYPE_FIELDS = [
+    ("last_traded_timestamp", "<i8"),
+    ("open_interest", "<i8"),
+    ("open_interest_change_percentage", "<i8"),
+    ("best_5", DEPTH_LEVEL_DTYPE, (10,)),
+    ("upper_circuit_limit", "<i8"),
+    ("lower_circuit_limit", "<i8"),
+    ("52_week_high_price", "<i8"),
+    ("52_week_low_price", "<i8"),
+]
+
+LTP_DTYPE = np.dtype(HEADER_DTYPE)
+QUOTE_DTYPE = np.dtype(HEADER_DTYPE + QUOTE_DTYPE_FIELDS)
+SNAP_QUOTE_DTYPE = np.dtype(HEADER_DTYPE + QUOTE_DTYPE_FIELDS + SNAP_QUOTE_DTYPE_FIELDS)
+
+PACKET_DTYPES = {
+    LTP_MODE: LTP_DTYPE,
+    QUOTE: QUOTE_DTYPE,
+    SNAP_QUOTE: SNAP_QUOTE_DTYPE,
+}
+
+# Columns produced by decode_frames; fields absent from a packet's mode are filled
+COLUMN_FIELDS = {
+    "sequence_number": "sequence_number",
+    "exchange_timestamp": "exchange_timestamp",
+    "last_traded_price": "last_traded_price",
+    "volume": "volume_trade_for_the_day",
+    "open_interest": "open_interest",
+    "upper_circuit_limit": "upper_circuit_limit",
+    "lower_circuit_limit": "lower_circuit_limit",
+}
+MISSING_VALUE = -1
+
+def frame_is_valid(frame: bytes) -> bool:
+    """Whether frame has a known subscription mode and exactly that mode's packet size"""
+    dtype = PACKET_DTYPES.get(frame[0]) if frame else None
+    return dtype is not None and len(frame) == dtype.itemsize
+
+def decode_records(frames: Sequence[bytes]) -> Dict[int, np.ndarray]:
+    """
+    Decode frames into one structured array per subscription mode.
+    Each mode's frames are joined once and viewed with np.frombuffer.
+    :raises ValueError: Unknown mode, or a frame whose length is not the mode's
+        packet size (it would shift every later record)
+    """
+    by_mode: Dict[int, List[bytes]] = {}
+    for frame in frames:
+        by_mode.setdefault(frame[0], []).append(frame)
+    records = {}
+    for mode, mode_frames in by_mode.items():
+        dtype = PACKET_DTYPES.get(mode)
+        if dtype is None:
+            raise ValueError(f"Unknown subscription mode: {mode}")
+        bad = sum(len(frame) != dtype.itemsize for frame in mode_frames)
+        if bad:
+            raise ValueError(f"{bad} mode {mode} frames are not {dtype.itemsize} bytes")
+        records[mode] = np.frombuffer(b"".join(mode_frames), dtype=dtype)
+    return records
+
+def decode_frames(frames: Sequence[bytes]) -> Dict[str, np.ndarray]:
+    """
+    Decode a batch of binary frames into columnar arrays in arrival order.
+    Frames that fail frame_is_valid are skipped, so rows follow the valid frames.
+    :return: Dict with token, subscription_mode, sequence_number, exchange_timestamp,
+             last_traded_price, volume, open_interest and circuit limit arrays (int64;
+             -1 where the packet's mode does not carry the field)
+    """
+    frames = [frame for frame in frames if frame_is_valid(frame)]
+    n = len(frames)
+    modes = np.fromiter((frame[0] for frame in frames), dtype=np.uint8, count=n)
+    columns = {"token": np.empty(n, dtype=np.int64), "subscription_mode": modes}
+    for name in COLUMN_FIELDS:
+        columns[name] = np.full(n, MISSING_VALUE, dtype=np.int64)
+    if n == 0:
+        return columns
+
+    records = decode_records(frames)
+    for mode, recs in records.items():
+        positions = np.flatnonzero(modes == mode)
+        columns["token"][positions] = parse_tokens(recs["token"])
+        for name, field in COLUMN_FIELDS.items():
+            if field in recs.dtype.names:
+                columns[name][positions] = recs[field]
+    return columns
+
+def parse_tokens(raw_tokens: np.ndarray) -> np.ndarray:
+    """Convert NUL-padded token bytes to int64, -1 for non-numeric tokens"""
+    try:
+        return raw_tokens.astype(np.int64)
+    except ValueError:
+        return np.array([int(t) if t.isdigit() else MISSING_VALUE for t in raw_tokens], dtype=np.int64)
+
+class TickBatcher:
+    """
+    Accumulates raw binary frames and decodes them in bulk.
+    A batch is flushed when it reaches max_frames or window_ms after it started,
+    whether or not another frame arrives. Frames may be added from the feed
+    thread; the age flush then runs on the event loop when one is given, else on
+    a single long-lived flusher thread. Batches are delivered in order.
+    """
+
+    def __init__(self,
+                 on_batch: Callable[[Dict[str, np.ndarray]], None],
+                 window_ms: float = 5.0,
+                 max_frames: int = 1024,
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        :param on_batch: Called with the columnar dict from decode_frames
+        :param window_ms: Maximum age of a batch in milliseconds
+        :param max_frames: Maximum frames per batch
+        :param loop: Event loop that delivers age flushes; the running loop if add()
+            is called on one
+        """
+        self.on_batch = on_batch
+        self.window = window_ms / 1000.0
+        self.max_frames = max_frames
+        self.loop = loop
+        self.dropped = 0  # frames with an unknown mode or the wrong length
+        self._frames: List[bytes] = []
+        self._started_at: Optional[float] = None
+        self._batch = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._lock = threading.RLock()
+        self._delivering = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._deadline: Optional[float] = None
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+
+    def add(self, frame: bytes):
+        """Queue one frame, flushing when the batch is full or old enough"""
+        now = time.monotonic()
+        with self._lock:
+            if not self._frames:
+                self._started_at = now
+                self._schedule(now)
+            self._frames.append(bytes(frame))
+            if len(self._frames) < self.max_frames and now - self._started_at < self.window:
+                return
+        self.flush()
+
+    def _schedule(self, now: float):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None and (self.loop is None or loop is self.loop):
+            self._timer = loop.call_later(self.window, self._expire, self._batch)
+            return
+        # Off the loop (the SmartWebSocketV2 thread): one thread serves every deadline
+        self._deadline = now + self.window
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._run_flusher, name="tick-batch-flush", daemon=True)
+            self._flusher.start()
+        self._wakeup.notify()
+
+    def _run_flusher(self):
+        with self._lock:
+            while not self._closed:
+                if self._deadline is None:
+                    self._wakeup.wait()
+                    continue
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._wakeup.wait(remaining)
+                    continue
+                self._deadline = None
+                batch = self._batch
+                if self.loop is not None:
+                    self.loop.call_soon_threadsafe(self._expire, batch)
+                else:
+                    self._lock.release()
+                    try:
+                        self._expire(batch)
+                    finally:
+                        self._lock.acquire()
+
+    def _expire(self, batch: int):
+        with self._lock:
+            if batch != self._batch:
+                return
+        self.flush()
+
+    def flush(self):
+        """Decode and deliver whatever is queued"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._deadline = None
+            if not self._frames:
+                return
+            frames, self._frames = self._frames, []
+            self._started_at = None
+            self._batch += 1
+            # Taken before the batch lock is released, so batches are delivered in order
+            self._delivering.acquire()
+        try:
+            valid = [frame for frame in frames if frame_is_valid(frame)]
+            self.dropped += len(frames) - len(valid)
+            if valid:
+                self.on_batch(decode_frames(valid))
+        finally:
+            self._delivering.release()
+
+    def close(self):
+        """Deliver the pending batch and stop the flusher thread"""
+        self.flush()
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify()
+
+    def __len__(self) -> int:
+        return len(self._frames)
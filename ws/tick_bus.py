@@ -0,0 +1,194 @@
+import asyncio
+import json
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Set
+
+from core.logger import logger
+
+# Overflow policies for a full subscriber queue
+DROP_OLDEST = "drop_oldest"   # discard the oldest queued message
+CONFLATE = "conflate"         # keep only the latest message per topic
+BLOCK = "block"               # publisher waits for room (publish) or drops (publish_nowait)
+OVERFLOW_POLICIES = (DROP_OLDEST, CONFLATE, BLOCK)
+
+class TickMessage:
+    """A published message; its JSON payload is built once and shared by every subscriber"""
+
+    __slots__ = ("topic", "data", "_payload")
+
+    def __init__(self, topic: Hashable, data: Any):
+        self.topic = topic
+        self.data = data
+        self._payload: Optional[str] = None
+
+    @property
+    def payload(self) -> str:
+        if self._payload is None:
+            self._payload = json.dumps(self.data, default=str)
+        return self._payload
+
+class Subscription:
+    """Bounded per-subscriber queue; consume with `await get()` or `async for`"""
+
+    def __init__(self, topics: Optional[Iterable[Hashable]], maxsize: int, policy: str):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.topics = None if topics is None else frozenset(topics)
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self.closed = False
+        self._items: deque = deque()
+        self._latest: Dict[Hashable, TickMessage] = {}  # CONFLATE only
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def full(self) -> bool:
+        return len(self._items) >= self.maxsize
+
+    def offer(self, message: TickMessage) -> bool:
+        """Enqueue without waiting; False only for a full BLOCK subscription"""
+        if self.policy == CONFLATE:
+            if message.topic in self._latest:
+                self._latest[message.topic] = message
+                self.dropped += 1
+                return True
+            if self.full():
+                del self._latest[self._items.popleft()]
+                self.dropped += 1
+            self._items.append(message.topic)
+            self._latest[message.topic] = message
+        elif self.full():
+            if self.policy == BLOCK:
+                return False
+            self._items.popleft()
+            self.dropped += 1
+            self._items.append(message)
+        else:
+            self._items.append(message)
+        self._ready.set()
+        return True
+
+    async def put(self, message: TickMessage):
+        """Enqueue, waiting for room under the BLOCK policy"""
+        while not self.offer(message):
+            if self.closed:
+                return
+            self._space.clear()
+            await self._space.wait()
+
+    def get_nowait(self) -> TickMessage:
+        item = self._items.popleft()
+        if self.policy == CONFLATE:
+            item = self._latest.pop(item)
+        if not self._items:
+            self._ready.clear()
+        self._space.set()
+        return item
+
+    async def get(self) -> TickMessage:
+        while not self._items:
+            if self.closed:
+                raise StopAsyncIteration
+            await self._ready.wait()
+        return self.get_nowait()
+
+    def close(self):
+        """Wake consumers and blocked publishers; queued messages can still be drained"""
+        self.closed = True
+        self._ready.set()
+        self._space.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> TickMessage:
+        return await self.get()
+
+class TickBus:
+    """
+    In-process pub/sub keyed by symbol or token.
+    Each subscriber gets its own bounded queue with an overflow policy, so a slow
+    consumer only ever delays itself. Messages are wrapped once per publish and
+    serialized lazily, once per message regardless of the number of subscribers.
+    """
+
+    def __init__(self):
+        self._by_topic: Dict[Hashable, Set[Subscription]] = {}
+        self._all_topics: Set[Subscription] = set()
+        self.published = 0
+
+    def subscribe(self,
+                  topics: Optional[Iterable[Hashable]] = None,
+                  maxsize: int = 1000,
+                  policy: str = DROP_OLDEST) -> Subscription:
+        """
+        :param topics: Symbols/tokens to receive; None receives every topic
+        :param maxsize: Queue bound (distinct topics for CONFLATE)
+        :param policy: DROP_OLDEST, CONFLATE or BLOCK
+        """
+        subscription = Subscription(topics, maxsize, policy)
+        if subscription.topics is None:
+            self._all_topics.add(subscription)
+        else:
+            for topic in subscription.topics:
+                self._by_topic.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscription.close()
+        self._all_topics.discard(subscription)
+        for topic in subscription.topics or ():
+            subscribers = self._by_topic.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._by_topic[topic]
+
+    async def publish(self, topic: Hashable, data: Any) -> TickMessage:
+        """Deliver to every subscriber of topic, waiting on full BLOCK subscribers"""
+        message = TickMessage(topic, data)
+        self.published += 1
+        for subscription in self._subscribers(topic):
+            if not subscription.offer(message):
+                await subscription.put(message)
+        return message
+
+    def publish_nowait(self, topic: Hashable, data: Any) -> TickMessage:
+        """Deliver without waiting; full BLOCK subscribers miss the message"""
+        message = TickMessage(topic, data)
+        self.published += 1
+        for subscription in self._subscribers(topic):
+            if not subscription.offer(message):
+                subscription.dropped += 1
+        return message
+
+    def stats(self) -> Dict[str, int]:
+        subscriptions = self._all_topics.union(*self._by_topic.values())
+        return {
+            "published": self.published,
+            "subscribers": len(subscriptions),
+            "queued": sum(len(s) for s in subscriptions),
+            "dropped": sum(s.dropped for s in subscriptions)
+        }
+
+    def _subscribers(self, topic: Hashable):
+        subscribers = self._by_topic.get(topic)
+        if subscribers:
+            return list(subscribers) + list(self._all_topics) if self._all_topics else list(subscribers)
+        return list(self._all_topics)
+
+async def pump(subscription: Subscription, send: Callable[[TickMessage], Awaitable[None]]):
+    """Forward a subscription to an async sender until it is closed; errors are logged and skipped"""
+    async for message in subscription:
+        try:
+            await send(message)
+        except Exception as e:
+            logger.error(f"Error delivering message for {message.topic}: {e}")
+
+# Shared bus for the live feed: WebSocketManager publishes decoded ticks keyed by token
+tick_bus = TickBus()
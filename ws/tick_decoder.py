@@ -0,0 +1,162 @@
+import struct
+from typing import Dict, List, Optional, Union
+
+# Subscription modes
+LTP_MODE = 1
+QUOTE = 2
+SNAP_QUOTE = 3
+
+SUBSCRIPTION_MODE_MAP = {
+    1: "LTP",
+    2: "QUOTE",
+    3: "SNAP_QUOTE"
+}
+
+# Packet layouts (little endian, packed). Each mode extends the previous one.
+HEADER_FORMAT = "BB25sqqq"          # bytes 0..51
+QUOTE_FORMAT = "qqqddqqqq"          # bytes 51..123
+SNAP_QUOTE_FORMAT = "qqq200xqqqq"   # bytes 123..379, depth block skipped
+DEPTH_OFFSET = 147
+DEPTH_SIZE = 200
+
+LTP_STRUCT = struct.Struct("<" + HEADER_FORMAT)
+QUOTE_STRUCT = struct.Struct("<" + HEADER_FORMAT + QUOTE_FORMAT)
+SNAP_QUOTE_STRUCT = struct.Struct("<" + HEADER_FORMAT + QUOTE_FORMAT + SNAP_QUOTE_FORMAT)
+DEPTH_LEVEL_STRUCT = struct.Struct("<HqqH")
+
+# Field names in packet order, as used by SmartWebSocketV2 dicts
+HEADER_FIELDS = (
+    "subscription_mode", "exchange_type", "token",
+    "sequence_number", "exchange_timestamp", "last_traded_price"
+)
+QUOTE_FIELDS = (
+    "last_traded_quantity", "average_traded_price", "volume_trade_for_the_day",
+    "total_buy_quantity", "total_sell_quantity", "open_price_of_the_day",
+    "high_price_of_the_day", "low_price_of_the_day", "closed_price"
+)
+SNAP_QUOTE_FIELDS = (
+    "last_traded_timestamp", "open_interest", "open_interest_change_percentage",
+    "upper_circuit_limit", "lower_circuit_limit", "52_week_high_price", "52_week_low_price"
+)
+
+PACKET_LAYOUTS = {
+    LTP_MODE: (LTP_STRUCT, HEADER_FIELDS),
+    QUOTE: (QUOTE_STRUCT, HEADER_FIELDS + QUOTE_FIELDS),
+    SNAP_QUOTE: (SNAP_QUOTE_STRUCT, HEADER_FIELDS + QUOTE_FIELDS + SNAP_QUOTE_FIELDS),
+}
+
+def _attribute_name(field: str) -> str:
+    """Dict keys that are not identifiers get a prefixed attribute name"""
+    return field if field.isidentifier() else "week_" + field.replace("_week", "")
+
+class Tick:
+    """Lightweight tick record; fields not present in the packet's mode are None"""
+
+    __slots__ = tuple(_attribute_name(f) for f in HEADER_FIELDS + QUOTE_FIELDS + SNAP_QUOTE_FIELDS) + (
+        "best_5_buy_data", "best_5_sell_data"
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    @property
+    def subscription_mode_val(self) -> Optional[str]:
+        return SUBSCRIPTION_MODE_MAP.get(self.subscription_mode)
+
+    def to_dict(self) -> Dict:
+        """Same layout as TickDecoder.decode(..., as_object=False)"""
+        data = {}
+        for field in PACKET_LAYOUTS[self.subscription_mode][1]:
+            data[field] = getattr(self, _attribute_name(field))
+        data["subscription_mode_val"] = self.subscription_mode_val
+        if self.best_5_buy_data is not None:
+            data["best_5_buy_data"] = self.best_5_buy_data
+            data["best_5_sell_data"] = self.best_5_sell_data
+        return data
+
+class TickDecoder:
+    """
+    Decoder for SmartAPI binary ticks using precompiled struct layouts.
+    Reads with unpack_from over a memoryview, so no per-field slices are copied.
+    """
+
+    _ATTRIBUTES = {
+        mode: tuple(_attribute_name(f) for f in fields)
+        for mode, (_, fields) in PACKET_LAYOUTS.items()
+    }
+
+    def __init__(self, as_object: bool = False, parse_depth: bool = True):
+        """
+        :param as_object: Return Tick objects instead of dicts
+        :param parse_depth: Decode the best-5 depth block of SNAP_QUOTE packets
+        """
+        self.as_object = as_object
+        self.parse_depth = parse_depth
+
+    def decode(self, binary_data: Union[bytes, bytearray, memoryview]) -> Union[Dict, Tick]:
+        """Decode one binary packet"""
+        view = memoryview(binary_data)
+        mode = view[0]
+        layout = PACKET_LAYOUTS.get(mode)
+        if layout is None:
+            raise ValueError(f"Unknown subscription mode: {mode}")
+        packet_struct, fields = layout
+
+        values = list(packet_struct.unpack_from(view))
+        values[2] = parse_token(values[2])
+
+        depth = None
+        if mode == SNAP_QUOTE and self.parse_depth:
+            depth = parse_best_5(view[DEPTH_OFFSET:DEPTH_OFFSET + DEPTH_SIZE])
+
+        if self.as_object:
+            tick = Tick.__new__(Tick)
+            for name, value in zip(self._ATTRIBUTES[mode], values):
+                setattr(tick, name, value)
+            for name in Tick.__slots__[len(values):]:
+                setattr(tick, name, None)
+            if depth is not None:
+                tick.best_5_buy_data, tick.best_5_sell_data = depth
+            return tick
+
+        data = dict(zip(fields, values))
+        data["subscription_mode_val"] = SUBSCRIPTION_MODE_MAP[mode]
+        if depth is not None:
+            data["best_5_buy_data"], data["best_5_sell_data"] = depth
+        return data
+
+def parse_token(raw: bytes) -> str:
+    """Token bytes are NUL padded to 25 characters"""
+    return raw.split(b"\x00", 1)[0].decode("ascii")
+
+def parse_best_5(depth_block) -> tuple:
+    """Split the 10-level depth block into (buy levels, sell levels)"""
+    buy: List[Dict] = []
+    sell: List[Dict] = []
+    for flag, quantity, price, orders in DEPTH_LEVEL_STRUCT.iter_unpack(depth_block):
+        level = {"flag": flag, "quantity": quantity, "price": price, "no of orders": orders}
+        (buy if flag == 0 else sell).append(level)
+    return buy, sell
+
+def encode_tick(data: Dict) -> bytes:
+    """
+    Build a binary packet from a decoded tick dict (inverse of TickDecoder.decode).
+    Used by feed simulators and tests; missing fields are packed as zero.
+    """
+    mode = data["subscription_mode"]
+    packet_struct, fields = PACKET_LAYOUTS[mode]
+    values = [data.get(field, 0) for field in fields]
+    values[2] = str(data.get("token", "")).encode("ascii")
+    buffer = bytearray(packet_struct.size)
+    packet_struct.pack_into(buffer, 0, *values)
+    if mode == SNAP_QUOTE:
+        levels = list(data.get("best_5_buy_data", [])) + list(data.get("best_5_sell_data", []))
+        for i, level in enumerate(levels[:DEPTH_SIZE // DEPTH_LEVEL_STRUCT.size]):
+            DEPTH_LEVEL_STRUCT.pack_into(
+                buffer, DEPTH_OFFSET + i * DEPTH_LEVEL_STRUCT.size,
+                level["flag"], level["quantity"], level["price"], level["no of orders"]
+            )
+    return bytes(buffer)
+
+default_decoder = TickDecoder()
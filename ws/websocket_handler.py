@@ -3,6 +3,7 @@ import asyncio
 import json
 from fastapi import WebSocket, WebSocketDisconnect
 from core.logger import logger
+from ws.tick_bus import TickBus, CONFLATE, pump
 from trading.market_data.pipeline import MarketDataPipeline
 from ai_strategy.ensemble_model import EnsembleStrategy
 from datetime import datetime
@@ -15,6 +16,9 @@ class WebSocketHandler:
         self.market_data_pipeline = MarketDataPipeline()
         self.strategy = EnsembleStrategy("realtime")
         self.subscriptions: Dict[str, Set[str]] = {}  # symbol -> user_ids
+        # Each websocket drains its own conflating bus queues, so a slow client only delays itself
+        self.bus = TickBus()
+        self.senders: Dict[WebSocket, List] = {}  # websocket -> [(subscription, task)]
         
     async def connect(self, websocket: WebSocket, client_id: str):
         """Handle new WebSocket connection"""
@@ -23,6 +27,11 @@ class WebSocketHandler:
             if client_id not in self.active_connections:
                 self.active_connections[client_id] = set()
             self.active_connections[client_id].add(websocket)
+            self.senders[websocket] = []
+            # Start from the client's existing symbols
+            symbols = [s for s, clients in self.subscriptions.items() if client_id in clients]
+            if symbols:
+                self._add_sender(websocket, symbols)
             logger.info(f"WebSocket client connected: {client_id}")
             
         except Exception as e:
@@ -32,6 +41,9 @@ class WebSocketHandler:
         """Handle WebSocket disconnection"""
         try:
             self.active_connections[client_id].remove(websocket)
+            for subscription, task in self.senders.pop(websocket, []):
+                self.bus.unsubscribe(subscription)
+                task.cancel()
             if not self.active_connections[client_id]:
                 del self.active_connections[client_id]
             # Remove subscriptions
@@ -45,10 +57,16 @@ class WebSocketHandler:
     async def subscribe(self, client_id: str, symbols: List[str]):
         """Subscribe to market data for symbols"""
         try:
+            new_symbols = []
             for symbol in symbols:
                 if symbol not in self.subscriptions:
                     self.subscriptions[symbol] = set()
-                self.subscriptions[symbol].add(client_id)
+                if client_id not in self.subscriptions[symbol]:
+                    self.subscriptions[symbol].add(client_id)
+                    new_symbols.append(symbol)
+            if new_symbols:
+                for websocket in self.active_connections.get(client_id, ()):
+                    self._add_sender(websocket, new_symbols)
             
         except Exception as e:
             logger.error(f"Subscription failed: {e}")
@@ -58,6 +76,8 @@ class WebSocketHandler:
         try:
             # Process market data
             processed_data = await self.market_data_pipeline.process_market_data(data)
+            if processed_data is None:
+                return
             
             # Generate trading signals
             signal = await self.strategy.generate_signal(processed_data)
@@ -70,13 +90,14 @@ class WebSocketHandler:
                 "timestamp": datetime.utcnow().isoformat()
             }
             
-            # Broadcast to subscribed clients
-            symbol = data.get("symbol")
-            if symbol in self.subscriptions:
-                for client_id in self.subscriptions[symbol]:
-                    if client_id in self.active_connections:
-                        for websocket in self.active_connections[client_id]:
-                            await websocket.send_json(message)
+            # Serialized once, queued per subscribed websocket
+            self.bus.publish_nowait(data.get("symbol"), message)
                             
         except Exception as e:
-            logger.error(f"Market data processing failed: {e}") 
\ No newline at end of file
+            logger.error(f"Market data processing failed: {e}")
+            
+    def _add_sender(self, websocket: WebSocket, symbols: List[str]):
+        """Subscribe a websocket to symbols on the bus and start its send loop"""
+        subscription = self.bus.subscribe(symbols, maxsize=len(symbols), policy=CONFLATE)
+        task = asyncio.create_task(pump(subscription, lambda m: websocket.send_text(m.payload)))
+        self.senders.setdefault(websocket, []).append((subscription, task)) 
\ No newline at end of file
@@ -11,7 +11,10 @@ smartapi_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__f
 sys.path.append(smartapi_path)
 
 from SmartApi import SmartConnect  # Updated import
-from SmartApi.smartWebSocketV2 import SmartWebSocketV2
+from ws.async_smart_websocket import AsyncSmartWebSocket, log_task_errors
+from ws.tick_bus import tick_bus
+from trading.market_data.order_book import OrderBookStore
+from trading.market_data.data_quality import DataQualityFilter
 from datetime import datetime, time
 import pytz
 
@@ -40,6 +43,12 @@ class WebSocketManager:
         self.connected = False
         self.subscriptions: Dict[str, List[str]] = {}
         self.smart_api = None
+        self._consumer = None
+        self._metrics_task = None
+        self.order_books = OrderBookStore()
+        # Replayed feeds keep their recorded timestamps, so only live ticks are age-checked
+        self.quality = DataQualityFilter(max_age_ms=None if settings.SMARTAPI_FEED_URI else settings.TICK_MAX_AGE_MS,
+                                         name="feed")
         
     def is_market_open(self) -> bool:
         """Check if market is currently open"""
@@ -97,25 +106,26 @@ class WebSocketManager:
     async def connect(self):
         """Initialize and connect the WebSocket"""
         try:
-            session, feed_token = await self.initialize_smart_api()
+            if settings.SMARTAPI_FEED_URI:
+                session, feed_token = {'jwtToken': 'simulator'}, 'simulator'
+            else:
+                session, feed_token = await self.initialize_smart_api()
             
-            # Initialize WebSocket with correct parameter names
-            self.websocket = SmartWebSocketV2(
-                auth_token=session['jwtToken'],    # lowercase
+            # Runs on this event loop; reconnects and resubscribes by itself
+            self.websocket = AsyncSmartWebSocket(
+                auth_token=session['jwtToken'],
                 api_key=settings.ANGEL_ONE_API_KEY,
                 client_code=settings.ANGEL_ONE_CLIENT_ID,
-                feed_token=feed_token
+                feed_token=feed_token,
+                uri=settings.SMARTAPI_FEED_URI
             )
             
-            # Set callbacks
-            self.websocket.on_open = self.on_open
-            self.websocket.on_data = self.on_data
-            self.websocket.on_error = self.on_error
-            self.websocket.on_close = self.on_close
-            
             # Connect if market is open
-            if self.is_market_open():
-                await asyncio.get_event_loop().run_in_executor(None, self.websocket.connect)
+            if self.is_market_open() or settings.SMARTAPI_FEED_URI:
+                self.websocket.start()
+                self._consumer = log_task_errors(asyncio.create_task(self._consume_ticks()), "Tick consumer")
+                if settings.FEED_METRICS_DSN and self._metrics_task is None:
+                    await self._persist_metrics()
                 self.connected = True
                 logger.info("WebSocket connected successfully")
             else:
@@ -126,12 +136,36 @@ class WebSocketManager:
             self.connected = False
             raise
             
-    def on_open(self, ws):
-        """Handle WebSocket connection open"""
-        logger.info("WebSocket connection opened")
-        # Resubscribe to any existing subscriptions
-        if self.subscriptions:
-            self.resubscribe_all()
+    async def _persist_metrics(self):
+        """Write the client's feed health samples to the WebSocket database"""
+        from database.websocket_service import WebSocketDBService
+        connection_id = settings.ANGEL_ONE_CLIENT_ID
+        try:
+            db = WebSocketDBService(settings.FEED_METRICS_DSN)
+            await db.init_pool()
+            await db.log_connection(connection_id, "connected")
+        except Exception as e:
+            # Metrics are optional; the feed runs without them
+            logger.error(f"Feed metrics persistence disabled: {e}")
+            return
+        self._metrics_task = log_task_errors(
+            asyncio.create_task(self.websocket.metrics.persist(db, connection_id)), "Feed metrics persistence"
+        )
+
+    async def _consume_ticks(self):
+        """Drain decoded ticks from the client queue and fan them out by token"""
+        async for tick in self.websocket:
+            # One bad tick or failing consumer must not end the feed
+            try:
+                # Rejected ticks never reach the order books, the bus or anything behind it
+                if self.quality.check_tick(tick):
+                    continue
+                self.on_data(self.websocket, tick)
+                if tick.get("subscription_mode") == self.SNAP_QUOTE_MODE:
+                    self.order_books.update(tick)
+                await tick_bus.publish(tick["token"], tick)
+            except Exception as e:
+                logger.error(f"Error processing tick {tick.get('token')}: {e}")
             
     def on_data(self, ws, message):
         """Handle incoming market data"""
@@ -142,13 +176,16 @@ class WebSocketManager:
         except Exception as e:
             logger.error(f"Error processing market data: {e}")
             
-    def on_error(self, ws, error):
-        """Handle WebSocket errors"""
-        logger.error(f"WebSocket error: {error}")
-        
-    def on_close(self, ws):
-        """Handle WebSocket connection close"""
-        logger.info("WebSocket connection closed")
+    async def close(self):
+        """Close the feed and stop consuming ticks"""
+        if self._consumer is not None:
+            self._consumer.cancel()
+            self._consumer = None
+        if self._metrics_task is not None:
+            self._metrics_task.cancel()
+            self._metrics_task = None
+        if self.websocket is not None:
+            await self.websocket.close()
         self.connected = False
         
     async def subscribe(self, symbols: List[str], mode: int = None):
@@ -160,11 +197,11 @@ class WebSocketManager:
             if mode is None:
                 mode = self.LTP_MODE
                 
-            # Store subscription for when market opens
-            self.subscriptions[mode] = symbols
+            # Store subscription for when market opens, keeping earlier symbols
+            self.subscriptions[mode] = list(dict.fromkeys(self.subscriptions.get(mode, []) + list(symbols)))
             
             # Only subscribe if market is open
-            if self.is_market_open() and self.connected:
+            if (self.is_market_open() or settings.SMARTAPI_FEED_URI) and self.connected:
                 token_list = [
                     {
                         "exchangeType": self.websocket.NSE_FO,
@@ -172,7 +209,7 @@ class WebSocketManager:
                     }
                 ]
                 
-                self.websocket.subscribe(
+                await self.websocket.subscribe(
                     correlation_id="quantum_algo",
                     mode=mode,
                     token_list=token_list
@@ -184,13 +221,6 @@ class WebSocketManager:
         except Exception as e:
             logger.error(f"Error subscribing to market data: {e}")
             raise
-            
-    def resubscribe_all(self):
-        """Resubscribe to all stored subscriptions"""
-        try:
-            for mode, symbols in self.subscriptions.items():
-                self.subscribe(symbols, mode)
-        except Exception as e:
-            logger.error(f"Error resubscribing: {e}")
+
 
 websocket_manager = WebSocketManager() 
\ No newline at end of file